@@ -0,0 +1,312 @@
+"""Benchmark suite for the ClassBanners rendering pipeline.
+
+Usage:
+    python benchmarks/bench.py run -o results.json [--quick] [--baseline base.json]
+    python benchmarks/bench.py compare base.json results.json [--threshold 0.1]
+
+``run`` measures generate latency (p50/p95), encode time per output format,
+batch throughput and peak RSS per banner size, and writes the results as
+JSON. ``compare`` flags metrics that regressed against a stored baseline and
+exits with status 1 if any did. Everything runs offline.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parent.parent
+TOPICS = ROOT / "data" / "topics.json"
+sys.path.insert(0, str(ROOT / "src"))
+
+import PIL  # noqa: E402
+
+from classbanners import Banner, BannerConfig, BannerGenerator, __version__  # noqa: E402
+from classbanners.manifest import read_manifest  # noqa: E402
+
+SIZES = [(800, 200), (2000, 500), (4000, 1000), (10000, 2500)]
+QUICK_SIZES = [(800, 200), (2000, 500)]
+FORMATS = ["PNG", "WEBP", "JPEG"]
+VARIANTS = {
+    "plain": {"subtitle": "", "border_width": 0},
+    "subtitle": {"subtitle": "Room 204", "border_width": 0},
+    "subtitle+border": {"subtitle": "Room 204", "border_width": 8},
+}
+
+# Metrics where a larger value is an improvement.
+_HIGHER_IS_BETTER = {"banners_per_sec"}
+
+
+def _percentile(samples: list[float], percent: float) -> float:
+    """Return the nearest-rank percentile of ``samples``."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _timings(func: Callable[[], object], iterations: int) -> dict[str, float]:
+    """Time ``func`` and summarize the samples in milliseconds."""
+    func()  # warm caches
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "p50_ms": statistics.median(samples),
+        "p95_ms": _percentile(samples, 95),
+        "mean_ms": statistics.fmean(samples),
+    }
+
+
+def _config(size: tuple[int, int], border_width: int = 0) -> BannerConfig:
+    width, height = size
+    return BannerConfig(
+        width=width,
+        height=height,
+        font_size=max(height // 4, 8),
+        padding=max(width // 40, 4),
+        border_width=border_width * max(width // 800, 1),
+    )
+
+
+def _iterations_for(size: tuple[int, int], iterations: int) -> int:
+    """Use fewer samples for very large banners."""
+    pixels = size[0] * size[1]
+    return max(3, iterations // max(1, pixels // 2_000_000))
+
+
+def bench_generate(sizes: list[tuple[int, int]], iterations: int) -> dict[str, Any]:
+    """Measure generate latency per size and variant."""
+    results: dict[str, Any] = {}
+    generator = BannerGenerator()
+    for size in sizes:
+        for name, variant in VARIANTS.items():
+            config = _config(size, variant["border_width"])
+            subtitle = variant["subtitle"]
+
+            def render(
+                subtitle: str = subtitle, config: BannerConfig = config
+            ) -> None:
+                generator.generate(Banner("Introduction to NLP", subtitle, config))
+
+            key = f"generate/{size[0]}x{size[1]}/{name}"
+            results[key] = _timings(render, _iterations_for(size, iterations))
+    return results
+
+
+def bench_encode(sizes: list[tuple[int, int]], iterations: int) -> dict[str, Any]:
+    """Measure encode time per output format and size."""
+    results: dict[str, Any] = {}
+    generator = BannerGenerator()
+    for size in sizes:
+        banner = generator.create_banner("Introduction to NLP", "Room 204", _config(size))
+        for image_format in FORMATS:
+            key = f"encode/{image_format}/{size[0]}x{size[1]}"
+            results[key] = _timings(
+                lambda fmt=image_format, banner=banner: banner.to_bytes(fmt),
+                _iterations_for(size, iterations),
+            )
+    return results
+
+
+def bench_batch(repeat: int, jobs: int | None) -> dict[str, Any]:
+    """Measure throughput of rendering the topics manifest."""
+    entries = list(read_manifest(TOPICS)) * repeat
+    generator = BannerGenerator()
+    items = [(entry.title, f"Topic {entry.number}") for entry in entries]
+
+    start = time.perf_counter()
+    count = sum(1 for result in generator.generate_many(items, jobs=jobs) if result.ok)
+    elapsed = time.perf_counter() - start
+    return {
+        f"batch/topics x{repeat}": {
+            "banners": count,
+            "seconds": elapsed,
+            "banners_per_sec": count / elapsed if elapsed else 0.0,
+        }
+    }
+
+
+def _measure_rss(size: tuple[int, int], border_width: int, subtitle: str) -> float:
+    """Render one banner in this process and return its peak RSS in MB."""
+    import resource
+
+    generator = BannerGenerator()
+    banner = generator.create_banner(
+        "Introduction to NLP", subtitle, _config(size, border_width)
+    )
+    banner.to_bytes("PNG")
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def bench_rss(sizes: list[tuple[int, int]]) -> dict[str, Any]:
+    """Measure peak RSS per size and variant, each in a fresh process."""
+    results: dict[str, Any] = {}
+    if sys.platform == "win32":
+        return results
+    for size in sizes:
+        for name, variant in VARIANTS.items():
+            output = subprocess.run(
+                [
+                    sys.executable,
+                    __file__,
+                    "_rss",
+                    f"{size[0]}x{size[1]}",
+                    str(variant["border_width"]),
+                    variant["subtitle"],
+                ],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            results[f"rss/{size[0]}x{size[1]}/{name}"] = {
+                "peak_rss_mb": float(output.strip())
+            }
+    return results
+
+
+def run(parsed: argparse.Namespace) -> int:
+    """Run the suite and write the results."""
+    sizes = QUICK_SIZES if parsed.quick else SIZES
+    results: dict[str, Any] = {}
+    for label, bench in (
+        ("generate", lambda: bench_generate(sizes, parsed.iterations)),
+        ("encode", lambda: bench_encode(sizes, parsed.iterations)),
+        ("batch", lambda: bench_batch(parsed.repeat, parsed.jobs)),
+        ("rss", lambda: bench_rss(sizes)),
+    ):
+        print(f"Running {label} benchmarks...", file=sys.stderr)
+        results.update(bench())
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "classbanners": __version__,
+            "pillow": PIL.__version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if parsed.output:
+        parsed.output.write_text(text + "\n", encoding="utf-8")
+        print(f"Results written to: {parsed.output}", file=sys.stderr)
+    else:
+        print(text)
+
+    if parsed.baseline:
+        baseline = json.loads(parsed.baseline.read_text(encoding="utf-8"))
+        return report_regressions(baseline, report, parsed.threshold)
+    return 0
+
+
+def find_regressions(
+    baseline: dict[str, Any], current: dict[str, Any], threshold: float
+) -> list[tuple[str, str, float, float]]:
+    """Return (benchmark, metric, baseline, current) for regressed metrics.
+
+    A metric regresses when it is worse than the baseline by more than
+    ``threshold`` (a fraction, e.g. 0.1 for 10%). Peak RSS and timings are
+    worse when higher; throughput is worse when lower.
+    """
+    regressions = []
+    for name, metrics in current["results"].items():
+        base_metrics = baseline["results"].get(name)
+        if base_metrics is None:
+            continue
+        for metric, value in metrics.items():
+            base = base_metrics.get(metric)
+            if not isinstance(base, (int, float)) or not base or metric == "banners":
+                continue
+            if metric in _HIGHER_IS_BETTER:
+                worse = value < base * (1 - threshold)
+            else:
+                worse = value > base * (1 + threshold)
+            if worse:
+                regressions.append((name, metric, base, value))
+    return regressions
+
+
+def report_regressions(
+    baseline: dict[str, Any], current: dict[str, Any], threshold: float
+) -> int:
+    """Print regressions and return the exit status."""
+    regressions = find_regressions(baseline, current, threshold)
+    if not regressions:
+        print(f"No regressions beyond {threshold:.0%}.")
+        return 0
+    print(f"{len(regressions)} regressions beyond {threshold:.0%}:")
+    for name, metric, base, value in regressions:
+        change = (value - base) / base
+        print(f"  {name} {metric}: {base:.2f} -> {value:.2f} ({change:+.1%})")
+    return 1
+
+
+def compare(parsed: argparse.Namespace) -> int:
+    """Compare two result files."""
+    baseline = json.loads(parsed.baseline.read_text(encoding="utf-8"))
+    current = json.loads(parsed.current.read_text(encoding="utf-8"))
+    return report_regressions(baseline, current, parsed.threshold)
+
+
+def main(args: list[str] | None = None) -> int:
+    """Entry point for the benchmark suite."""
+    argv = sys.argv[1:] if args is None else args
+    if argv and argv[0] == "_rss":
+        # Internal: measure peak RSS of a single render in this process.
+        width, height = (int(v) for v in argv[1].split("x"))
+        subtitle = argv[3] if len(argv) > 3 else ""
+        print(_measure_rss((width, height), int(argv[2]), subtitle))
+        return 0
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run the benchmarks")
+    run_parser.add_argument("-o", "--output", type=Path, help="Write results here")
+    run_parser.add_argument(
+        "--quick", action="store_true", help="Only benchmark the smaller sizes"
+    )
+    run_parser.add_argument(
+        "-n", "--iterations", type=int, default=20, help="Samples per benchmark"
+    )
+    run_parser.add_argument(
+        "--repeat", type=int, default=4, help="Copies of topics.json per batch run"
+    )
+    run_parser.add_argument("-j", "--jobs", type=int, help="Batch worker processes")
+    run_parser.add_argument("--baseline", type=Path, help="Compare against this file")
+    run_parser.add_argument("--threshold", type=float, default=0.1)
+    run_parser.set_defaults(func=run)
+
+    compare_parser = subparsers.add_parser("compare", help="Compare two result files")
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("current", type=Path)
+    compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Allowed slowdown as a fraction (default: 0.1)",
+    )
+    compare_parser.set_defaults(func=compare)
+
+    parsed = parser.parse_args(argv)
+    return int(parsed.func(parsed))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
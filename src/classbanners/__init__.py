@@ -1,7 +1,23 @@
 """ClassBanners - Generate customizable class banners with Python."""
 
-from classbanners.banner import Banner, BannerConfig
-from classbanners.generator import BannerGenerator
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from classbanners.banner import Banner, BannerConfig, BatchResult
+
+if TYPE_CHECKING:
+    from classbanners.generator import BannerGenerator
 
 __version__ = "0.1.0"
-__all__ = ["Banner", "BannerConfig", "BannerGenerator"]
+__all__ = ["Banner", "BannerConfig", "BannerGenerator", "BatchResult"]
+
+
+def __getattr__(name: str) -> Any:
+    # Import the generator (and with it Pillow) only when it is first used,
+    # so tools that merely parse arguments or validate configs start fast.
+    if name == "BannerGenerator":
+        from classbanners.generator import BannerGenerator
+
+        return BannerGenerator
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,166 @@
+"""Archive sinks that stream encoded banners into a ZIP or tar file."""
+
+from __future__ import annotations
+
+import io
+import tarfile
+import threading
+import time
+import zipfile
+from pathlib import Path
+from typing import IO, Any
+
+from classbanners.pipeline import OutputSink
+
+#: Output suffixes written as an archive instead of a directory.
+ARCHIVE_SUFFIXES = (".zip", ".tar")
+
+# Entries in these formats are already compressed; deflating them again
+# costs time and saves next to nothing.
+_COMPRESSED_SUFFIXES = {".png", ".webp", ".jpg", ".jpeg", ".gif"}
+
+
+def is_archive_path(path: Path | str) -> bool:
+    """Whether ``path`` names an archive rather than a directory."""
+    return Path(path).suffix.lower() in ARCHIVE_SUFFIXES
+
+
+class ArchiveSink(OutputSink):
+    """Base class of the archive sinks.
+
+    Each banner becomes one entry named after its (relative) output path,
+    appended as soon as it is written; nothing is staged on disk. Writes
+    from several threads are serialized.
+    """
+
+    def __init__(self, fp: IO[bytes], close_fp: bool = False) -> None:
+        """Initialize the sink.
+
+        Args:
+            fp: Binary file object the archive is written to.
+            close_fp: Whether closing the sink also closes ``fp``.
+        """
+        self.fp = fp
+        self.close_fp = close_fp
+        self.names: set[str] = set()
+        self._lock = threading.Lock()
+
+    def write(self, path: Path, data: Any) -> None:
+        """Append an entry.
+
+        Raises:
+            ValueError: If an entry with the same name was already written.
+        """
+        name = path.as_posix()
+        with self._lock:
+            if name in self.names:
+                raise ValueError(f"Duplicate archive entry '{name}'")
+            self._add(name, data)
+            self.names.add(name)
+
+    def close(self) -> None:
+        """Finish the archive (and close its file if the sink owns it)."""
+        try:
+            self._finish()
+        finally:
+            if self.close_fp:
+                self.fp.close()
+
+    def __enter__(self) -> ArchiveSink:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _add(self, name: str, data: Any) -> None:
+        raise NotImplementedError
+
+    def _finish(self) -> None:
+        raise NotImplementedError
+
+
+class ZipSink(ArchiveSink):
+    """Streams entries into a ZIP archive.
+
+    Already-compressed images (PNG, WebP, JPEG, GIF) are stored as they
+    are; anything else is deflated.
+    """
+
+    def __init__(
+        self,
+        fp: IO[bytes],
+        close_fp: bool = False,
+        compresslevel: int | None = None,
+    ) -> None:
+        """Initialize the sink.
+
+        Args:
+            fp: Binary file object the archive is written to.
+            close_fp: Whether closing the sink also closes ``fp``.
+            compresslevel: Deflate level of compressed entries.
+        """
+        super().__init__(fp, close_fp)
+        self._zip = zipfile.ZipFile(fp, "w", compresslevel=compresslevel)
+
+    def _add(self, name: str, data: Any) -> None:
+        info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+        info.external_attr = 0o644 << 16
+        if Path(name).suffix.lower() in _COMPRESSED_SUFFIXES:
+            info.compress_type = zipfile.ZIP_STORED
+        else:
+            info.compress_type = zipfile.ZIP_DEFLATED
+        with self._zip.open(info, "w") as entry:
+            entry.write(data)
+
+    def _finish(self) -> None:
+        self._zip.close()
+
+
+class TarSink(ArchiveSink):
+    """Streams entries into an uncompressed tar archive."""
+
+    def __init__(self, fp: IO[bytes], close_fp: bool = False) -> None:
+        """Initialize the sink.
+
+        Args:
+            fp: Binary file object the archive is written to.
+            close_fp: Whether closing the sink also closes ``fp``.
+        """
+        super().__init__(fp, close_fp)
+        self._tar = tarfile.open(fileobj=fp, mode="w|", format=tarfile.PAX_FORMAT)
+
+    def _add(self, name: str, data: Any) -> None:
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mtime = int(time.time())
+        info.mode = 0o644
+        self._tar.addfile(info, io.BytesIO(data))
+
+    def _finish(self) -> None:
+        self._tar.close()
+
+
+def open_archive(path: Path | str) -> ArchiveSink:
+    """Create the archive at ``path`` and return a sink writing into it.
+
+    Closing the sink also closes the file.
+
+    Raises:
+        ValueError: If ``path`` is not a ``.zip`` or ``.tar`` file.
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix not in ARCHIVE_SUFFIXES:
+        raise ValueError(
+            f"Unsupported archive '{path.name}' "
+            f"(expected {', '.join(ARCHIVE_SUFFIXES)})"
+        )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fp = path.open("wb")
+    try:
+        if suffix == ".zip":
+            return ZipSink(fp, close_fp=True)
+        return TarSink(fp, close_fp=True)
+    except BaseException:
+        fp.close()
+        raise
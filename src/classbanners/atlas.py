@@ -0,0 +1,245 @@
+"""Sprite-sheet (atlas) output: many banners packed into a few images."""
+
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from PIL import Image
+
+from classbanners.banner import Banner
+from classbanners.buildcache import render_key
+from classbanners.encoding import encode_image, normalize_format
+
+if TYPE_CHECKING:
+    from classbanners.generator import BannerGenerator
+
+_INDEX_VERSION = 1
+
+_EXTENSIONS = {"PNG": "png", "WEBP": "webp", "JPEG": "jpg"}
+
+
+@dataclass
+class AtlasSlot:
+    """Where one banner lives inside an atlas."""
+
+    sheet: int
+    x: int
+    y: int
+    width: int
+    height: int
+    title: str = ""
+    key: str = ""
+
+
+@dataclass
+class AtlasReport:
+    """Summary of an atlas build."""
+
+    rendered: int = 0
+    reused: int = 0
+    sheets_written: list[Path] = field(default_factory=list)
+    index_path: Path | None = None
+
+
+def pack_shelves(
+    sizes: Sequence[tuple[int, int]], max_width: int, max_height: int
+) -> list[tuple[int, int, int]]:
+    """Pack rectangles into sheets with a shelf layout.
+
+    Rectangles are placed tallest first, left to right on horizontal
+    shelves, opening a new sheet when a sheet fills up.
+
+    Returns:
+        ``(sheet, x, y)`` for each size, in input order.
+
+    Raises:
+        ValueError: If a rectangle is larger than a sheet.
+    """
+    placements: list[tuple[int, int, int]] = [(0, 0, 0)] * len(sizes)
+    order = sorted(range(len(sizes)), key=lambda i: -sizes[i][1])
+    sheet = shelf_y = shelf_height = cursor_x = 0
+    for i in order:
+        width, height = sizes[i]
+        if width > max_width or height > max_height:
+            raise ValueError(
+                f"Banner of {width}x{height} does not fit in a "
+                f"{max_width}x{max_height} sheet"
+            )
+        if cursor_x + width > max_width:
+            shelf_y += shelf_height
+            cursor_x = shelf_height = 0
+        if shelf_y + height > max_height:
+            sheet += 1
+            shelf_y = cursor_x = shelf_height = 0
+        placements[i] = (sheet, cursor_x, shelf_y)
+        cursor_x += width
+        shelf_height = max(shelf_height, height)
+    return placements
+
+
+class Atlas:
+    """A set of sheet images plus a JSON index of banner rectangles.
+
+    The index maps each banner id (e.g. a topic number) to its sheet and
+    rectangle. Rebuilding an atlas whose layout is unchanged only renders
+    the banners whose content changed and re-encodes only their sheets.
+    """
+
+    def __init__(
+        self,
+        directory: Path | str,
+        name: str = "atlas",
+        max_width: int = 4096,
+        max_height: int = 4096,
+        image_format: str = "PNG",
+        preset: str | None = None,
+    ) -> None:
+        """Initialize the atlas.
+
+        Args:
+            directory: Directory holding the sheets and the index.
+            name: Base name of the sheet and index files.
+            max_width: Maximum sheet width in pixels.
+            max_height: Maximum sheet height in pixels.
+            image_format: Sheet image format.
+            preset: Encoder preset for the sheets.
+        """
+        if max_width <= 0 or max_height <= 0:
+            raise ValueError("Sheet size must be positive")
+        self.directory = Path(directory)
+        self.name = name
+        self.max_width = max_width
+        self.max_height = max_height
+        self.image_format = normalize_format(image_format)
+        self.preset = preset
+        self.index_path = self.directory / f"{name}.json"
+
+    def sheet_path(self, sheet: int) -> Path:
+        """Return the file path of a sheet."""
+        extension = _EXTENSIONS.get(self.image_format, self.image_format.lower())
+        return self.directory / f"{self.name}-{sheet}.{extension}"
+
+    def load_index(self) -> dict[str, AtlasSlot] | None:
+        """Load the existing index, or None if there is no usable one."""
+        try:
+            data = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != _INDEX_VERSION or data.get("format") != self.image_format:
+            return None
+        try:
+            return {
+                banner_id: AtlasSlot(**slot)
+                for banner_id, slot in data.get("banners", {}).items()
+            }
+        except TypeError:
+            return None
+
+    def build(
+        self,
+        items: Sequence[tuple[str, Banner]],
+        generator: BannerGenerator,
+        jobs: int | None = 1,
+    ) -> AtlasReport:
+        """Render banners into the atlas, reusing unchanged regions.
+
+        Args:
+            items: ``(banner id, banner)`` pairs; ids must be unique.
+            generator: Generator used to render changed banners.
+            jobs: Worker processes used for rendering.
+
+        Returns:
+            A report of rendered and reused banners and written sheets.
+        """
+        ids = [banner_id for banner_id, _ in items]
+        if len(set(ids)) != len(ids):
+            raise ValueError("Atlas banner ids must be unique")
+        keys = [render_key(banner, icons=generator.icons) for _, banner in items]
+
+        previous = self.load_index()
+        if previous is not None and self._layout_matches(previous, items):
+            slots = previous
+            changed = [i for i, banner_id in enumerate(ids) if slots[banner_id].key != keys[i]]
+        else:
+            sizes = [(banner.config.width, banner.config.height) for _, banner in items]
+            placements = pack_shelves(sizes, self.max_width, self.max_height)
+            slots = {
+                banner_id: AtlasSlot(sheet, x, y, width, height)
+                for banner_id, (sheet, x, y), (width, height) in zip(ids, placements, sizes)
+            }
+            changed = list(range(len(items)))
+            previous = None
+
+        sheets = self._open_sheets(slots, {slots[ids[i]].sheet for i in changed}, previous)
+        results = generator.generate_many([items[i][1] for i in changed], jobs=jobs)
+        for result in results:
+            if result.banner is None or result.banner.image is None:
+                raise RuntimeError(f"Failed to render atlas banner: {result.error}")
+            i = changed[result.index]
+            slot = slots[ids[i]]
+            sheets[slot.sheet].paste(result.banner.image, (slot.x, slot.y))
+            slot.title = items[i][1].title
+            slot.key = keys[i]
+
+        report = AtlasReport(rendered=len(changed), reused=len(items) - len(changed))
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for sheet, image in sorted(sheets.items()):
+            path = self.sheet_path(sheet)
+            with encode_image(image, self.image_format, self.preset) as data:
+                path.write_bytes(data)
+            report.sheets_written.append(path)
+        if changed or previous is None:
+            self._write_index(slots)
+        report.index_path = self.index_path
+        return report
+
+    def _layout_matches(
+        self, slots: dict[str, AtlasSlot], items: Sequence[tuple[str, Banner]]
+    ) -> bool:
+        """Whether an existing layout can be updated in place."""
+        if set(slots) != {banner_id for banner_id, _ in items}:
+            return False
+        for banner_id, banner in items:
+            slot = slots[banner_id]
+            if (slot.width, slot.height) != (banner.config.width, banner.config.height):
+                return False
+        return all(
+            self.sheet_path(sheet).exists() for sheet in {s.sheet for s in slots.values()}
+        )
+
+    def _open_sheets(
+        self,
+        slots: dict[str, AtlasSlot],
+        sheets: set[int],
+        previous: dict[str, AtlasSlot] | None,
+    ) -> dict[int, Image.Image]:
+        """Load (or create) the sheets that need to be rewritten."""
+        images: dict[int, Image.Image] = {}
+        for sheet in sheets:
+            if previous is not None:
+                with Image.open(self.sheet_path(sheet)) as existing:
+                    images[sheet] = existing.convert("RGB")
+                continue
+            members = [slot for slot in slots.values() if slot.sheet == sheet]
+            width = max(slot.x + slot.width for slot in members)
+            height = max(slot.y + slot.height for slot in members)
+            images[sheet] = Image.new("RGB", (width, height))
+        return images
+
+    def _write_index(self, slots: dict[str, AtlasSlot]) -> None:
+        """Atomically write the JSON index."""
+        sheet_count = max((slot.sheet for slot in slots.values()), default=-1) + 1
+        data: dict[str, Any] = {
+            "version": _INDEX_VERSION,
+            "format": self.image_format,
+            "sheets": [self.sheet_path(i).name for i in range(sheet_count)],
+            "banners": {banner_id: asdict(slot) for banner_id, slot in slots.items()},
+        }
+        tmp_path = self.index_path.with_name(self.index_path.name + ".tmp")
+        tmp_path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+        os.replace(tmp_path, self.index_path)
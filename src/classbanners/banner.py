@@ -2,30 +2,123 @@
 
 from __future__ import annotations
 
+import operator
 import re
-from dataclasses import dataclass, field
+import threading
+import weakref
+from dataclasses import FrozenInstanceError, dataclass, field, fields
+from functools import lru_cache
 from pathlib import Path
-from typing import TYPE_CHECKING, Literal
+from typing import TYPE_CHECKING, Any, Literal, TypeVar
+
+from classbanners.buildcache import BuildCache, output_key
+from classbanners.fills import parse_fill
+from classbanners.icons import ICON_POSITIONS
 
 if TYPE_CHECKING:
+    import io
+
     from PIL import Image
 
+    from classbanners.instrument import MetricsSink
+
 
 # Regex pattern for hex color validation (3, 4, 6, or 8 hex digits)
 _HEX_COLOR_PATTERN = re.compile(r"^#(?:[0-9a-fA-F]{3,4}|[0-9a-fA-F]{6}|[0-9a-fA-F]{8})$")
 
+#: Values of ``BannerConfig.color_mode``: "auto" renders banners with few
+#: colors in a reduced image mode, "rgb" always renders full RGB.
+COLOR_MODES = ("auto", "rgb")
+
+#: Values of ``BannerConfig.fit``: "none" always uses ``font_size``,
+#: "shrink" lowers it until the text fits between the paddings.
+FIT_MODES = ("none", "shrink")
+
+RGBA = tuple[int, int, int, int]
 
-def _validate_hex_color(color: str, field_name: str) -> None:
-    """Validate that a string is a valid hex color."""
-    if not _HEX_COLOR_PATTERN.match(color):
+
+@lru_cache(maxsize=1024)
+def _parse_hex_color(color: str) -> RGBA | None:
+    """Parse a hex color into an RGBA tuple, or return None if invalid."""
+    if not isinstance(color, str) or not _HEX_COLOR_PATTERN.match(color):
+        return None
+    digits = color[1:]
+    if len(digits) <= 4:
+        digits = "".join(digit * 2 for digit in digits)
+    if len(digits) == 6:
+        digits += "ff"
+    r, g, b, a = (int(digits[i : i + 2], 16) for i in range(0, 8, 2))
+    return r, g, b, a
+
+
+def _validate_hex_color(color: str, field_name: str) -> RGBA:
+    """Validate that a string is a valid hex color and return it parsed."""
+    rgba = _parse_hex_color(color)
+    if rgba is None:
         raise ValueError(
             f"{field_name} must be a valid hex color (e.g., '#FF0000'), got '{color}'"
         )
+    return rgba
 
 
-@dataclass
-class BannerConfig:
-    """Configuration for banner generation."""
+_T = TypeVar("_T")
+
+
+def _frozen_setattr(self: object, name: str, value: Any) -> None:
+    raise FrozenInstanceError(f"cannot assign to field '{name}'")
+
+
+def _frozen_delattr(self: object, name: str) -> None:
+    raise FrozenInstanceError(f"cannot delete field '{name}'")
+
+
+def _slotted(cls: type[_T]) -> type[_T]:
+    """Rebuild a frozen dataclass, keeping its metaclass, with ``__slots__``.
+
+    Equivalent to ``dataclass(slots=True, weakref_slot=True)`` on Python
+    3.11+, plus the private ``_rgba`` and ``_hash`` slots that cache the
+    parsed colors and the hash.
+    """
+    names = tuple(f.name for f in fields(cls))  # type: ignore[arg-type]
+    namespace = dict(cls.__dict__)
+    for name in names:
+        namespace.pop(name, None)
+    namespace.pop("__dict__", None)
+    namespace.pop("__weakref__", None)
+    namespace["__slots__"] = (*names, "_rgba", "_hash", "__weakref__")
+    # The generated methods refer to the original class; replace them.
+    namespace["__setattr__"] = _frozen_setattr
+    namespace["__delattr__"] = _frozen_delattr
+    metaclass: type[Any] = type(cls)
+    slotted: type[_T] = metaclass(cls.__name__, cls.__bases__, namespace)
+    slotted.__qualname__ = cls.__qualname__
+    return slotted
+
+
+# Canonical instance of every live BannerConfig value; see BannerConfig.intern.
+_interned: weakref.WeakValueDictionary[tuple[Any, ...], BannerConfig] = (
+    weakref.WeakValueDictionary()
+)
+_interned_lock = threading.Lock()
+
+
+class _InternedMeta(type):
+    """Metaclass that returns the interned instance of every new config."""
+
+    def __call__(cls, *args: Any, **kwargs: Any) -> Any:
+        return super().__call__(*args, **kwargs).intern()
+
+
+@_slotted
+@dataclass(frozen=True)
+class BannerConfig(metaclass=_InternedMeta):
+    """Configuration for banner generation.
+
+    Configs are immutable and hashable, so they can key caches and be
+    shared freely between banners. Equal configs are the same object,
+    however they were made: constructed, derived with :meth:`replace`
+    (which changes a few fields) or unpickled in a worker process.
+    """
 
     width: int = 800
     height: int = 200
@@ -37,6 +130,12 @@ class BannerConfig:
     border_width: int = 0
     border_color: str = "#000000"
     text_align: Literal["left", "center", "right"] = "center"
+    color_mode: Literal["auto", "rgb"] = "auto"
+    icon_size: int = 0
+    icon_position: Literal["left", "right"] = "left"
+    fit: Literal["none", "shrink"] = "none"
+    background_fill: str = "solid"
+    fill_color: str = "#000000"
 
     def __post_init__(self) -> None:
         """Validate configuration values."""
@@ -50,19 +149,123 @@ class BannerConfig:
             raise ValueError("Padding cannot be negative")
         if self.border_width < 0:
             raise ValueError("Border width cannot be negative")
-        _validate_hex_color(self.background_color, "background_color")
-        _validate_hex_color(self.text_color, "text_color")
-        _validate_hex_color(self.border_color, "border_color")
+        if self.icon_size < 0:
+            raise ValueError("Icon size cannot be negative")
+        if self.icon_position not in ICON_POSITIONS:
+            raise ValueError(
+                f"icon_position must be one of {', '.join(ICON_POSITIONS)}, "
+                f"got '{self.icon_position}'"
+            )
+        if self.fit not in FIT_MODES:
+            raise ValueError(
+                f"fit must be one of {', '.join(FIT_MODES)}, got '{self.fit}'"
+            )
+        parse_fill(self.background_fill)
+        rgba = (
+            _validate_hex_color(self.background_color, "background_color"),
+            _validate_hex_color(self.text_color, "text_color"),
+            _validate_hex_color(self.border_color, "border_color"),
+            _validate_hex_color(self.fill_color, "fill_color"),
+        )
+        if self.color_mode not in COLOR_MODES:
+            raise ValueError(
+                f"color_mode must be one of {', '.join(COLOR_MODES)}, "
+                f"got '{self.color_mode}'"
+            )
+        object.__setattr__(self, "_rgba", rgba)
+
+    def __hash__(self) -> int:
+        try:
+            return self._hash  # type: ignore[attr-defined,no-any-return]
+        except AttributeError:
+            value = hash(self._values())
+            object.__setattr__(self, "_hash", value)
+            return value
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Unpickled configs (e.g. in worker processes) are interned too.
+        return _unpickle_config, (self._values(),)
+
+    @property
+    def background_rgba(self) -> RGBA:
+        """The background color as an RGBA tuple."""
+        return self._rgba[0]  # type: ignore[attr-defined,no-any-return]
+
+    @property
+    def text_rgba(self) -> RGBA:
+        """The text color as an RGBA tuple."""
+        return self._rgba[1]  # type: ignore[attr-defined,no-any-return]
+
+    @property
+    def border_rgba(self) -> RGBA:
+        """The border color as an RGBA tuple."""
+        return self._rgba[2]  # type: ignore[attr-defined,no-any-return]
+
+    @property
+    def fill_rgba(self) -> RGBA:
+        """The color a background fill blends towards, as an RGBA tuple."""
+        return self._rgba[3]  # type: ignore[attr-defined,no-any-return]
+
+    def replace(self, **changes: Any) -> BannerConfig:
+        """Return the interned config with ``changes`` applied.
+
+        If an equal config already exists it is returned without being
+        validated again.
+
+        Raises:
+            TypeError: If a change names an unknown field.
+            ValueError: If the resulting config is invalid.
+        """
+        if not changes:
+            return self
+        unknown = set(changes).difference(_FIELD_NAMES)
+        if unknown:
+            raise TypeError(f"Unknown BannerConfig field '{sorted(unknown)[0]}'")
+        values = tuple(
+            changes[name] if name in changes else value
+            for name, value in zip(_FIELD_NAMES, self._values())
+        )
+        existing = _interned.get(values)
+        if existing is not None:
+            return existing
+        return BannerConfig(**dict(zip(_FIELD_NAMES, values)))
+
+    def intern(self) -> BannerConfig:
+        """Return the canonical instance equal to this config."""
+        with _interned_lock:
+            return _interned.setdefault(self._values(), self)
+
+    def _values(self) -> tuple[Any, ...]:
+        return _field_values(self)
+
+
+_FIELD_NAMES = tuple(f.name for f in fields(BannerConfig))
+_field_values = operator.attrgetter(*_FIELD_NAMES)
+
+
+def _unpickle_config(values: tuple[Any, ...]) -> BannerConfig:
+    """Rebuild a pickled BannerConfig, reusing an interned instance."""
+    existing = _interned.get(values)
+    if existing is not None:
+        return existing
+    return BannerConfig(**dict(zip(_FIELD_NAMES, values)))
 
 
 @dataclass
 class Banner:
-    """Represents a generated banner."""
+    """Represents a generated banner.
+
+    Banners from :meth:`BannerGenerator.iter_banners` are single-use: their
+    image is released once they have been saved or encoded.
+    """
 
     title: str
     subtitle: str = ""
     config: BannerConfig = field(default_factory=BannerConfig)
+    icon: str | None = None
     _image: Image.Image | None = field(default=None, repr=False)
+    _metrics: MetricsSink | None = field(default=None, repr=False, compare=False)
+    _release: bool = field(default=False, repr=False, compare=False)
 
     @property
     def image(self) -> Image.Image | None:
@@ -74,22 +277,115 @@ class Banner:
         """Set the banner image."""
         self._image = value
 
-    def save(self, path: Path | str, image_format: str | None = None) -> None:
+    def save(
+        self,
+        path: Path | str,
+        image_format: str | None = None,
+        build_cache: BuildCache | None = None,
+        preset: str | None = None,
+        **options: Any,
+    ) -> bool:
         """Save the banner to a file.
 
         Args:
             path: Output file path.
             image_format: Image format (e.g., 'PNG', 'JPEG'). Auto-detected if None.
+            build_cache: Optional build cache; an existing output written for
+                the same content is left untouched. Icons are fingerprinted
+                from the bundled icons; use
+                :meth:`BannerGenerator.render_file` with a custom registry.
+            preset: Encoder preset ('fast', 'balanced' or 'smallest').
+            **options: Explicit encoder settings (e.g., compress_level).
+
+        Returns:
+            True if the file was written, False if it was already up to date.
 
         Raises:
             ValueError: If no image has been generated.
         """
+        from classbanners.encoding import encode_image, resolve_encoding
+        from classbanners.instrument import span
+
+        path = Path(path)
+        key = None
+        if build_cache is not None:
+            key = output_key(self, path, image_format, preset, **options)
+            if build_cache.is_current(path, key):
+                self._release_image()
+                return False
+
         if self._image is None:
             raise ValueError("No image to save. Generate the banner first.")
 
-        path = Path(path)
-        path.parent.mkdir(parents=True, exist_ok=True)
-        self._image.save(path, format=image_format)
+        image_format, settings = resolve_encoding(path, image_format, preset, **options)
+        with span(self._metrics, "encode"):
+            data = encode_image(self._image, image_format, **settings)
+        with span(self._metrics, "write"):
+            try:
+                path.write_bytes(data)
+            except FileNotFoundError:
+                # Only create the parent directory when it is actually missing.
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(data)
+        if build_cache is not None and key is not None:
+            build_cache.record(path, key)
+        self._release_image()
+        return True
+
+    def encode(
+        self,
+        image_format: str = "PNG",
+        preset: str | None = None,
+        buffer: io.BytesIO | None = None,
+        **options: Any,
+    ) -> memoryview:
+        """Encode the banner into an in-memory buffer without touching disk.
+
+        Args:
+            image_format: Image format (e.g., 'PNG', 'WEBP', 'JPEG').
+            preset: Encoder preset ('fast', 'balanced' or 'smallest').
+            buffer: Buffer to reuse across calls. Release any view returned
+                for it before reusing it.
+            **options: Explicit encoder settings (e.g., compress_level).
+
+        Returns:
+            A view of the encoded bytes.
+
+        Raises:
+            ValueError: If no image has been generated.
+        """
+        from classbanners.encoding import encode_image
+
+        if self._image is None:
+            raise ValueError("No image to encode. Generate the banner first.")
+        data = encode_image(self._image, image_format, preset, buffer, **options)
+        self._release_image()
+        return data
+
+    def to_bytes(
+        self, image_format: str = "PNG", preset: str | None = None, **options: Any
+    ) -> bytes:
+        """Encode the banner and return the encoded bytes.
+
+        Args:
+            image_format: Image format (e.g., 'PNG', 'WEBP', 'JPEG').
+            preset: Encoder preset ('fast', 'balanced' or 'smallest').
+            **options: Explicit encoder settings (e.g., compress_level).
+
+        Raises:
+            ValueError: If no image has been generated.
+        """
+        with self.encode(image_format, preset, **options) as view:
+            return view.tobytes()
+
+    def release(self) -> None:
+        """Drop the image so its pixel buffer can be freed."""
+        self._image = None
+
+    def _release_image(self) -> None:
+        """Drop the image after use if the banner is single-use."""
+        if self._release:
+            self._image = None
 
     def show(self) -> None:
         """Display the banner image.
@@ -100,3 +396,18 @@ class Banner:
         if self._image is None:
             raise ValueError("No image to show. Generate the banner first.")
         self._image.show()
+
+
+@dataclass
+class BatchResult:
+    """Outcome of rendering one item of a batch."""
+
+    index: int
+    banner: Banner | None = None
+    error: Exception | None = None
+    duration: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """Whether the item rendered successfully."""
+        return self.error is None
@@ -0,0 +1,220 @@
+"""Content-addressed build cache for skipping unchanged banners."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections.abc import Mapping
+from dataclasses import asdict
+from pathlib import Path
+from types import TracebackType
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from classbanners.banner import Banner
+    from classbanners.icons import IconRegistry
+
+logger = logging.getLogger(__name__)
+
+INDEX_NAME = ".classbanners-cache.json"
+_INDEX_VERSION = 1
+
+# File digests keyed by (path, mtime_ns, size).
+_file_digests: dict[tuple[str, int, int], str] = {}
+_file_digests_lock = threading.Lock()
+
+
+def file_digest(path: Path | str) -> str:
+    """Return the SHA-256 of a file, memoized by path, mtime and size."""
+    stat = os.stat(path)
+    memo_key = (str(path), stat.st_mtime_ns, stat.st_size)
+    with _file_digests_lock:
+        digest = _file_digests.get(memo_key)
+    if digest is None:
+        hasher = hashlib.sha256()
+        with open(path, "rb") as fp:
+            for block in iter(lambda: fp.read(1024 * 1024), b""):
+                hasher.update(block)
+        digest = hasher.hexdigest()
+        with _file_digests_lock:
+            _file_digests[memo_key] = digest
+    return digest
+
+
+def _font_fingerprint(banner: Banner) -> str:
+    """Identify the font file a banner will be rendered with."""
+    from classbanners.fonts import get_font_cache
+
+    config = banner.config
+    if config.font_path is not None:
+        try:
+            return file_digest(config.font_path)
+        except OSError:
+            # The generator falls back to the default font.
+            pass
+    font = get_font_cache().get(config.font_size, config.font_path)
+    font_file = getattr(font, "path", None)
+    if isinstance(font_file, str):
+        try:
+            return file_digest(font_file)
+        except OSError:
+            return f"unreadable:{font_file}"
+    return "builtin"
+
+
+def _icon_fingerprint(name: str, icons: IconRegistry | None = None) -> str:
+    """Return a hash of an icon's content (default: a bundled icon)."""
+    from classbanners.icons import get_icon_registry
+
+    try:
+        return file_digest((icons or get_icon_registry()).path(name))
+    except (OSError, ValueError):
+        return "missing"
+
+
+def render_key(
+    banner: Banner,
+    encoding: Mapping[str, Any] | None = None,
+    icons: IconRegistry | None = None,
+) -> str:
+    """Return a stable hash of everything that affects a banner's output.
+
+    The key covers the title, subtitle, every BannerConfig field, the
+    content of the font file and of the icon (looked up in ``icons``, the
+    bundled icons by default), the package version and, if given, the
+    encoder settings.
+    """
+    from classbanners import __version__
+
+    payload: dict[str, Any] = {
+        "title": banner.title,
+        "subtitle": banner.subtitle,
+        "config": asdict(banner.config),
+        "font": _font_fingerprint(banner),
+        "version": __version__,
+        "encoding": dict(encoding) if encoding else None,
+    }
+    if banner.icon:
+        payload["icon"] = [banner.icon, _icon_fingerprint(banner.icon, icons)]
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def output_key(
+    banner: Banner,
+    path: Path | str,
+    image_format: str | None = None,
+    preset: str | None = None,
+    icons: IconRegistry | None = None,
+    **options: Any,
+) -> str:
+    """Return the render key of ``banner`` saved to ``path`` with these settings."""
+    from classbanners.encoding import resolve_encoding
+
+    image_format, settings = resolve_encoding(path, image_format, preset, **options)
+    return render_key(banner, {"format": image_format, **settings}, icons)
+
+
+class BuildCache:
+    """On-disk index of render keys for the outputs in a directory.
+
+    An output is up to date when the index holds its render key and the
+    file still has the size and modification time recorded when it was
+    written. Call :meth:`flush` (or use the cache as a context manager) to
+    persist the index.
+    """
+
+    def __init__(self, directory: Path | str) -> None:
+        """Load the index stored in ``directory``, if any.
+
+        Args:
+            directory: Output directory the index lives in.
+        """
+        self.directory = Path(directory)
+        self.index_path = self.directory / INDEX_NAME
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable build cache '%s': %s", self.index_path, exc)
+            return
+        if data.get("version") == _INDEX_VERSION:
+            self._entries = data.get("entries", {})
+
+    def _name(self, path: Path | str) -> str:
+        """Return the index name for an output path."""
+        path = Path(path).absolute()
+        try:
+            return path.relative_to(self.directory.absolute()).as_posix()
+        except ValueError:
+            return str(path)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def is_current(self, path: Path | str, key: str) -> bool:
+        """Whether ``path`` exists and was written for ``key``."""
+        with self._lock:
+            entry = self._entries.get(self._name(path))
+        if entry is None or entry.get("key") != key:
+            return False
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        return bool(
+            stat.st_size == entry.get("size") and stat.st_mtime_ns == entry.get("mtime_ns")
+        )
+
+    def record(self, path: Path | str, key: str) -> None:
+        """Remember that ``path`` was just written for ``key``."""
+        stat = os.stat(path)
+        with self._lock:
+            self._entries[self._name(path)] = {
+                "key": key,
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+            }
+            self._dirty = True
+
+    def discard(self, path: Path | str) -> None:
+        """Forget the entry for ``path``."""
+        with self._lock:
+            if self._entries.pop(self._name(path), None) is not None:
+                self._dirty = True
+
+    def flush(self) -> None:
+        """Atomically write the index if it changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = json.dumps(
+                {"version": _INDEX_VERSION, "entries": self._entries},
+                sort_keys=True,
+            )
+            self._dirty = False
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_name(self.index_path.name + ".tmp")
+        tmp_path.write_text(payload, encoding="utf-8")
+        os.replace(tmp_path, self.index_path)
+
+    def __enter__(self) -> BuildCache:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.flush()
@@ -0,0 +1,152 @@
+"""Bounded caches shared by the rendering pipeline."""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass
+from typing import Callable, Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass
+class CacheStats:
+    """Counters describing how a cache has been used."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class LRUCache(Generic[K, V]):
+    """Thread-safe least-recently-used cache.
+
+    Entries are evicted once either ``max_entries`` or ``max_bytes`` is
+    exceeded. Byte accounting is only performed when a ``sizeof`` callable
+    is supplied.
+    """
+
+    def __init__(
+        self,
+        max_entries: int | None = 128,
+        max_bytes: int | None = None,
+        sizeof: Callable[[V], int] | None = None,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of entries (None for unlimited).
+            max_bytes: Maximum total size in bytes (None for unlimited).
+            sizeof: Callable returning the size of a value in bytes.
+        """
+        if max_entries is not None and max_entries < 0:
+            raise ValueError("max_entries cannot be negative")
+        if max_bytes is not None and max_bytes < 0:
+            raise ValueError("max_bytes cannot be negative")
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._data: OrderedDict[K, V] = OrderedDict()
+        self._sizes: dict[K, int] = {}
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self.stats = CacheStats()
+
+    @property
+    def max_entries(self) -> int | None:
+        """Maximum number of entries kept in the cache."""
+        return self._max_entries
+
+    @max_entries.setter
+    def max_entries(self, value: int | None) -> None:
+        if value is not None and value < 0:
+            raise ValueError("max_entries cannot be negative")
+        with self._lock:
+            self._max_entries = value
+            self._evict()
+
+    @property
+    def max_bytes(self) -> int | None:
+        """Maximum total size of cached values in bytes."""
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, value: int | None) -> None:
+        if value is not None and value < 0:
+            raise ValueError("max_bytes cannot be negative")
+        with self._lock:
+            self._max_bytes = value
+            self._evict()
+
+    @property
+    def current_bytes(self) -> int:
+        """Total size of the cached values in bytes."""
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def get(self, key: K) -> V | None:
+        """Return the cached value for ``key``, or None on a miss."""
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.stats.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def put(self, key: K, value: V) -> None:
+        """Store ``value`` under ``key``, evicting old entries if needed."""
+        size = self._sizeof(value) if self._sizeof is not None else 0
+        with self._lock:
+            if key in self._data:
+                self._bytes -= self._sizes.pop(key, 0)
+                del self._data[key]
+            if self._max_bytes is not None and size > self._max_bytes:
+                # Never cache something that could not fit on its own.
+                return
+            self._data[key] = value
+            self._sizes[key] = size
+            self._bytes += size
+            self._evict()
+
+    def get_or_create(self, key: K, factory: Callable[[], V]) -> V:
+        """Return the cached value for ``key``, creating it on a miss."""
+        value = self.get(key)
+        if value is None:
+            value = factory()
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        """Remove all entries and reset the statistics."""
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self._bytes = 0
+            self.stats = CacheStats()
+
+    def _evict(self) -> None:
+        """Drop least-recently-used entries until within limits."""
+        while self._data and (
+            (self._max_entries is not None and len(self._data) > self._max_entries)
+            or (self._max_bytes is not None and self._bytes > self._max_bytes)
+        ):
+            key, _ = self._data.popitem(last=False)
+            self._bytes -= self._sizes.pop(key, 0)
+            self.stats.evictions += 1
@@ -0,0 +1,121 @@
+"""Cache of pre-rendered base canvases (background and border)."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Hashable
+from dataclasses import dataclass
+from typing import Callable
+
+from PIL import Image
+
+from classbanners.cache import CacheStats, LRUCache
+
+DEFAULT_CANVAS_BUDGET = 64 * 1024 * 1024
+
+
+def image_nbytes(image: Image.Image) -> int:
+    """Approximate the memory used by an image's pixel buffer."""
+    return image.width * image.height * len(image.getbands())
+
+
+@dataclass
+class CanvasMetrics:
+    """Timing counters for a CanvasCache."""
+
+    build_seconds: float = 0.0
+    copy_seconds: float = 0.0
+    saved_seconds: float = 0.0
+
+
+@dataclass
+class _CachedCanvas:
+    image: Image.Image
+    build_seconds: float
+
+
+class CanvasCache:
+    """Memory-bounded LRU cache of finished base canvases.
+
+    Callers receive a copy of the cached canvas, so drawing on the result
+    never alters the cached image. ``metrics.saved_seconds`` estimates the
+    time saved by copying instead of repainting.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CANVAS_BUDGET) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_bytes: Memory budget for cached canvases in bytes.
+        """
+        self._cache: LRUCache[Hashable, _CachedCanvas] = LRUCache(
+            max_entries=None,
+            max_bytes=max_bytes,
+            sizeof=lambda entry: image_nbytes(entry.image),
+        )
+        self.metrics = CanvasMetrics()
+
+    @property
+    def max_bytes(self) -> int | None:
+        """Memory budget for cached canvases in bytes."""
+        return self._cache.max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, value: int) -> None:
+        self._cache.max_bytes = value
+
+    @property
+    def current_bytes(self) -> int:
+        """Memory currently used by cached canvases in bytes."""
+        return self._cache.current_bytes
+
+    @property
+    def stats(self) -> CacheStats:
+        """Hit, miss and eviction counters."""
+        return self._cache.stats
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def get(self, key: Hashable, build: Callable[[], Image.Image]) -> Image.Image:
+        """Return a fresh copy of the canvas for ``key``.
+
+        Args:
+            key: Hashable description of the canvas.
+            build: Callable that paints the canvas on a cache miss.
+        """
+        entry = self._cache.get(key)
+        if entry is None:
+            start = time.perf_counter()
+            image = build()
+            entry = _CachedCanvas(image, time.perf_counter() - start)
+            self.metrics.build_seconds += entry.build_seconds
+            self._cache.put(key, entry)
+            if key not in self._cache:
+                # Too large for the budget; hand out the original.
+                return image
+
+            start = time.perf_counter()
+            canvas = image.copy()
+            self.metrics.copy_seconds += time.perf_counter() - start
+            return canvas
+
+        start = time.perf_counter()
+        canvas = entry.image.copy()
+        elapsed = time.perf_counter() - start
+        self.metrics.copy_seconds += elapsed
+        self.metrics.saved_seconds += max(entry.build_seconds - elapsed, 0.0)
+        return canvas
+
+    def clear(self) -> None:
+        """Drop all cached canvases and reset the statistics."""
+        self._cache.clear()
+        self.metrics = CanvasMetrics()
+
+
+_canvas_cache = CanvasCache()
+
+
+def get_canvas_cache() -> CanvasCache:
+    """Return the process-wide canvas cache."""
+    return _canvas_cache
@@ -3,11 +3,143 @@
 from __future__ import annotations
 
 import argparse
+import heapq
+import signal
 import sys
+import time
+from collections.abc import Iterator
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from classbanners.banner import BannerConfig
-from classbanners.generator import BannerGenerator
+from classbanners.banner import COLOR_MODES, FIT_MODES, Banner, BannerConfig
+from classbanners.buildcache import BuildCache, output_key
+from classbanners.encoding import PRESET_NAMES
+from classbanners.icons import ICON_POSITIONS, IconRegistry
+from classbanners.instrument import StageProfiler
+from classbanners.manifest import (
+    DEFAULT_TEMPLATE,
+    ManifestEntry,
+    format_output_name,
+    read_manifest,
+)
+from classbanners.variants import parse_variants
+
+if TYPE_CHECKING:
+    # Pillow is only imported once rendering actually starts.
+    from classbanners.generator import BannerGenerator, BatchItem
+    from classbanners.watch import SyncReport
+
+# Number of slowest items listed in the batch summary.
+_SLOWEST_COUNT = 3
+
+
+def _add_config_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the options that build a BannerConfig."""
+    parser.add_argument(
+        "-W", "--width", type=int, default=800, help="Banner width (default: 800)"
+    )
+    parser.add_argument(
+        "-H", "--height", type=int, default=200, help="Banner height (default: 200)"
+    )
+    parser.add_argument(
+        "-b",
+        "--background",
+        default="#4A90D9",
+        help="Background color (default: #4A90D9)",
+    )
+    parser.add_argument(
+        "-c", "--color", default="#FFFFFF", help="Text color (default: #FFFFFF)"
+    )
+    parser.add_argument(
+        "-f", "--font-size", type=int, default=48, help="Font size (default: 48)"
+    )
+    parser.add_argument("--font", type=Path, help="Path to custom font file")
+    parser.add_argument(
+        "--color-mode",
+        choices=COLOR_MODES,
+        default="auto",
+        help=(
+            "'auto' renders banners with few colors as grayscale or palette "
+            "images; 'rgb' always renders full RGB (default: auto)"
+        ),
+    )
+    parser.add_argument(
+        "--fit",
+        choices=FIT_MODES,
+        default="none",
+        help="'shrink' lowers the font size until long titles fit (default: none)",
+    )
+    parser.add_argument(
+        "--fill",
+        default="solid",
+        metavar="SPEC",
+        help=(
+            "Background fill: solid, linear[:ANGLE], radial, "
+            "stripes[:PERIOD[:ANGLE]] or noise[:PERCENT] (needs NumPy; "
+            "default: solid)"
+        ),
+    )
+    parser.add_argument(
+        "--fill-color",
+        default="#000000",
+        help="Color the background fill blends towards (default: #000000)",
+    )
+    parser.add_argument(
+        "--icon-size",
+        type=int,
+        default=0,
+        help="Icon size in pixels (default: twice the font size, within padding)",
+    )
+    parser.add_argument(
+        "--icon-position",
+        choices=ICON_POSITIONS,
+        default="left",
+        help="Side of the banner the icon is drawn on (default: left)",
+    )
+    parser.add_argument(
+        "--icons",
+        type=Path,
+        metavar="DIR",
+        help="Directory of NAME.png icon files (default: the bundled icons)",
+    )
+    parser.add_argument(
+        "--preset",
+        choices=PRESET_NAMES,
+        default=None,
+        help="Encoder preset trading speed for file size (default: Pillow's)",
+    )
+
+
+def _add_profile_argument(parser: argparse.ArgumentParser) -> None:
+    """Add the --profile option."""
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print a per-stage timing breakdown at the end of the run",
+    )
+
+
+def _config_from_args(parsed: argparse.Namespace) -> BannerConfig:
+    """Build a BannerConfig from parsed arguments."""
+    return BannerConfig(
+        width=parsed.width,
+        height=parsed.height,
+        background_color=parsed.background,
+        text_color=parsed.color,
+        font_size=parsed.font_size,
+        font_path=parsed.font,
+        color_mode=parsed.color_mode,
+        icon_size=parsed.icon_size,
+        icon_position=parsed.icon_position,
+        fit=parsed.fit,
+        background_fill=parsed.fill,
+        fill_color=parsed.fill_color,
+    )
+
+
+def _icons_from_args(parsed: argparse.Namespace) -> IconRegistry | None:
+    """Return the icon registry selected by --icons, if any."""
+    return IconRegistry(parsed.icons) if parsed.icons is not None else None
 
 
 def parse_args(args: list[str] | None = None) -> argparse.Namespace:
@@ -15,62 +147,643 @@ def parse_args(args: list[str] | None = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         prog="classbanners",
         description="Generate customizable class banners",
+        epilog=(
+            "Subcommands: 'classbanners batch' renders a whole manifest, "
+            "'classbanners serve' runs an HTTP render service and "
+            "'classbanners daemon' keeps a warm renderer for repeated calls. "
+            "To render a banner titled like a subcommand, put '--' or an "
+            "option before the title: 'classbanners -- batch'."
+        ),
     )
     parser.add_argument("title", help="Banner title text")
     parser.add_argument("-s", "--subtitle", default="", help="Subtitle text")
+    parser.add_argument("-i", "--icon", help="Name of an icon to draw beside the text")
     parser.add_argument(
         "-o",
         "--output",
         type=Path,
         default=Path("banner.png"),
-        help="Output file path (default: banner.png)",
+        help="Output file path; .svg writes a vector banner (default: banner.png)",
     )
+    _add_config_arguments(parser)
     parser.add_argument(
-        "-W", "--width", type=int, default=800, help="Banner width (default: 800)"
+        "--embed-font",
+        action="store_true",
+        help="Embed the font in SVG output (subset if fontTools is installed)",
     )
     parser.add_argument(
-        "-H", "--height", type=int, default=200, help="Banner height (default: 200)"
+        "--show", action="store_true", help="Display the banner after generation"
     )
     parser.add_argument(
-        "-b",
-        "--background",
-        default="#4A90D9",
-        help="Background color (default: #4A90D9)",
+        "--strip-height",
+        type=int,
+        metavar="ROWS",
+        help=(
+            "Render and encode ROWS rows at a time to bound memory for very "
+            "large banners (PNG and TIFF output only)"
+        ),
     )
     parser.add_argument(
-        "-c", "--color", default="#FFFFFF", help="Text color (default: #FFFFFF)"
+        "--sizes",
+        metavar="SPECS",
+        help=(
+            "Comma-separated sizes rendered from one render, e.g. "
+            "1x,2x,thumb,card (1x is the output path, others NAME@SIZE.ext)"
+        ),
     )
+    _add_profile_argument(parser)
     parser.add_argument(
-        "-f", "--font-size", type=int, default=48, help="Font size (default: 48)"
+        "--no-daemon",
+        action="store_true",
+        help="Render in this process even if 'classbanners daemon' is running",
     )
-    parser.add_argument("--font", type=Path, help="Path to custom font file")
+
+    return parser.parse_args(args)
+
+
+def parse_batch_args(args: list[str] | None = None) -> argparse.Namespace:
+    """Parse arguments of the ``batch`` subcommand."""
+    parser = argparse.ArgumentParser(
+        prog="classbanners batch",
+        description="Render every entry of a JSON, JSONL or CSV manifest",
+    )
+    parser.add_argument("manifest", type=Path, help="Manifest file to render")
     parser.add_argument(
-        "--show", action="store_true", help="Display the banner after generation"
+        "-o",
+        "--output",
+        type=Path,
+        default=Path("."),
+        help=(
+            "Output directory, or a .zip or .tar file to stream the banners "
+            "into (default: current directory)"
+        ),
+    )
+    parser.add_argument(
+        "-t",
+        "--template",
+        default=DEFAULT_TEMPLATE,
+        help=f"Output filename template (default: {DEFAULT_TEMPLATE})",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: CPU count)",
+    )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=1,
+        help="Banners sent to a worker at a time (default: 1)",
+    )
+    parser.add_argument(
+        "--encode-threads",
+        type=int,
+        default=None,
+        help="Threads encoding images while others render (default: CPU count)",
+    )
+    parser.add_argument(
+        "--write-threads",
+        type=int,
+        default=1,
+        help="Threads writing files (default: 1)",
     )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Skip banners whose output is already up to date",
+    )
+    parser.add_argument(
+        "--atlas",
+        metavar="NAME",
+        help="Pack all banners into sprite sheets NAME-<n>.png with a NAME.json index",
+    )
+    parser.add_argument(
+        "--sheet-size",
+        type=_parse_size,
+        default=(4096, 4096),
+        metavar="WxH",
+        help="Maximum atlas sheet size (default: 4096x4096)",
+    )
+    _add_profile_argument(parser)
+    _add_config_arguments(parser)
 
     return parser.parse_args(args)
 
 
+def _parse_size(value: str) -> tuple[int, int]:
+    """Parse a WIDTHxHEIGHT argument."""
+    try:
+        width, height = (int(part) for part in value.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, got '{value}'") from None
+    return width, height
+
+
+def _format_bytes(size: float) -> str:
+    """Format a byte count for humans."""
+    if size < 1024:
+        return f"{int(size)} B"
+    for unit in ("KB", "MB"):
+        size /= 1024
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+    return f"{size / 1024:.1f} GB"
+
+
+def batch_main(args: list[str] | None = None) -> int:
+    """Entry point for the ``batch`` subcommand."""
+    parsed = parse_batch_args(args)
+    try:
+        base_config = _config_from_args(parsed)
+    except ValueError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+    from classbanners.archive import is_archive_path, open_archive
+
+    archive = is_archive_path(parsed.output)
+    if archive and (parsed.incremental or parsed.atlas):
+        option = "--incremental" if parsed.incremental else "--atlas"
+        print(f"error: {option} cannot write into an archive", file=sys.stderr)
+        return 1
+
+    from classbanners.generator import BannerGenerator
+    from classbanners.pipeline import BannerPipeline, FileSink, OutputSink
+
+    profiler = StageProfiler() if parsed.profile else None
+    generator = BannerGenerator(
+        base_config, metrics=profiler, icons=_icons_from_args(parsed)
+    )
+    if parsed.atlas:
+        return _batch_atlas(parsed, generator, profiler)
+    build_cache = BuildCache(parsed.output) if parsed.incremental else None
+    # Entries being rendered with their render key, keyed by batch index.
+    # Filled on the pipeline's render thread, drained here.
+    in_flight: dict[int, tuple[ManifestEntry, str | None]] = {}
+    submitted = 0
+    up_to_date = 0
+    invalid = 0
+
+    def items() -> Iterator[tuple[Banner, Path]]:
+        nonlocal submitted, up_to_date, invalid
+        for entry in read_manifest(parsed.manifest):
+            key = None
+            try:
+                config = entry.config(base_config)
+                path = Path(format_output_name(parsed.template, entry))
+                if not archive:
+                    path = parsed.output / path
+                banner = Banner(entry.title, entry.subtitle, config, icon=entry.icon)
+                if build_cache is not None:
+                    key = output_key(
+                        banner, path, preset=parsed.preset, icons=generator.icons
+                    )
+            except (KeyError, ValueError) as exc:
+                invalid += 1
+                print(f"error: {entry.describe(exc)}", file=sys.stderr)
+                continue
+            if build_cache is not None and key is not None:
+                if build_cache.is_current(path, key):
+                    up_to_date += 1
+                    continue
+            in_flight[submitted] = (entry, key)
+            submitted += 1
+            yield banner, path
+
+    try:
+        sink: OutputSink = open_archive(parsed.output) if archive else FileSink()
+        pipeline = BannerPipeline(
+            generator,
+            jobs=parsed.jobs,
+            chunksize=parsed.chunksize,
+            encode_threads=parsed.encode_threads,
+            write_threads=parsed.write_threads,
+            preset=parsed.preset,
+            sink=sink,
+        )
+    except (OSError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+    rendered = 0
+    failures = 0
+    total_bytes = 0
+    slowest: list[tuple[float, str]] = []
+    start = time.perf_counter()
+
+    try:
+        for result in pipeline.run(items()):
+            entry, key = in_flight.pop(result.index)
+            if result.error is not None:
+                failures += 1
+                print(f"error: {entry.title}: {result.error}", file=sys.stderr)
+                continue
+            if build_cache is not None and key is not None:
+                build_cache.record(result.path, key)
+
+            rendered += 1
+            total_bytes += result.nbytes
+            item = (result.duration, entry.title)
+            if len(slowest) < _SLOWEST_COUNT:
+                heapq.heappush(slowest, item)
+            else:
+                heapq.heappushpop(slowest, item)
+    except (OSError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    finally:
+        sink.close()
+        if build_cache is not None:
+            build_cache.flush()
+    failures += invalid
+
+    elapsed = time.perf_counter() - start
+    rate = rendered / elapsed if elapsed > 0 else 0.0
+    print(
+        f"Rendered {rendered} banners in {elapsed:.2f}s "
+        f"({rate:.1f} banners/sec), {_format_bytes(total_bytes)} written"
+        + (f" to {parsed.output}" if archive else "")
+    )
+    if build_cache is not None:
+        print(f"{rendered} rendered, {up_to_date} up-to-date")
+    if slowest:
+        print("Slowest:")
+        for seconds, title in sorted(slowest, reverse=True):
+            print(f"  {seconds * 1000:8.1f} ms  {title}")
+    if rendered:
+        print(pipeline.report.format())
+    if profiler is not None:
+        print(profiler.report())
+    if failures:
+        print(f"{failures} banners failed", file=sys.stderr)
+        return 1
+    return 0
+
+
+def parse_serve_args(args: list[str] | None = None) -> argparse.Namespace:
+    """Parse arguments of the ``serve`` subcommand."""
+    parser = argparse.ArgumentParser(
+        prog="classbanners serve",
+        description="Serve banners over HTTP at /banner?title=...",
+    )
+    parser.add_argument(
+        "--host", default="127.0.0.1", help="Interface to bind (default: 127.0.0.1)"
+    )
+    parser.add_argument(
+        "-p", "--port", type=int, default=8000, help="Port to bind (default: 8000)"
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=4,
+        help="Number of rendering threads (default: 4)",
+    )
+    parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=16,
+        help="Concurrent renders before answering 503 (default: 16)",
+    )
+    _add_config_arguments(parser)
+
+    return parser.parse_args(args)
+
+
+def serve_main(args: list[str] | None = None) -> int:
+    """Entry point for the ``serve`` subcommand."""
+    parsed = parse_serve_args(args)
+    try:
+        config = _config_from_args(parsed)
+    except ValueError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+    from classbanners.generator import BannerGenerator
+    from classbanners.server import BannerServer, serve
+
+    try:
+        server = BannerServer(
+            BannerGenerator(config, icons=_icons_from_args(parsed)),
+            host=parsed.host,
+            port=parsed.port,
+            workers=parsed.workers,
+            max_in_flight=parsed.max_in_flight,
+            preset=parsed.preset,
+        )
+    except ValueError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+    print(f"Serving banners on http://{parsed.host}:{parsed.port}/banner")
+    serve(server)
+    return 0
+
+
+def parse_watch_args(args: list[str] | None = None) -> argparse.Namespace:
+    """Parse arguments of the ``watch`` subcommand."""
+    parser = argparse.ArgumentParser(
+        prog="classbanners watch",
+        description="Re-render the changed entries of a manifest whenever it is saved",
+    )
+    parser.add_argument("manifest", type=Path, help="Manifest file to watch")
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        default=Path("."),
+        help="Output directory (default: current directory)",
+    )
+    parser.add_argument(
+        "-t",
+        "--template",
+        default=DEFAULT_TEMPLATE,
+        help=f"Output filename template (default: {DEFAULT_TEMPLATE})",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=0.5,
+        help="Seconds between checks of the manifest (default: 0.5)",
+    )
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=0.25,
+        help="Seconds the manifest must be unchanged before rendering (default: 0.25)",
+    )
+    _add_config_arguments(parser)
+
+    return parser.parse_args(args)
+
+
+def _print_sync(report: SyncReport) -> None:
+    """Print the outcome of one watch pass."""
+    for message in report.errors:
+        print(f"error: {message}", file=sys.stderr)
+    print(
+        f"[{time.strftime('%H:%M:%S')}] {len(report.rendered)} rendered, "
+        f"{len(report.removed)} removed, {report.unchanged} unchanged "
+        f"in {report.duration:.2f}s",
+        flush=True,
+    )
+
+
+def watch_main(args: list[str] | None = None) -> int:
+    """Entry point for the ``watch`` subcommand."""
+    parsed = parse_watch_args(args)
+    try:
+        config = _config_from_args(parsed)
+    except ValueError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+    from classbanners.generator import BannerGenerator
+    from classbanners.watch import ManifestWatcher
+
+    try:
+        watcher = ManifestWatcher(
+            parsed.manifest,
+            parsed.output,
+            BannerGenerator(config, icons=_icons_from_args(parsed)),
+            template=parsed.template,
+            preset=parsed.preset,
+            interval=parsed.interval,
+            debounce=parsed.debounce,
+        )
+    except ValueError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+    print(f"Watching {parsed.manifest} (Ctrl+C to stop)", flush=True)
+    try:
+        watcher.run(_print_sync)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def parse_daemon_args(args: list[str] | None = None) -> argparse.Namespace:
+    """Parse arguments of the ``daemon`` subcommand."""
+    parser = argparse.ArgumentParser(
+        prog="classbanners daemon",
+        description=(
+            "Keep a warm renderer on a Unix socket; single-banner "
+            "'classbanners' calls use it when it is running"
+        ),
+    )
+    parser.add_argument(
+        "--socket",
+        type=Path,
+        help="Socket to listen on (default: $CLASSBANNERS_SOCKET or a per-user socket)",
+    )
+
+    return parser.parse_args(args)
+
+
+def daemon_main(args: list[str] | None = None) -> int:
+    """Entry point for the ``daemon`` subcommand."""
+    parsed = parse_daemon_args(args)
+
+    from classbanners.daemon import BannerDaemon
+    from classbanners.generator import BannerGenerator
+
+    daemon = BannerDaemon(BannerGenerator(), parsed.socket)
+    try:
+        daemon.start()
+    except (OSError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+    print(f"Rendering banners on {daemon.path} (Ctrl+C to stop)", flush=True)
+    # Remove the socket on `kill` too, not only on Ctrl+C.
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.close()
+    return 0
+
+
+_SUBCOMMANDS = {
+    "batch": batch_main,
+    "serve": serve_main,
+    "watch": watch_main,
+    "daemon": daemon_main,
+}
+
+
+def _render_via_daemon(parsed: argparse.Namespace, banner: Banner) -> bool:
+    """Render ``banner`` on a running daemon and write it to the output.
+
+    Returns:
+        False if no daemon is running; the banner must be rendered here.
+
+    Raises:
+        ValueError: If the daemon rejected the banner.
+        OSError: If the output cannot be written.
+    """
+    from classbanners.daemon import build_request, render_via_daemon
+
+    request = build_request(
+        banner, parsed.output.suffix, preset=parsed.preset, icons=parsed.icons
+    )
+    data = render_via_daemon(request)
+    if data is None:
+        return False
+    try:
+        parsed.output.write_bytes(data)
+    except FileNotFoundError:
+        parsed.output.parent.mkdir(parents=True, exist_ok=True)
+        parsed.output.write_bytes(data)
+    return True
+
+
+def _batch_atlas(
+    parsed: argparse.Namespace,
+    generator: BannerGenerator,
+    profiler: StageProfiler | None,
+) -> int:
+    """Render a manifest into sprite sheets."""
+    base_config = generator.default_config
+    start = time.perf_counter()
+    try:
+        items: list[tuple[str, BatchItem]] = [
+            (
+                str(entry.position),
+                Banner(
+                    entry.title,
+                    entry.subtitle,
+                    entry.config(base_config),
+                    icon=entry.icon,
+                ),
+            )
+            for entry in read_manifest(parsed.manifest)
+        ]
+        report = generator.generate_atlas(
+            items,
+            parsed.output,
+            name=parsed.atlas,
+            max_size=parsed.sheet_size,
+            preset=parsed.preset,
+            jobs=parsed.jobs,
+        )
+    except (OSError, RuntimeError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+    elapsed = time.perf_counter() - start
+    total_bytes = sum(path.stat().st_size for path in report.sheets_written)
+    print(
+        f"Atlas {report.index_path}: {report.rendered} rendered, "
+        f"{report.reused} reused, {len(report.sheets_written)} sheets written "
+        f"({_format_bytes(total_bytes)}) in {elapsed:.2f}s"
+    )
+    if profiler is not None:
+        print(profiler.report())
+    return 0
+
+
 def main(args: list[str] | None = None) -> int:
     """Main entry point for the CLI."""
-    parsed = parse_args(args)
+    argv = sys.argv[1:] if args is None else args
+    if argv and argv[0] in _SUBCOMMANDS:
+        return _SUBCOMMANDS[argv[0]](argv[1:])
+    if argv[:1] == ["--"] and argv[1:2] and argv[1] in _SUBCOMMANDS:
+        # "classbanners -- batch" renders a banner titled "batch".
+        argv = argv[1:]
 
-    config = BannerConfig(
-        width=parsed.width,
-        height=parsed.height,
-        background_color=parsed.background,
-        text_color=parsed.color,
-        font_size=parsed.font_size,
-        font_path=parsed.font,
+    parsed = parse_args(argv)
+
+    try:
+        config = _config_from_args(parsed)
+    except ValueError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    if parsed.strip_height is not None and parsed.show:
+        print("error: --show cannot be combined with --strip-height", file=sys.stderr)
+        return 1
+    if parsed.strip_height is not None and parsed.sizes:
+        print("error: --sizes cannot be combined with --strip-height", file=sys.stderr)
+        return 1
+    svg = parsed.output.suffix.lower() == ".svg"
+    if svg:
+        for option, used in (
+            ("--show", parsed.show),
+            ("--sizes", parsed.sizes),
+            ("--strip-height", parsed.strip_height is not None),
+        ):
+            if used:
+                print(f"error: {option} cannot be combined with SVG output", file=sys.stderr)
+                return 1
+    variants = None
+    if parsed.sizes:
+        try:
+            variants = parse_variants(parsed.sizes, config)
+        except ValueError as exc:
+            print(f"error: {exc}", file=sys.stderr)
+            return 1
+
+    banner = Banner(parsed.title, parsed.subtitle, config, icon=parsed.icon)
+    # A running daemon renders plain single banners with warm caches.
+    in_process = (
+        parsed.no_daemon
+        or svg
+        or parsed.show
+        or parsed.profile
+        or parsed.strip_height is not None
+        or variants is not None
     )
+    if not in_process:
+        try:
+            if _render_via_daemon(parsed, banner):
+                print(f"Banner saved to: {parsed.output}")
+                return 0
+        except (OSError, ValueError) as exc:
+            print(f"error: {exc}", file=sys.stderr)
+            return 1
 
-    generator = BannerGenerator(config)
-    banner = generator.create_banner(parsed.title, parsed.subtitle)
+    from classbanners.generator import BannerGenerator
 
-    banner.save(parsed.output)
-    print(f"Banner saved to: {parsed.output}")
+    profiler = StageProfiler() if parsed.profile else None
+    generator = BannerGenerator(
+        config, metrics=profiler, icons=_icons_from_args(parsed)
+    )
+    try:
+        if svg:
+            generator.save_svg(banner, parsed.output, embed_font=parsed.embed_font)
+        elif parsed.strip_height is not None:
+            generator.render_strips(
+                banner,
+                parsed.output,
+                strip_height=parsed.strip_height,
+                preset=parsed.preset,
+            )
+        elif variants is not None:
+            paths = generator.save_variants(
+                banner, variants, parsed.output, preset=parsed.preset
+            )
+        else:
+            generator.generate(banner)
+            banner.save(parsed.output, preset=parsed.preset)
+    except ValueError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    if variants is not None:
+        for path in paths.values():
+            print(f"Banner saved to: {path}")
+    else:
+        print(f"Banner saved to: {parsed.output}")
+    if profiler is not None:
+        print(profiler.report())
 
     if parsed.show:
+        if variants is not None:
+            generator.generate(banner)
         banner.show()
 
     return 0
@@ -0,0 +1,345 @@
+"""A warm render daemon for repeated single-banner CLI invocations.
+
+``classbanners daemon`` listens on a local Unix socket with a long-lived
+:class:`~classbanners.generator.BannerGenerator`, so its fonts, canvases
+and text runs stay cached. A CLI invocation that finds the daemon sends
+it the banner and writes the encoded bytes it gets back, skipping the
+Pillow import and font parsing; without a daemon it renders in-process.
+
+Messages are a 4-byte big-endian length followed by a JSON object. A
+successful response is followed by ``size`` bytes of encoded image.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import socketserver
+import stat
+import struct
+import threading
+from dataclasses import fields
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from classbanners import __version__
+from classbanners.banner import Banner, BannerConfig
+
+if TYPE_CHECKING:
+    from classbanners.generator import BannerGenerator
+
+#: Environment variable overriding the daemon socket path.
+SOCKET_ENV = "CLASSBANNERS_SOCKET"
+
+# Seconds a client waits to connect, and then for the rendered banner.
+_CONNECT_TIMEOUT = 1.0
+_RENDER_TIMEOUT = 60.0
+
+_MAX_MESSAGE_BYTES = 64 * 1024
+_LENGTH = struct.Struct(">I")
+_CONFIG_FIELDS = tuple(f.name for f in fields(BannerConfig))
+
+
+def default_socket_path() -> Path:
+    """Return the socket the daemon listens on by default.
+
+    ``$CLASSBANNERS_SOCKET`` if set, else ``daemon.sock`` in a private
+    ``classbanners-<uid>`` directory under ``$XDG_RUNTIME_DIR`` (or the
+    temporary directory).
+    """
+    path = os.environ.get(SOCKET_ENV)
+    if path:
+        return Path(path)
+    directory = (
+        os.environ.get("XDG_RUNTIME_DIR") or os.environ.get("TMPDIR") or "/tmp"
+    )
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    return Path(directory) / f"classbanners-{uid}" / "daemon.sock"
+
+
+def _is_private(st: os.stat_result) -> bool:
+    """Whether a file is owned by this user and not writable by others."""
+    if not hasattr(os, "getuid"):
+        return True
+    return st.st_uid == os.getuid() and not st.st_mode & 0o022
+
+
+def is_trusted_socket(path: Path | str) -> bool:
+    """Whether ``path`` is a socket only this user can have created.
+
+    Both the socket and its directory must belong to the user, and the
+    directory must not be writable by anyone else; otherwise another user
+    could plant a socket there and answer in place of the daemon.
+    """
+    path = Path(path)
+    try:
+        socket_stat = os.lstat(path)
+        directory_stat = os.stat(path.parent)
+    except OSError:
+        return False
+    return (
+        stat.S_ISSOCK(socket_stat.st_mode)
+        and _is_private(socket_stat)
+        and _is_private(directory_stat)
+    )
+
+
+def _send_message(sock: socket.socket, message: dict[str, Any]) -> None:
+    data = json.dumps(message).encode("utf-8")
+    sock.sendall(_LENGTH.pack(len(data)) + data)
+
+
+def _read_exactly(reader: Any, size: int) -> bytes:
+    data: bytes = reader.read(size)
+    if len(data) != size:
+        raise ConnectionError("Connection closed mid-message")
+    return data
+
+
+def _read_message(reader: Any) -> dict[str, Any] | None:
+    """Read one message; return None at a clean end of stream."""
+    head = reader.read(_LENGTH.size)
+    if not head:
+        return None
+    if len(head) != _LENGTH.size:
+        raise ConnectionError("Connection closed mid-message")
+    (size,) = _LENGTH.unpack(head)
+    if size > _MAX_MESSAGE_BYTES:
+        raise ValueError("Message too large")
+    message = json.loads(_read_exactly(reader, size))
+    if not isinstance(message, dict):
+        raise ValueError("Message must be a JSON object")
+    return message
+
+
+def build_request(
+    banner: Banner,
+    suffix: str,
+    preset: str | None = None,
+    icons: Path | str | None = None,
+) -> dict[str, Any]:
+    """Describe a render for the daemon.
+
+    Paths are made absolute, since the daemon runs in another directory.
+
+    Args:
+        banner: The banner to render.
+        suffix: Extension of the output file, which selects the format.
+        preset: Encoder preset.
+        icons: Icon directory, if not the bundled icons.
+    """
+    config = {name: getattr(banner.config, name) for name in _CONFIG_FIELDS}
+    if config["font_path"] is not None:
+        config["font_path"] = str(Path(config["font_path"]).resolve())
+    return {
+        "version": __version__,
+        "title": banner.title,
+        "subtitle": banner.subtitle,
+        "icon": banner.icon,
+        "icons": str(Path(icons).resolve()) if icons is not None else None,
+        "config": config,
+        "suffix": suffix,
+        "preset": preset,
+    }
+
+
+def render_via_daemon(
+    request: dict[str, Any], path: Path | str | None = None
+) -> bytes | None:
+    """Have a running daemon render ``request`` (see :func:`build_request`).
+
+    Args:
+        request: The render request.
+        path: Socket of the daemon (default: :func:`default_socket_path`).
+
+    Returns:
+        The encoded banner, or None if no (compatible) daemon answered or
+        the socket is not trusted (see :func:`is_trusted_socket`), in which
+        case the caller should render it itself.
+
+    Raises:
+        ValueError: If the daemon rejected the banner, e.g. an unknown icon.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    path = Path(path) if path is not None else default_socket_path()
+    if not is_trusted_socket(path):
+        return None
+    error = None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(_CONNECT_TIMEOUT)
+            sock.connect(str(path))
+            sock.settimeout(_RENDER_TIMEOUT)
+            _send_message(sock, request)
+            with sock.makefile("rb") as reader:
+                response = _read_message(reader)
+                if response is None or response.get("status") == "unsupported":
+                    return None
+                if response.get("status") == "ok":
+                    return _read_exactly(reader, int(response["size"]))
+                error = str(response.get("error") or "Render failed")
+    except (OSError, ValueError, KeyError, TypeError):
+        # No daemon, a stale socket or a broken connection.
+        return None
+    raise ValueError(error)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Serves the render requests of one connection."""
+
+    server: _UnixServer
+
+    def handle(self) -> None:
+        daemon = self.server.banner_daemon
+        while True:
+            try:
+                request = _read_message(self.rfile)
+            except (OSError, ValueError):
+                return
+            if request is None:
+                return
+            try:
+                if request.get("version") != __version__:
+                    _send_message(
+                        self.connection,
+                        {"status": "unsupported", "error": "Version mismatch"},
+                    )
+                    continue
+                try:
+                    data = daemon.render(request)
+                except (ValueError, TypeError, KeyError, OSError) as exc:
+                    _send_message(self.connection, {"status": "error", "error": str(exc)})
+                    continue
+                _send_message(self.connection, {"status": "ok", "size": len(data)})
+                self.connection.sendall(data)
+            except OSError:
+                return
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, daemon: BannerDaemon) -> None:
+        self.banner_daemon = daemon
+        super().__init__(path, _Handler)
+
+
+class BannerDaemon:
+    """Renders banners sent over a Unix socket with warm caches.
+
+    Each connection is served on its own thread; all of them share one
+    generator per icon directory.
+    """
+
+    def __init__(
+        self, generator: BannerGenerator, path: Path | str | None = None
+    ) -> None:
+        """Initialize the daemon.
+
+        Args:
+            generator: Generator rendering the banners.
+            path: Socket to listen on (default: :func:`default_socket_path`).
+        """
+        self.generator = generator
+        self.path = Path(path) if path is not None else default_socket_path()
+        self.served = 0
+        self._generators: dict[str, BannerGenerator] = {}
+        self._lock = threading.Lock()
+        self._server: _UnixServer | None = None
+
+    def start(self) -> None:
+        """Bind the socket, replacing a stale one left by a dead daemon.
+
+        The socket's directory is created private to the user if missing.
+
+        Raises:
+            ValueError: If another daemon is already listening on it, or
+                the directory is writable by other users.
+        """
+        self.path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if not _is_private(os.stat(self.path.parent)):
+            raise ValueError(
+                f"{self.path.parent} is writable by other users; "
+                "put the daemon socket in a private directory"
+            )
+        if self.path.exists() or self.path.is_symlink():
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                try:
+                    probe.connect(str(self.path))
+                except OSError:
+                    self.path.unlink()
+                else:
+                    raise ValueError(f"A daemon is already listening on {self.path}")
+        # Only the owner may connect.
+        umask = os.umask(0o177)
+        try:
+            self._server = _UnixServer(str(self.path), self)
+        finally:
+            os.umask(umask)
+
+    def serve_forever(self) -> None:
+        """Start (if needed) and serve until :meth:`shutdown` is called."""
+        if self._server is None:
+            self.start()
+        assert self._server is not None
+        self._server.serve_forever()
+
+    def shutdown(self) -> None:
+        """Stop serving (from another thread)."""
+        if self._server is not None:
+            self._server.shutdown()
+
+    def close(self) -> None:
+        """Close the socket and remove its file."""
+        if self._server is not None:
+            self._server.server_close()
+            self._server = None
+            self.path.unlink(missing_ok=True)
+
+    def render(self, request: dict[str, Any]) -> bytes:
+        """Render and encode the banner described by ``request``.
+
+        Raises:
+            ValueError: If the request or banner is invalid.
+        """
+        from classbanners.encoding import resolve_encoding
+
+        config = dict(request["config"])
+        if config.get("font_path") is not None:
+            config["font_path"] = Path(config["font_path"])
+        banner = Banner(
+            str(request["title"]),
+            str(request.get("subtitle") or ""),
+            BannerConfig(**config),
+            icon=request.get("icon") or None,
+        )
+        generator = self._generator(request.get("icons"))
+        if banner.icon is not None and banner.icon not in generator.icons:
+            # Pick up icons added since the daemon started.
+            generator.icons.refresh()
+        image_format, settings = resolve_encoding(
+            Path("banner" + str(request["suffix"])), None, request.get("preset")
+        )
+        generator.generate(banner)
+        data = banner.to_bytes(image_format, **settings)
+        with self._lock:
+            self.served += 1
+        return data
+
+    def _generator(self, icons: str | None) -> BannerGenerator:
+        """Return the generator using the icon directory ``icons``."""
+        if icons is None:
+            return self.generator
+        with self._lock:
+            generator = self._generators.get(icons)
+            if generator is None:
+                from classbanners.generator import BannerGenerator
+                from classbanners.icons import IconRegistry
+
+                generator = BannerGenerator(
+                    self.generator.default_config, icons=IconRegistry(icons)
+                )
+                self._generators[icons] = generator
+            return generator
@@ -0,0 +1,135 @@
+"""Image encoding with tunable encoder presets."""
+
+from __future__ import annotations
+
+import io
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+#: Encoder settings for each format, from fastest to smallest output.
+PRESETS: dict[str, dict[str, dict[str, Any]]] = {
+    "PNG": {
+        "fast": {"compress_level": 1},
+        "balanced": {"compress_level": 6},
+        "smallest": {"compress_level": 9, "optimize": True},
+    },
+    "WEBP": {
+        "fast": {"quality": 80, "method": 0},
+        "balanced": {"quality": 80, "method": 4},
+        "smallest": {"quality": 75, "method": 6},
+    },
+    "JPEG": {
+        "fast": {"quality": 85},
+        "balanced": {"quality": 85, "optimize": True},
+        "smallest": {"quality": 75, "optimize": True, "progressive": True},
+    },
+}
+
+PRESET_NAMES = ("fast", "balanced", "smallest")
+
+# Modes each format can store directly; others are converted to RGB.
+_SUPPORTED_MODES = {
+    "JPEG": {"RGB", "L", "CMYK"},
+    "WEBP": {"RGB", "RGBA"},
+}
+
+
+def normalize_format(image_format: str) -> str:
+    """Return the canonical Pillow name of an image format."""
+    name = image_format.upper().lstrip(".")
+    return "JPEG" if name == "JPG" else name
+
+
+def format_for_path(path: Path | str) -> str:
+    """Determine the image format from a file extension.
+
+    Raises:
+        ValueError: If the extension is not a known image format.
+    """
+    from PIL import Image
+
+    suffix = Path(path).suffix.lower()
+    extensions = Image.registered_extensions()
+    if suffix not in extensions:
+        Image.init()
+        extensions = Image.registered_extensions()
+    try:
+        return extensions[suffix]
+    except KeyError:
+        raise ValueError(f"Unknown image format for '{path}'") from None
+
+
+def encoder_options(
+    image_format: str, preset: str | None = None, **options: Any
+) -> dict[str, Any]:
+    """Return encoder settings for a format, preset and explicit overrides.
+
+    Raises:
+        ValueError: If the preset is unknown.
+    """
+    image_format = normalize_format(image_format)
+    settings: dict[str, Any] = {}
+    if preset is not None:
+        if preset not in PRESET_NAMES:
+            raise ValueError(
+                f"preset must be one of {', '.join(PRESET_NAMES)}, got '{preset}'"
+            )
+        settings.update(PRESETS.get(image_format, {}).get(preset, {}))
+    settings.update(options)
+    return settings
+
+
+def resolve_encoding(
+    path: Path | str,
+    image_format: str | None = None,
+    preset: str | None = None,
+    **options: Any,
+) -> tuple[str, dict[str, Any]]:
+    """Return the format and encoder settings for saving to ``path``."""
+    image_format = (
+        normalize_format(image_format) if image_format else format_for_path(path)
+    )
+    return image_format, encoder_options(image_format, preset, **options)
+
+
+def prepare_image(image: Image.Image, image_format: str) -> Image.Image:
+    """Convert an image to a mode the format can store."""
+    supported = _SUPPORTED_MODES.get(normalize_format(image_format))
+    if supported is not None and image.mode not in supported:
+        return image.convert("RGB")
+    return image
+
+
+def encode_image(
+    image: Image.Image,
+    image_format: str = "PNG",
+    preset: str | None = None,
+    buffer: io.BytesIO | None = None,
+    **options: Any,
+) -> memoryview:
+    """Encode an image into an in-memory buffer.
+
+    Args:
+        image: The image to encode.
+        image_format: Output format (e.g., 'PNG', 'WEBP', 'JPEG').
+        preset: Encoder preset ('fast', 'balanced' or 'smallest').
+        buffer: Buffer to reuse; it is truncated before encoding. Any view
+            previously returned for it must have been released.
+        **options: Explicit encoder settings overriding the preset.
+
+    Returns:
+        A view of the encoded bytes inside the buffer.
+    """
+    image_format = normalize_format(image_format)
+    if buffer is None:
+        buffer = io.BytesIO()
+    else:
+        buffer.seek(0)
+        buffer.truncate()
+    prepare_image(image, image_format).save(
+        buffer, format=image_format, **encoder_options(image_format, preset, **options)
+    )
+    return buffer.getbuffer()
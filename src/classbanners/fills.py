@@ -0,0 +1,194 @@
+"""Gradient and pattern backgrounds computed with NumPy.
+
+A fill blends from the banner's background color towards its
+``fill_color``. Each fill is computed as whole-array operations over the
+pixel grid and handed to Pillow in one ``Image.fromarray`` call; the
+finished canvas is cached like any other, so a batch sharing one gradient
+computes it once.
+
+NumPy is optional. Without it, banners with a fill are drawn on their
+plain background color and a warning is logged once.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+#: Kinds of ``BannerConfig.background_fill``.
+FILL_KINDS = ("solid", "linear", "radial", "stripes", "noise")
+
+_DEFAULT_STRIPE_PERIOD = 24.0
+_DEFAULT_STRIPE_ANGLE = 45.0
+_DEFAULT_NOISE_AMOUNT = 8.0
+
+_warned_missing_numpy = False
+
+
+@dataclass(frozen=True)
+class Fill:
+    """A parsed background fill spec.
+
+    Attributes:
+        kind: One of :data:`FILL_KINDS`.
+        angle: Direction of a linear gradient or of the stripes, in degrees
+            clockwise from left-to-right.
+        period: Width of one stripe pair in pixels.
+        amount: Strength of the noise in percent of the way to
+            ``fill_color``.
+    """
+
+    kind: str = "solid"
+    angle: float = 0.0
+    period: int = 24
+    amount: int = 8
+
+
+@lru_cache(maxsize=256)
+def parse_fill(spec: str) -> Fill:
+    """Parse a fill spec.
+
+    Specs are ``solid``, ``linear`` or ``linear:ANGLE``, ``radial``,
+    ``stripes``, ``stripes:PERIOD`` or ``stripes:PERIOD:ANGLE``, and
+    ``noise`` or ``noise:PERCENT``.
+
+    Raises:
+        ValueError: If the spec is malformed.
+    """
+    kind, *args = spec.strip().lower().split(":")
+    limits = {"solid": 0, "linear": 1, "radial": 0, "stripes": 2, "noise": 1}
+    if kind not in limits:
+        raise ValueError(
+            f"background_fill must be one of {', '.join(FILL_KINDS)}, got '{spec}'"
+        )
+    if len(args) > limits[kind]:
+        raise ValueError(f"Too many arguments in fill '{spec}'")
+    try:
+        numbers = [float(arg) for arg in args]
+    except ValueError:
+        raise ValueError(f"Invalid number in fill '{spec}'") from None
+
+    if kind == "linear":
+        return Fill(kind, angle=numbers[0] if numbers else 0.0)
+    if kind == "stripes":
+        period = numbers[0] if numbers else _DEFAULT_STRIPE_PERIOD
+        if period < 2 or not period.is_integer():
+            raise ValueError(f"Stripe period must be a whole number >= 2 in '{spec}'")
+        angle = numbers[1] if len(numbers) > 1 else _DEFAULT_STRIPE_ANGLE
+        return Fill(kind, angle=angle, period=int(period))
+    if kind == "noise":
+        amount = numbers[0] if numbers else _DEFAULT_NOISE_AMOUNT
+        if not 0 < amount <= 100 or not amount.is_integer():
+            raise ValueError(f"Noise amount must be a whole percent 1-100 in '{spec}'")
+        return Fill(kind, amount=int(amount))
+    return Fill(kind)
+
+
+def _import_numpy() -> Any:
+    """Return the numpy module, or None (warning once) if it is missing."""
+    global _warned_missing_numpy
+    try:
+        import numpy
+    except ImportError:
+        if not _warned_missing_numpy:
+            _warned_missing_numpy = True
+            logger.warning(
+                "NumPy is not installed; gradient and pattern backgrounds "
+                "are drawn as solid colors (pip install numpy)"
+            )
+        return None
+    return numpy
+
+
+def render_fill(
+    fill: Fill,
+    background: tuple[int, int, int],
+    color: tuple[int, int, int],
+    width: int,
+    height: int,
+    top: int = 0,
+    rows: int | None = None,
+) -> Image.Image | None:
+    """Render rows of a fill as an RGB image.
+
+    Rows are addressed in banner coordinates, so rendering a banner strip by
+    strip gives the same pixels as rendering it whole.
+
+    Args:
+        fill: The fill to render.
+        background: Color where the fill is 0 (the gradient start).
+        color: Color where the fill is 1 (the gradient end).
+        width: Banner width.
+        height: Banner height.
+        top: First banner row to render.
+        rows: Rows to render (default: down to the bottom of the banner).
+
+    Returns:
+        The rendered rows, or None for solid fills and when NumPy is not
+        installed.
+    """
+    if fill.kind == "solid":
+        return None
+    np = _import_numpy()
+    if np is None:
+        return None
+    from PIL import Image
+
+    if rows is None:
+        rows = height - top
+    # Pixel centers, as a row vector and a column vector that broadcast
+    # to the full (rows, width) grid.
+    x = np.arange(width, dtype=np.float32)[None, :] + 0.5
+    y = np.arange(top, top + rows, dtype=np.float32)[:, None] + 0.5
+
+    if fill.kind == "linear":
+        dx, dy = math.cos(math.radians(fill.angle)), math.sin(math.radians(fill.angle))
+        corners = [cx * dx + cy * dy for cx in (0, width) for cy in (0, height)]
+        low, high = min(corners), max(corners)
+        amount = (x * dx + y * dy - low) / (high - low)
+    elif fill.kind == "radial":
+        cx, cy = width / 2, height / 2
+        amount = np.hypot(x - cx, y - cy) / math.hypot(cx, cy)
+    elif fill.kind == "stripes":
+        dx, dy = math.cos(math.radians(fill.angle)), math.sin(math.radians(fill.angle))
+        # Position across the stripes, and the signed distance to the
+        # nearest stripe edge for one pixel of antialiasing.
+        phase = np.mod(x * dy - y * dx, fill.period)
+        band = fill.period / 2
+        inside = phase < band
+        distance = np.where(
+            inside,
+            np.minimum(phase, band - phase),
+            -np.minimum(phase - band, fill.period - phase),
+        )
+        amount = distance + 0.5
+    else:
+        amount = _hash_noise(np, width, top, rows) * (fill.amount / 100)
+
+    amount = np.clip(amount, 0.0, 1.0)
+    pixels = np.empty((rows, width, 3), dtype=np.uint8)
+    for channel, (start, end) in enumerate(zip(background, color)):
+        pixels[:, :, channel] = np.rint(start + amount * (end - start))
+    return Image.fromarray(pixels)
+
+
+def _hash_noise(np: Any, width: int, top: int, rows: int) -> Any:
+    """Return uniform noise in [0, 1) that depends only on pixel position."""
+    x = np.arange(width, dtype=np.uint32)[None, :]
+    y = np.arange(top, top + rows, dtype=np.uint32)[:, None]
+    h = x * np.uint32(0x9E3779B1) + y * np.uint32(0x85EBCA77)
+    # A 32-bit integer finalizer: every output bit depends on every input bit.
+    h ^= h >> np.uint32(16)
+    h *= np.uint32(0x7FEB352D)
+    h ^= h >> np.uint32(15)
+    h *= np.uint32(0x846CA68B)
+    h ^= h >> np.uint32(16)
+    return h.astype(np.float32) / np.float32(2**32)
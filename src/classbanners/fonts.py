@@ -0,0 +1,99 @@
+"""Font loading with a process-wide cache."""
+
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import Union
+
+from PIL import ImageFont
+
+from classbanners.cache import CacheStats, LRUCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FONT = "DejaVuSans.ttf"
+
+Font = Union[ImageFont.FreeTypeFont, ImageFont.ImageFont]
+FontKey = tuple[str, int, Union[float, None]]
+
+
+def _font_key(size: int, font_path: Path | None) -> FontKey:
+    """Build a cache key of (resolved path, size, mtime) for a font."""
+    if font_path is None:
+        return (DEFAULT_FONT, size, None)
+    path = Path(font_path)
+    try:
+        resolved = path.resolve()
+        mtime: float | None = resolved.stat().st_mtime
+    except OSError:
+        resolved = path.absolute()
+        mtime = None
+    return (str(resolved), size, mtime)
+
+
+def _load_font(size: int, font_path: Path | None = None) -> Font:
+    """Load a font at the specified size, falling back to the default font."""
+    if font_path:
+        try:
+            return ImageFont.truetype(str(font_path), size)
+        except OSError:
+            logger.warning(
+                "Failed to load font '%s', falling back to default", font_path
+            )
+    # Fall back to default font
+    try:
+        return ImageFont.truetype(DEFAULT_FONT, size)
+    except OSError:
+        logger.debug("%s not found, using PIL default font", DEFAULT_FONT)
+        return ImageFont.load_default()
+
+
+class FontCache:
+    """LRU cache of loaded fonts keyed by (resolved path, size, mtime).
+
+    Fallback fonts are cached under the key of the font that failed to load,
+    so a missing custom font only logs its warning once.
+    """
+
+    def __init__(self, max_entries: int = 64) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of fonts kept loaded.
+        """
+        self._cache: LRUCache[FontKey, Font] = LRUCache(max_entries=max_entries)
+
+    @property
+    def max_entries(self) -> int | None:
+        """Maximum number of fonts kept loaded."""
+        return self._cache.max_entries
+
+    @max_entries.setter
+    def max_entries(self, value: int) -> None:
+        self._cache.max_entries = value
+
+    @property
+    def stats(self) -> CacheStats:
+        """Hit, miss and eviction counters."""
+        return self._cache.stats
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def get(self, size: int, font_path: Path | None = None) -> Font:
+        """Return the font at ``size``, loading it on a cache miss."""
+        key = _font_key(size, font_path)
+        return self._cache.get_or_create(key, lambda: _load_font(size, font_path))
+
+    def clear(self) -> None:
+        """Drop all cached fonts and reset the statistics."""
+        self._cache.clear()
+
+
+_font_cache = FontCache()
+
+
+def get_font_cache() -> FontCache:
+    """Return the process-wide font cache."""
+    return _font_cache
@@ -2,26 +2,178 @@
 
 from __future__ import annotations
 
+import io
 import logging
+import os
+import queue
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Generator, Iterable, Iterator, Sequence
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from itertools import islice
 from pathlib import Path
+from typing import Any, Union
 
 from PIL import Image, ImageDraw, ImageFont
 
-from classbanners.banner import Banner, BannerConfig
+from classbanners.atlas import Atlas, AtlasReport
+from classbanners.banner import Banner, BannerConfig, BatchResult
+from classbanners.buildcache import BuildCache, output_key
+from classbanners.canvas import CanvasCache, get_canvas_cache
+from classbanners.encoding import encoder_options, format_for_path, normalize_format
+from classbanners.fills import parse_fill, render_fill
+from classbanners.fonts import Font, FontCache, get_font_cache
+from classbanners.icons import (
+    IconCache,
+    IconRegistry,
+    get_icon_cache,
+    get_icon_registry,
+)
+from classbanners.instrument import MetricsSink, RecordingSink, replay, span
+from classbanners.manifest import ManifestEntry, read_manifest
+from classbanners.palette import ColorPlan, Ink, plan_colors
+from classbanners.strips import DEFAULT_STRIP_HEIGHT, STRIP_FORMATS, open_strip_writer
+from classbanners.svg import (
+    EMBEDDED_FAMILY,
+    background_elements,
+    border_element,
+    font_face,
+    icon_elements,
+    svg_color,
+    svg_document,
+    text_element,
+)
+from classbanners.text import TextRun, TextRunCache, get_text_cache
+from classbanners.variants import (
+    Variant,
+    derive_variant,
+    master_scale,
+    scale_config,
+    variant_path,
+)
 
 logger = logging.getLogger(__name__)
 
+#: An item accepted by :meth:`BannerGenerator.generate_many`: a Banner, a
+#: manifest entry or a ``(title, subtitle, config)`` tuple (subtitle and
+#: config may be omitted, and config may be None to use the generator
+#: default).
+BatchItem = Union[Banner, ManifestEntry, tuple[Any, ...]]
+
+# Marks the end of the banners of iter_banners' prefetch queue.
+_END = object()
+
+# Generator owned by each worker process of a generate_many pool.
+_worker_generator: BannerGenerator | None = None
+
+
+def _init_worker(
+    config: BannerConfig, record_metrics: bool, icon_dir: Path | None = None
+) -> None:
+    """Create the worker's generator and warm its font cache."""
+    global _worker_generator
+    _worker_generator = BannerGenerator(
+        config,
+        metrics=RecordingSink() if record_metrics else None,
+        icons=IconRegistry(icon_dir) if icon_dir is not None else None,
+    )
+    _worker_generator._get_font(config.font_size, config.font_path)
+    _worker_generator._get_font(config.font_size // 2, config.font_path)
+
+
+_ChunkResult = tuple[list[BatchResult], list[tuple[str, Union[float, None]]]]
+
+# Color plan, placed icon and placed text runs of a banner (see _layout).
+_Layout = tuple[
+    ColorPlan,
+    Union[tuple[Image.Image, int, int], None],
+    list[tuple[TextRun, int, int]],
+]
+
+
+def _render_chunk(chunk: list[tuple[int, Banner | Exception]]) -> _ChunkResult:
+    """Render a chunk of banners inside a worker process.
+
+    Returns the results together with any measurements recorded while
+    rendering them.
+    """
+    assert _worker_generator is not None
+    results = [_worker_generator._render_one(index, banner) for index, banner in chunk]
+    sink = _worker_generator.metrics
+    records = sink.drain() if isinstance(sink, RecordingSink) else []
+    return results, records
+
+
+def _bisect_size(
+    fits: Callable[[int], bool], low: int, high: int, guess: int
+) -> int:
+    """Return the largest size in ``[low, high]`` that fits, or ``low``.
+
+    ``fits`` must be monotonic: true up to some size and false above it.
+    ``guess`` is probed first, then its neighbor, so a close guess settles
+    the search in two probes.
+    """
+    if low >= high:
+        return low
+    if fits(guess):
+        low, probe = guess, guess + 1
+    else:
+        high = probe = guess - 1
+    while low < high:
+        if fits(probe):
+            low = probe
+        else:
+            high = probe - 1
+        probe = (low + high + 1) // 2
+    return low
+
 
 class BannerGenerator:
     """Generates banner images from Banner objects."""
 
-    def __init__(self, config: BannerConfig | None = None) -> None:
+    def __init__(
+        self,
+        config: BannerConfig | None = None,
+        font_cache: FontCache | None = None,
+        canvas_cache: CanvasCache | None = None,
+        text_cache: TextRunCache | None = None,
+        metrics: MetricsSink | None = None,
+        icons: IconRegistry | None = None,
+        icon_cache: IconCache | None = None,
+    ) -> None:
         """Initialize the generator with optional default configuration.
 
         Args:
             config: Default configuration for generated banners.
+            font_cache: Font cache to use (defaults to the process-wide cache).
+            canvas_cache: Base canvas cache to use (defaults to the
+                process-wide cache).
+            text_cache: Text run cache to use (defaults to the process-wide
+                cache).
+            metrics: Optional sink receiving timed spans for each rendering
+                stage and cache hit/miss events. Banners generated here
+                also report their encode and write stages to it.
+            icons: Registry resolving ``Banner.icon`` names (defaults to the
+                bundled icons).
+            icon_cache: Scaled icon cache to use (defaults to the
+                process-wide cache).
         """
         self.default_config = config or BannerConfig()
+        self.font_cache = font_cache if font_cache is not None else get_font_cache()
+        self.canvas_cache = (
+            canvas_cache if canvas_cache is not None else get_canvas_cache()
+        )
+        self.text_cache = text_cache if text_cache is not None else get_text_cache()
+        self.metrics = metrics
+        self.icons = icons if icons is not None else get_icon_registry()
+        self.icon_cache = icon_cache if icon_cache is not None else get_icon_cache()
 
     def generate(self, banner: Banner) -> Banner:
         """Generate the banner image.
@@ -33,48 +185,300 @@ class BannerGenerator:
             The same Banner object with the image property set.
         """
         config = banner.config
+        colors, icon, placed = self._layout(banner)
 
-        # Create the base image
-        image = Image.new("RGB", (config.width, config.height), config.background_color)
-        draw = ImageDraw.Draw(image)
+        # Start from a copy of the cached background and border
+        image = self._get_canvas(config, colors)
+        with span(self.metrics, "draw"):
+            if icon is not None:
+                self._paste_icon(image, icon, colors.text)
+            for run, x, y in placed:
+                run.paste(image, (x, y), colors.text)
 
-        # Add border if specified
-        if config.border_width > 0:
-            self._draw_border(draw, config)
-
-        # Load font
-        font = self._get_font(config.font_size, config.font_path)
-        subtitle_font = self._get_font(config.font_size // 2, config.font_path)
-
-        # Calculate text positions
-        title_y = self._calculate_text_y(config, bool(banner.subtitle))
-        self._draw_text(
-            draw,
-            banner.title,
-            font,
-            config.text_color,
-            config.width,
-            title_y,
-            config.text_align,
-            config.padding,
+        banner.image = image
+        banner._metrics = self.metrics
+        return banner
+
+    def generate_svg(self, banner: Banner, embed_font: bool = False) -> str:
+        """Render the banner as an SVG document.
+
+        Background, border and text are vector elements laid out exactly as
+        by :meth:`generate` (icons are embedded as small PNG masks). Only
+        text is measured; nothing is rasterized. ``banner.image`` is not
+        set.
+
+        Args:
+            banner: The Banner object to render.
+            embed_font: Embed the font (subset to the banner's characters
+                if fontTools is installed) so browsers draw the same glyphs.
+                Otherwise the text names the font's family.
+
+        Returns:
+            The SVG document.
+
+        Raises:
+            ValueError: If the banner's icon is not in the registry.
+        """
+        config = banner.config
+        color = svg_color(config.text_rgba)
+        elements = background_elements(config)
+        border = border_element(config)
+        if border is not None:
+            elements.append(border)
+
+        icon = self._place_icon(banner)
+        if icon is not None:
+            mask, x, y = icon
+            png = io.BytesIO()
+            mask.save(png, format="PNG")
+            elements += icon_elements(png.getvalue(), x, y, mask.width, mask.height, color)
+        left, right = self._text_bounds(config, icon)
+
+        lines = self._text_lines(banner, left, right)
+        title_font = lines[0][1]
+        family = "sans-serif"
+        if isinstance(title_font, ImageFont.FreeTypeFont):
+            family = f"{title_font.getname()[0]}, {family}"
+            if embed_font and isinstance(title_font.path, str):
+                characters = banner.title + banner.subtitle
+                elements.insert(0, font_face(title_font.path, characters))
+                family = f"{EMBEDDED_FAMILY}, {family}"
+        for text, font, y in lines:
+            with span(self.metrics, "text", self.text_cache.stats):
+                bbox = self.text_cache.measure(text, font)
+            x = self._align_text(
+                bbox[2] - bbox[0], right, config.text_align, config.padding, left
+            )
+            if isinstance(font, ImageFont.FreeTypeFont):
+                # Raster text is drawn from the top of the ascender.
+                baseline, size = y + font.getmetrics()[0], font.size
+            else:
+                baseline, size = y + bbox[3], bbox[3] - bbox[1]
+            elements.append(
+                text_element(text, x, baseline, size, family, color, font.getlength(text))
+            )
+        return svg_document(config.width, config.height, elements)
+
+    def save_svg(
+        self, banner: Banner, path: Path | str, embed_font: bool = False
+    ) -> None:
+        """Render the banner as SVG (see :meth:`generate_svg`) and write it."""
+        path = Path(path)
+        document = self.generate_svg(banner, embed_font)
+        with span(self.metrics, "write"):
+            try:
+                path.write_text(document, encoding="utf-8")
+            except FileNotFoundError:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(document, encoding="utf-8")
+
+    def iter_strips(
+        self, banner: Banner, strip_height: int = DEFAULT_STRIP_HEIGHT
+    ) -> Iterator[Image.Image]:
+        """Render a banner as horizontal strips, top to bottom.
+
+        Each strip is painted from scratch (background, border and the
+        parts of the icon and text runs that overlap it), so only one strip
+        is held in memory at a time. Stacked, the strips are pixel-identical
+        to the image produced by :meth:`generate`. ``banner.image`` is not
+        set.
+
+        Args:
+            banner: The Banner object to render.
+            strip_height: Rows per strip; the last strip may be shorter.
+
+        Yields:
+            One image per strip, in the banner's color mode.
+        """
+        if strip_height <= 0:
+            raise ValueError("strip_height must be positive")
+        return self._iter_strips(banner.config, self._layout(banner), strip_height)
+
+    def _iter_strips(
+        self, config: BannerConfig, layout: _Layout, strip_height: int
+    ) -> Iterator[Image.Image]:
+        """Yield the strips of a banner laid out by :meth:`_layout`."""
+        colors, icon, placed = layout
+        for top in range(0, config.height, strip_height):
+            bottom = min(top + strip_height, config.height)
+            with span(self.metrics, "canvas"):
+                strip = self._new_canvas(colors, config.width, bottom - top)
+                self._paint_fill(strip, config, top)
+                if config.border_width > 0:
+                    self._draw_border(ImageDraw.Draw(strip), config, colors, top)
+            with span(self.metrics, "draw"):
+                if icon is not None:
+                    self._paste_icon(strip, icon, colors.text, top)
+                for run, x, y in placed:
+                    if y + run.bbox[3] > top and y + run.bbox[1] < bottom:
+                        run.paste(strip, (x, y - top), colors.text)
+            yield strip
+
+    def render_strips(
+        self,
+        banner: Banner,
+        path: Path | str,
+        image_format: str | None = None,
+        strip_height: int = DEFAULT_STRIP_HEIGHT,
+        preset: str | None = None,
+        compress_level: int | None = None,
+    ) -> None:
+        """Render a banner strip by strip straight into a PNG or TIFF file.
+
+        Peak memory is bounded by ``strip_height`` instead of the banner
+        size, which keeps very large print banners affordable. The file is
+        written under a temporary name and moved into place when complete.
+
+        Args:
+            banner: The Banner object to render.
+            path: Output file path.
+            image_format: 'PNG' or 'TIFF'. Auto-detected if None.
+            strip_height: Rows rendered and encoded at a time.
+            preset: Encoder preset selecting the deflate level.
+            compress_level: Explicit deflate level (0-9), overriding preset.
+
+        Raises:
+            ValueError: If the format cannot be written in strips.
+        """
+        path = Path(path)
+        image_format = (
+            normalize_format(image_format) if image_format else format_for_path(path)
         )
+        if image_format not in STRIP_FORMATS:
+            raise ValueError(
+                f"Strip rendering supports {', '.join(STRIP_FORMATS)} output, "
+                f"not '{image_format}'"
+            )
+        if compress_level is None:
+            compress_level = encoder_options("PNG", preset).get("compress_level", 6)
+        config = banner.config
+        layout = self._layout(banner)
+        colors = layout[0]
 
-        # Draw subtitle if present
-        if banner.subtitle:
-            subtitle_y = title_y + config.font_size + 10
-            self._draw_text(
-                draw,
+        tmp_path = path.with_name(path.name + ".tmp")
+        try:
+            fp = tmp_path.open("wb")
+        except FileNotFoundError:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fp = tmp_path.open("wb")
+        try:
+            with fp:
+                writer = open_strip_writer(
+                    fp,
+                    image_format,
+                    config.width,
+                    config.height,
+                    colors.mode,
+                    colors.palette,
+                    compress_level,
+                )
+                for strip in self._iter_strips(config, layout, strip_height):
+                    with span(self.metrics, "encode"):
+                        writer.write(strip)
+                writer.close()
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    def generate_variants(
+        self, banner: Banner, variants: Sequence[Variant]
+    ) -> dict[str, Banner]:
+        """Render a banner once and derive every variant from that render.
+
+        The banner is drawn at the largest scale any variant needs; smaller
+        variants are downsampled from it (with ``reduce()`` for integer
+        factors), so text is laid out and rasterized only once.
+        ``banner.image`` is not set.
+
+        Args:
+            banner: The banner at its 1x configuration.
+            variants: The sizes to produce; names must be unique.
+
+        Returns:
+            A generated Banner per variant name, in the order given.
+
+        Raises:
+            ValueError: If no variants are given or names repeat.
+        """
+        if not variants:
+            raise ValueError("At least one variant is required")
+        if len({variant.name for variant in variants}) != len(variants):
+            raise ValueError("Variant names must be unique")
+        config = banner.config
+        scale = master_scale(config, list(variants))
+        master = self.generate(
+            Banner(
+                banner.title, banner.subtitle, scale_config(config, scale), banner.icon
+            )
+        )
+        assert master.image is not None
+        colors = self._color_plan(master.config)
+        if master.image.mode != colors.mode:
+            # The master fell back to RGB (see _layout).
+            colors = self._color_plan(master.config, "rgb")
+
+        results: dict[str, Banner] = {}
+        for variant in variants:
+            with span(self.metrics, "resize"):
+                image = derive_variant(master.image, config, variant, colors)
+            variant_config = scale_config(config, variant.banner_scale(config))
+            if variant.size is not None:
+                variant_config = variant_config.replace(
+                    width=variant.size[0], height=variant.size[1]
+                )
+            results[variant.name] = Banner(
+                banner.title,
                 banner.subtitle,
-                subtitle_font,
-                config.text_color,
-                config.width,
-                subtitle_y,
-                config.text_align,
-                config.padding,
+                variant_config,
+                banner.icon,
+                _image=image,
+                _metrics=self.metrics,
             )
+        return results
 
-        banner.image = image
-        return banner
+    def save_variants(
+        self,
+        banner: Banner,
+        variants: Sequence[Variant],
+        path: Path | str,
+        image_format: str | None = None,
+        preset: str | None = None,
+        jobs: int | None = None,
+    ) -> dict[str, Path]:
+        """Render the variants of a banner and encode them in parallel.
+
+        Variants are written next to ``path`` as ``name@2x.png`` and so on
+        (see :func:`~classbanners.variants.variant_path`). Pillow releases
+        the GIL while encoding, so the encoders run on a thread pool.
+
+        Args:
+            banner: The banner at its 1x configuration.
+            variants: The sizes to produce.
+            path: Output path of the 1x variant.
+            image_format: Image format. Auto-detected from ``path`` if None.
+            preset: Encoder preset.
+            jobs: Encoder threads (default: one per variant, up to the CPU
+                count).
+
+        Returns:
+            The path written for each variant name.
+        """
+        if jobs is not None and jobs < 1:
+            raise ValueError("jobs must be positive")
+        rendered = self.generate_variants(banner, variants)
+        paths = {variant.name: variant_path(path, variant) for variant in variants}
+        workers = jobs or min(len(rendered), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    rendered[name].save, paths[name], image_format, preset=preset
+                )
+                for name in rendered
+            ]
+            for future in futures:
+                future.result()
+        return paths
 
     def create_banner(
         self,
@@ -99,61 +503,591 @@ class BannerGenerator:
         )
         return self.generate(banner)
 
+    def render_file(
+        self,
+        banner: Banner,
+        path: Path | str,
+        build_cache: BuildCache | None = None,
+        image_format: str | None = None,
+        preset: str | None = None,
+        **options: Any,
+    ) -> bool:
+        """Generate a banner and save it, skipping unchanged outputs.
+
+        Args:
+            banner: The Banner object to generate.
+            path: Output file path.
+            build_cache: Optional build cache used to skip rendering and
+                encoding when ``path`` is already up to date.
+            image_format: Image format (e.g., 'PNG'). Auto-detected if None.
+            preset: Encoder preset ('fast', 'balanced' or 'smallest').
+            **options: Explicit encoder settings.
+
+        Returns:
+            True if the banner was rendered and written, False if skipped.
+        """
+        key = None
+        if build_cache is not None:
+            key = output_key(
+                banner, path, image_format, preset, icons=self.icons, **options
+            )
+            if build_cache.is_current(path, key):
+                return False
+        self.generate(banner)
+        banner.save(path, image_format, preset=preset, **options)
+        if build_cache is not None and key is not None:
+            build_cache.record(path, key)
+        return True
+
+    def generate_atlas(
+        self,
+        items: Iterable[tuple[str, BatchItem]],
+        directory: Path | str,
+        name: str = "atlas",
+        max_size: tuple[int, int] = (4096, 4096),
+        image_format: str = "PNG",
+        preset: str | None = None,
+        jobs: int | None = 1,
+    ) -> AtlasReport:
+        """Pack a batch of banners into sprite sheets with a JSON index.
+
+        Each sheet is encoded once, and the index maps every banner id to
+        its sheet and rectangle. When the layout is unchanged, only banners
+        whose content changed are rendered and only their sheets rewritten.
+
+        Args:
+            items: ``(banner id, item)`` pairs, where item is a Banner or a
+                ``(title, subtitle, config)`` tuple.
+            directory: Directory for the sheets and the index.
+            name: Base name of the sheet and index files.
+            max_size: Maximum ``(width, height)`` of a sheet.
+            image_format: Sheet image format.
+            preset: Encoder preset for the sheets.
+            jobs: Worker processes used for rendering.
+
+        Returns:
+            A report of rendered and reused banners and written sheets.
+        """
+        atlas = Atlas(directory, name, max_size[0], max_size[1], image_format, preset)
+        banners = [(banner_id, self._to_banner(item)) for banner_id, item in items]
+        return atlas.build(banners, self, jobs=jobs)
+
+    def generate_many(
+        self,
+        items: Iterable[BatchItem],
+        jobs: int | None = None,
+        chunksize: int = 1,
+        ordered: bool = True,
+        max_in_flight: int | None = None,
+    ) -> Iterator[BatchResult]:
+        """Generate many banners, fanning the work out over a process pool.
+
+        Items are consumed lazily, so only a bounded number of banners is in
+        flight at any time. A failing item produces a BatchResult carrying
+        the exception instead of aborting the batch.
+
+        Args:
+            items: Banners, manifest entries or ``(title, subtitle, config)``
+                tuples.
+            jobs: Number of worker processes (defaults to the CPU count).
+                With ``jobs=1`` rendering happens in the calling process.
+            chunksize: Number of items sent to a worker at a time.
+            ordered: Yield results in input order if True, otherwise as
+                they complete.
+            max_in_flight: Chunks submitted to the pool at a time (default:
+                twice ``jobs``).
+
+        Yields:
+            One BatchResult per input item.
+        """
+        if jobs is None:
+            jobs = os.cpu_count() or 1
+        if jobs <= 0:
+            raise ValueError("jobs must be positive")
+        if chunksize <= 0:
+            raise ValueError("chunksize must be positive")
+        if max_in_flight is not None and max_in_flight <= 0:
+            raise ValueError("max_in_flight must be positive")
+
+        if jobs == 1:
+            for chunk in self._chunks(items, chunksize):
+                for index, item in chunk:
+                    yield self._render_one(index, item)
+            return
+
+        chunks = self._chunks(items, chunksize)
+        if max_in_flight is None:
+            max_in_flight = jobs * 2
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_worker,
+            initargs=(
+                self.default_config,
+                self.metrics is not None,
+                self.icons.directory,
+            ),
+        ) as executor:
+            pending: deque[Future[_ChunkResult]] = deque()
+            for chunk in chunks:
+                pending.append(executor.submit(_render_chunk, chunk))
+                if len(pending) < max_in_flight:
+                    continue
+                yield from self._drain(pending, ordered)
+            while pending:
+                yield from self._drain(pending, ordered)
+
+    def iter_banners(
+        self,
+        source: Iterable[BatchItem] | os.PathLike[str] | str,
+        prefetch: int = 2,
+        jobs: int | None = 1,
+        chunksize: int = 1,
+        release: bool = True,
+    ) -> Iterator[BatchResult]:
+        """Render banners from a source lazily, holding few images at a time.
+
+        Items are pulled from ``source`` only as banners are consumed. A
+        background thread renders up to ``prefetch`` banners ahead of the
+        consumer, so rendering overlaps with whatever the consumer does
+        (usually encoding and writing), and peak memory depends on
+        ``prefetch`` (plus a chunk per worker process) rather than on the
+        size of the batch. The iterator
+        keeps no reference to a banner once it has been yielded.
+
+        Args:
+            source: Banners, manifest entries or ``(title, subtitle,
+                config)`` tuples, or the path (str or Path) of a manifest.
+            prefetch: Banners rendered ahead of the consumer. With 0, each
+                banner is rendered when it is requested.
+            jobs: Worker processes, as for :meth:`generate_many`.
+            chunksize: Banners sent to a worker at a time.
+            release: Make the banners single-use: each banner drops its
+                image once it has been saved or encoded.
+
+        Yields:
+            One BatchResult per item, in order; failures carry the error.
+
+        Raises:
+            Exception: Whatever iterating ``source`` raised, once the
+                banners before it have been yielded.
+        """
+        if prefetch < 0:
+            raise ValueError("prefetch cannot be negative")
+        if jobs is None:
+            jobs = os.cpu_count() or 1
+        items = (
+            read_manifest(Path(source))
+            if isinstance(source, (str, os.PathLike))
+            else source
+        )
+        # Chunks in flight in the worker processes also hold images, but
+        # every worker needs one to stay busy.
+        in_flight = max(jobs, prefetch // chunksize)
+
+        def rendered() -> Generator[BatchResult, None, None]:
+            for result in self.generate_many(
+                items, jobs=jobs, chunksize=chunksize, max_in_flight=in_flight
+            ):
+                if result.banner is not None:
+                    result.banner._release = release
+                yield result
+
+        if prefetch == 0:
+            yield from rendered()
+            return
+
+        ready: queue.Queue[Any] = queue.Queue(prefetch)
+        stop = threading.Event()
+        failure: list[BaseException] = []
+
+        def produce() -> None:
+            results = rendered()
+            try:
+                for result in results:
+                    if stop.is_set():
+                        break
+                    ready.put(result)
+                    del result
+            except BaseException as exc:
+                failure.append(exc)
+            finally:
+                results.close()
+                ready.put(_END)
+
+        thread = threading.Thread(target=produce, name="banner-prefetch", daemon=True)
+        thread.start()
+        try:
+            while True:
+                item = ready.get()
+                if item is _END:
+                    break
+                yield item
+                del item
+        finally:
+            stop.set()
+            # Unblock the producer if the consumer stopped early.
+            while thread.is_alive():
+                try:
+                    ready.get(timeout=0.05)
+                except queue.Empty:
+                    pass
+            thread.join()
+        if failure:
+            raise failure[0]
+
+    def _drain(
+        self, pending: deque[Future[_ChunkResult]], ordered: bool
+    ) -> Iterator[BatchResult]:
+        """Wait for the next finished chunk(s) and yield their results."""
+        if ordered:
+            finished = [pending.popleft()]
+        else:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            finished = [future for future in pending if future in done]
+            for future in finished:
+                pending.remove(future)
+        for future in finished:
+            results, records = future.result()
+            if self.metrics is not None:
+                replay(records, self.metrics)
+            for result in results:
+                if result.banner is not None:
+                    result.banner._metrics = self.metrics
+                yield result
+
+    def _chunks(
+        self, items: Iterable[BatchItem], chunksize: int
+    ) -> Iterator[list[tuple[int, Banner | Exception]]]:
+        """Split items into indexed chunks, replacing invalid items by errors."""
+        iterator = enumerate(items)
+        while True:
+            batch = list(islice(iterator, chunksize))
+            if not batch:
+                return
+            chunk: list[tuple[int, Banner | Exception]] = []
+            for index, item in batch:
+                try:
+                    chunk.append((index, self._to_banner(item)))
+                except Exception as exc:
+                    chunk.append((index, exc))
+            yield chunk
+
+    def _to_banner(self, item: BatchItem) -> Banner:
+        """Convert a batch item into a Banner."""
+        if isinstance(item, Banner):
+            return item
+        if isinstance(item, ManifestEntry):
+            return Banner(
+                item.title,
+                item.subtitle,
+                item.config(self.default_config),
+                icon=item.icon,
+            )
+        if not isinstance(item, tuple) or not 1 <= len(item) <= 3:
+            raise TypeError(
+                "Batch items must be Banner objects or "
+                f"(title, subtitle, config) tuples, got {item!r}"
+            )
+        title = item[0]
+        subtitle = item[1] if len(item) > 1 else ""
+        config = item[2] if len(item) > 2 else None
+        return Banner(
+            title=title,
+            subtitle=subtitle or "",
+            config=config or self.default_config,
+        )
+
+    def _render_one(self, index: int, banner: Banner | Exception) -> BatchResult:
+        """Render a single batch item, capturing any error."""
+        if isinstance(banner, Exception):
+            return BatchResult(index, error=banner)
+        start = time.perf_counter()
+        try:
+            self.generate(banner)
+        except Exception as exc:
+            logger.warning("Failed to render banner %d (%r): %s", index, banner.title, exc)
+            return BatchResult(index, error=exc, duration=time.perf_counter() - start)
+        return BatchResult(index, banner=banner, duration=time.perf_counter() - start)
+
     def _get_font(
         self, size: int, font_path: Path | None = None
     ) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
         """Load a font at the specified size."""
-        if font_path:
-            try:
-                return ImageFont.truetype(str(font_path), size)
-            except OSError:
-                logger.warning(
-                    "Failed to load font '%s', falling back to default", font_path
-                )
-        # Fall back to default font
-        try:
-            return ImageFont.truetype("DejaVuSans.ttf", size)
-        except OSError:
-            logger.debug("DejaVuSans.ttf not found, using PIL default font")
-            return ImageFont.load_default()
+        with span(self.metrics, "font", self.font_cache.stats):
+            return self.font_cache.get(size, font_path)
+
+    def _get_canvas(
+        self, config: BannerConfig, colors: ColorPlan | None = None
+    ) -> Image.Image:
+        """Return a fresh base canvas with background and border painted."""
+        if colors is None:
+            colors = self._color_plan(config)
+        # The canvas pixels do not depend on the text color, so canvases are
+        # shared across text colors and only the palette is replaced.
+        key = (
+            config.width,
+            config.height,
+            config.background_color,
+            config.border_width,
+            config.border_color if config.border_width > 0 else None,
+            colors.mode,
+            config.background_fill,
+            config.fill_color if config.background_fill != "solid" else None,
+        )
+        with span(self.metrics, "canvas", self.canvas_cache.stats):
+            image = self.canvas_cache.get(
+                key, lambda: self._build_canvas(config, colors)
+            )
+            if colors.palette is not None:
+                image.putpalette(colors.palette)
+            return image
+
+    def _color_plan(
+        self, config: BannerConfig, color_mode: str | None = None
+    ) -> ColorPlan:
+        """Return the image mode and fill values for a config's colors."""
+        if color_mode is None:
+            # Gradients and patterns need every color.
+            solid = parse_fill(config.background_fill).kind == "solid"
+            color_mode = config.color_mode if solid else "rgb"
+        return plan_colors(
+            config.background_rgba[:3],
+            config.text_rgba[:3],
+            config.border_rgba[:3] if config.border_width > 0 else None,
+            color_mode,
+        )
+
+    def _layout(self, banner: Banner) -> _Layout:
+        """Place the icon and text runs and choose the color plan for them.
+
+        Palette indices blend text over a partly covered icon pixel with
+        different rounding than colors do, so a palettized banner whose
+        text overlaps its icon is drawn in RGB to stay pixel-identical.
+        """
+        config = banner.config
+        icon = self._place_icon(banner)
+        left, right = self._text_bounds(config, icon)
+        placed = []
+        for text, font, y in self._text_lines(banner, left, right):
+            run, x = self._place_text(
+                text, font, right, config.text_align, config.padding, left
+            )
+            placed.append((run, x, y))
+        colors = self._color_plan(config)
+        if colors.mode == "P" and icon is not None:
+            mask, icon_x, icon_y = icon
+            for run, x, y in placed:
+                if (
+                    x + run.bbox[0] < icon_x + mask.width
+                    and icon_x < x + run.bbox[2]
+                    and y + run.bbox[1] < icon_y + mask.height
+                    and icon_y < y + run.bbox[3]
+                ):
+                    colors = self._color_plan(config, "rgb")
+                    break
+        return colors, icon, placed
+
+    def _new_canvas(self, colors: ColorPlan, width: int, height: int) -> Image.Image:
+        """Create an image filled with the background color."""
+        image = Image.new(colors.mode, (width, height), colors.background)
+        if colors.palette is not None:
+            image.putpalette(colors.palette)
+        return image
+
+    def _build_canvas(self, config: BannerConfig, colors: ColorPlan) -> Image.Image:
+        """Paint the background and border of a new canvas."""
+        image = self._new_canvas(colors, config.width, config.height)
+        self._paint_fill(image, config)
+        if config.border_width > 0:
+            self._draw_border(ImageDraw.Draw(image), config, colors)
+        return image
 
-    def _draw_border(self, draw: ImageDraw.ImageDraw, config: BannerConfig) -> None:
-        """Draw a border around the banner."""
+    @staticmethod
+    def _paint_fill(image: Image.Image, config: BannerConfig, top: int = 0) -> None:
+        """Paint the background fill (if any) over a new canvas or strip.
+
+        ``top`` is the banner row at the top of ``image``.
+        """
+        fill = render_fill(
+            parse_fill(config.background_fill),
+            config.background_rgba[:3],
+            config.fill_rgba[:3],
+            config.width,
+            config.height,
+            top,
+            image.height,
+        )
+        if fill is not None:
+            image.paste(fill)
+
+    def _draw_border(
+        self,
+        draw: ImageDraw.ImageDraw,
+        config: BannerConfig,
+        colors: ColorPlan,
+        top: int = 0,
+    ) -> None:
+        """Draw a border around the banner.
+
+        ``top`` is the banner row at the top of ``draw``'s image, for
+        drawing the part of the border that falls within a strip.
+        """
         bw = config.border_width
         draw.rectangle(
-            [bw // 2, bw // 2, config.width - bw // 2, config.height - bw // 2],
-            outline=config.border_color,
+            [
+                bw // 2,
+                bw // 2 - top,
+                config.width - bw // 2,
+                config.height - bw // 2 - top,
+            ],
+            outline=colors.border,
             width=bw,
         )
 
-    def _calculate_text_y(self, config: BannerConfig, has_subtitle: bool) -> int:
+    def _text_lines(
+        self, banner: Banner, left: int = 0, right: int | None = None
+    ) -> list[tuple[str, Font, int]]:
+        """Return ``(text, font, y)`` for each line of text on the banner.
+
+        The text is laid out between ``left`` and ``right`` (default: the
+        banner width), which only matters for ``fit="shrink"``.
+        """
+        config = banner.config
+        if right is None:
+            right = config.width
+        font_size = config.font_size
+        if config.fit == "shrink":
+            font_size = self._fit_font_size(
+                banner, right - left - 2 * config.padding
+            )
+        font = self._get_font(font_size, config.font_path)
+        title_y = self._calculate_text_y(config, bool(banner.subtitle), font_size)
+        lines = [(banner.title, font, title_y)]
+        if banner.subtitle:
+            subtitle_font = self._get_font(font_size // 2, config.font_path)
+            subtitle_y = title_y + font_size + 10
+            lines.append((banner.subtitle, subtitle_font, subtitle_y))
+        return lines
+
+    def _fit_font_size(self, banner: Banner, available: int) -> int:
+        """Return the largest font size up to ``font_size`` whose text fits.
+
+        The title, and the subtitle at half the size, must both be at most
+        ``available`` pixels wide. Sizes are found by binary search starting
+        from a proportional estimate, so a title costs a handful of cached
+        measurements rather than one per size.
+        """
+        config = banner.config
+        texts = [(banner.title, 1)]
+        if banner.subtitle:
+            texts.append((banner.subtitle, 2))
+
+        def width(size: int) -> int:
+            widest = 0
+            for text, divisor in texts:
+                font = self._get_font(size // divisor, config.font_path)
+                with span(self.metrics, "text"):
+                    left, _, right, _ = self.text_cache.measure(text, font)
+                widest = max(widest, right - left)
+            return widest
+
+        largest = config.font_size
+        full_width = width(largest)
+        if full_width <= available:
+            return largest
+        # Text width grows roughly linearly with the size, so probe the
+        # proportional estimate first and bisect around it.
+        smallest = len(texts)
+        guess = largest * max(available, 0) // full_width
+        return _bisect_size(
+            lambda size: width(size) <= available,
+            smallest,
+            largest - 1,
+            min(max(guess, smallest), largest - 1),
+        )
+
+    def _calculate_text_y(
+        self, config: BannerConfig, has_subtitle: bool, font_size: int | None = None
+    ) -> int:
         """Calculate the Y position for the title text."""
+        if font_size is None:
+            font_size = config.font_size
         if has_subtitle:
             # Account for subtitle when centering
-            total_text_height = config.font_size + (config.font_size // 2) + 10
+            total_text_height = font_size + (font_size // 2) + 10
             return (config.height - total_text_height) // 2
-        return (config.height - config.font_size) // 2
+        return (config.height - font_size) // 2
 
-    def _draw_text(
+    def _place_text(
         self,
-        draw: ImageDraw.ImageDraw,
         text: str,
-        font: ImageFont.FreeTypeFont | ImageFont.ImageFont,
-        color: str,
+        font: Font,
         width: int,
-        y: int,
         align: str,
         padding: int,
-    ) -> None:
-        """Draw text on the banner."""
-        bbox = draw.textbbox((0, 0), text, font=font)
-        text_width = bbox[2] - bbox[0]
+        left: int = 0,
+    ) -> tuple[TextRun, int]:
+        """Return the text run for ``text`` and its aligned x position."""
+        with span(self.metrics, "text", self.text_cache.stats):
+            run = self.text_cache.get(text, font)
+        return run, self._align_text(run.width, width, align, padding, left)
 
+    @staticmethod
+    def _align_text(
+        text_width: int, width: int, align: str, padding: int, left: int = 0
+    ) -> int:
+        """Return the x position of text aligned between ``left`` and ``width``."""
         if align == "left":
-            x = padding
-        elif align == "right":
-            x = width - text_width - padding
-        else:  # center
-            x = (width - text_width) // 2
+            return left + padding
+        if align == "right":
+            return width - text_width - padding
+        return left + (width - left - text_width) // 2  # center
 
-        draw.text((x, y), text, font=font, fill=color)
+    def _place_icon(self, banner: Banner) -> tuple[Image.Image, int, int] | None:
+        """Return the banner's scaled icon mask and its position, if any.
+
+        Raises:
+            ValueError: If the icon is not in the registry.
+        """
+        if not banner.icon:
+            return None
+        config = banner.config
+        # Explicit or twice the font size, always within the padding.
+        size = max(
+            1,
+            min(
+                config.icon_size or config.font_size * 2,
+                config.height - 2 * config.padding,
+            ),
+        )
+        path = self.icons.path(banner.icon)
+        with span(self.metrics, "icon", self.icon_cache.stats):
+            mask = self.icon_cache.get(path, size)
+        if config.icon_position == "right":
+            x = config.width - config.padding - mask.width
+        else:
+            x = config.padding
+        return mask, x, (config.height - mask.height) // 2
+
+    def _text_bounds(
+        self, config: BannerConfig, icon: tuple[Image.Image, int, int] | None
+    ) -> tuple[int, int]:
+        """Return the horizontal span left to the text beside the icon."""
+        if icon is None:
+            return 0, config.width
+        mask, x, _ = icon
+        if config.icon_position == "right":
+            return 0, x
+        return x + mask.width, config.width
+
+    def _paste_icon(
+        self,
+        image: Image.Image,
+        icon: tuple[Image.Image, int, int],
+        color: Ink,
+        top: int = 0,
+    ) -> None:
+        """Composite an icon mask; ``top`` is the banner row at the image top."""
+        mask, x, y = icon
+        y -= top
+        image.paste(color, (x, y, x + mask.width, y + mask.height), mask)
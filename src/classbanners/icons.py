@@ -0,0 +1,201 @@
+"""Named icons and a cache of their scaled masks."""
+
+from __future__ import annotations
+
+from functools import cache
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from classbanners.cache import CacheStats, LRUCache
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+#: Values of ``BannerConfig.icon_position``.
+ICON_POSITIONS = ("left", "right")
+
+DEFAULT_ICON_BUDGET = 16 * 1024 * 1024
+
+IconKey = tuple[str, int, int]
+
+
+@cache
+def bundled_icon_dir() -> Path:
+    """Return the directory of the icons shipped with the package."""
+    # importlib.resources is slow to import; only pay for it when icons
+    # are actually looked up.
+    from importlib.resources import files
+
+    return Path(str(files("classbanners") / "assets" / "icons"))
+
+
+class IconRegistry:
+    """Icons available by name, one PNG file per icon in a directory.
+
+    An icon's name is its file name without the extension, e.g.
+    ``cloud.png`` is the icon ``cloud``. Icons are used as masks (their
+    alpha channel, or their luminance if they have none) and drawn in the
+    banner's text color.
+    """
+
+    def __init__(self, directory: Path | str | None = None) -> None:
+        """Initialize the registry.
+
+        Args:
+            directory: Directory holding the icon files (default: the
+                bundled icons).
+        """
+        self._directory = Path(directory) if directory is not None else None
+        self._paths: dict[str, Path] | None = None
+
+    @property
+    def directory(self) -> Path:
+        """Directory holding the icon files."""
+        if self._directory is None:
+            self._directory = bundled_icon_dir()
+        return self._directory
+
+    @property
+    def names(self) -> list[str]:
+        """Names of the available icons, sorted."""
+        return sorted(self._scan())
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._scan()
+
+    def path(self, name: str) -> Path:
+        """Return the file of the icon called ``name``.
+
+        Raises:
+            ValueError: If there is no such icon.
+        """
+        try:
+            return self._scan()[name]
+        except KeyError:
+            raise ValueError(
+                f"Unknown icon '{name}' (available: {', '.join(self.names) or 'none'})"
+            ) from None
+
+    def refresh(self) -> None:
+        """Forget the directory listing so new icons are picked up."""
+        self._paths = None
+
+    def _scan(self) -> dict[str, Path]:
+        if self._paths is None:
+            try:
+                self._paths = {
+                    path.stem: path
+                    for path in self.directory.iterdir()
+                    if path.suffix.lower() == ".png"
+                }
+            except OSError:
+                self._paths = {}
+        return self._paths
+
+
+def _icon_key(path: Path, size: int) -> IconKey:
+    """Build a cache key of (resolved path, mtime, size) for an icon."""
+    resolved = path.resolve()
+    return (str(resolved), resolved.stat().st_mtime_ns, size)
+
+
+def _decode_icon(path: Path) -> Image.Image:
+    """Decode an icon file into an "L" mask."""
+    from PIL import Image
+
+    with Image.open(path) as image:
+        if "A" in image.getbands():
+            return image.getchannel("A")
+        if image.mode == "P" and "transparency" in image.info:
+            return image.convert("RGBA").getchannel("A")
+        return image.convert("L")
+
+
+def _scale_icon(mask: Image.Image, size: int) -> Image.Image:
+    """Scale a mask so that its longer side is ``size`` pixels."""
+    from PIL import Image
+
+    scale = size / max(mask.width, mask.height)
+    target = (max(1, round(mask.width * scale)), max(1, round(mask.height * scale)))
+    if target == mask.size:
+        return mask
+    return mask.resize(target, Image.Resampling.LANCZOS, reducing_gap=3.0)
+
+
+class IconCache:
+    """LRU cache of icon masks scaled to a target size.
+
+    Each icon file is decoded once and each (icon, size) pair resampled
+    once, however many banners use it. Masks are colorless; the color is
+    applied when a mask is composited, so one entry serves every color.
+    """
+
+    def __init__(
+        self, max_entries: int = 256, max_bytes: int = DEFAULT_ICON_BUDGET
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of scaled masks.
+            max_bytes: Memory budget for scaled masks in bytes.
+        """
+        self._scaled: LRUCache[IconKey, Image.Image] = LRUCache(
+            max_entries=max_entries,
+            max_bytes=max_bytes,
+            sizeof=lambda mask: mask.width * mask.height,
+        )
+        self._sources: LRUCache[tuple[str, int], Image.Image] = LRUCache(
+            max_entries=64
+        )
+
+    @property
+    def stats(self) -> CacheStats:
+        """Hit, miss and eviction counters of the scaled masks."""
+        return self._scaled.stats
+
+    @property
+    def current_bytes(self) -> int:
+        """Memory currently used by scaled masks in bytes."""
+        return self._scaled.current_bytes
+
+    def __len__(self) -> int:
+        return len(self._scaled)
+
+    def get(self, path: Path | str, size: int) -> Image.Image:
+        """Return the mask of the icon at ``path`` scaled to ``size``.
+
+        Raises:
+            ValueError: If ``size`` is not positive.
+            OSError: If the icon file cannot be read.
+        """
+        if size <= 0:
+            raise ValueError("Icon size must be positive")
+        path = Path(path)
+        key = _icon_key(path, size)
+        return self._scaled.get_or_create(
+            key, lambda: _scale_icon(self._source(key[0], key[1]), size)
+        )
+
+    def _source(self, path: str, mtime_ns: int) -> Image.Image:
+        return self._sources.get_or_create(
+            (path, mtime_ns), lambda: _decode_icon(Path(path))
+        )
+
+    def clear(self) -> None:
+        """Drop all cached masks and reset the statistics."""
+        self._scaled.clear()
+        self._sources.clear()
+
+
+_icon_registry = IconRegistry()
+_icon_cache = IconCache()
+
+
+def get_icon_registry() -> IconRegistry:
+    """Return the registry of the bundled icons."""
+    return _icon_registry
+
+
+def get_icon_cache() -> IconCache:
+    """Return the process-wide icon cache."""
+    return _icon_cache
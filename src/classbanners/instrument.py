@@ -0,0 +1,182 @@
+"""Instrumentation hooks for timing the stages of banner rendering."""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import AbstractContextManager
+from dataclasses import dataclass
+from types import TracebackType
+
+from classbanners.cache import CacheStats
+
+#: Stages reported by BannerGenerator.generate and Banner.save, in order.
+STAGES = ("font", "canvas", "text", "icon", "draw", "resize", "encode", "write")
+
+
+class MetricsSink:
+    """Receiver of timed spans and cache events.
+
+    Subclass and override :meth:`record_span` and :meth:`record_event` to
+    forward measurements elsewhere. Spans are named after the pipeline
+    stages in :data:`STAGES`; events are named ``<cache>.hit`` or
+    ``<cache>.miss``.
+    """
+
+    def record_span(self, stage: str, seconds: float) -> None:
+        """Record that ``stage`` took ``seconds``."""
+
+    def record_event(self, name: str) -> None:
+        """Record a single occurrence of ``name``."""
+
+
+@dataclass
+class StageStats:
+    """Aggregated timings of one stage."""
+
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    @property
+    def mean(self) -> float:
+        """Mean duration in seconds."""
+        return self.total / self.count if self.count else 0.0
+
+
+class StageProfiler(MetricsSink):
+    """Sink that aggregates spans per stage and counts events."""
+
+    def __init__(self) -> None:
+        """Initialize an empty profile."""
+        self.stages: dict[str, StageStats] = {}
+        self.events: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record_span(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            stats = self.stages.get(stage)
+            if stats is None:
+                stats = self.stages[stage] = StageStats()
+            stats.count += 1
+            stats.total += seconds
+            if seconds > stats.max:
+                stats.max = seconds
+
+    def record_event(self, name: str) -> None:
+        with self._lock:
+            self.events[name] = self.events.get(name, 0) + 1
+
+    def report(self) -> str:
+        """Format the per-stage breakdown as a table."""
+        order = {stage: index for index, stage in enumerate(STAGES)}
+        names = sorted(self.stages, key=lambda name: (order.get(name, len(order)), name))
+        lines = [
+            f"{'stage':<10}{'count':>8}{'total ms':>12}{'mean ms':>10}{'max ms':>10}"
+        ]
+        for name in names:
+            stats = self.stages[name]
+            lines.append(
+                f"{name:<10}{stats.count:>8}{stats.total * 1000:>12.1f}"
+                f"{stats.mean * 1000:>10.2f}{stats.max * 1000:>10.2f}"
+            )
+        if self.events:
+            lines.append(
+                "cache: "
+                + ", ".join(f"{name}={count}" for name, count in sorted(self.events.items()))
+            )
+        return "\n".join(lines)
+
+
+class RecordingSink(MetricsSink):
+    """Sink that buffers measurements so they can be replayed elsewhere.
+
+    Used to ship measurements from worker processes back to the caller.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty recording."""
+        self.records: list[tuple[str, float | None]] = []
+
+    def record_span(self, stage: str, seconds: float) -> None:
+        self.records.append((stage, seconds))
+
+    def record_event(self, name: str) -> None:
+        self.records.append((name, None))
+
+    def drain(self) -> list[tuple[str, float | None]]:
+        """Return and clear the buffered measurements."""
+        records, self.records = self.records, []
+        return records
+
+
+def replay(records: list[tuple[str, float | None]], sink: MetricsSink) -> None:
+    """Forward measurements buffered by a RecordingSink to ``sink``."""
+    for name, seconds in records:
+        if seconds is None:
+            sink.record_event(name)
+        else:
+            sink.record_span(name, seconds)
+
+
+class _Span:
+    """Times a block and reports a cache hit or miss if given stats."""
+
+    __slots__ = ("_sink", "_stage", "_stats", "_hits", "_start")
+
+    def __init__(
+        self, sink: MetricsSink, stage: str, stats: CacheStats | None
+    ) -> None:
+        self._sink = sink
+        self._stage = stage
+        self._stats = stats
+
+    def __enter__(self) -> None:
+        if self._stats is not None:
+            self._hits = self._stats.hits
+        self._start = time.perf_counter()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self._sink.record_span(self._stage, time.perf_counter() - self._start)
+        if self._stats is not None:
+            outcome = "hit" if self._stats.hits > self._hits else "miss"
+            self._sink.record_event(f"{self._stage}.{outcome}")
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(
+    sink: MetricsSink | None, stage: str, stats: CacheStats | None = None
+) -> AbstractContextManager[None]:
+    """Time a stage, or do nothing if ``sink`` is None.
+
+    Args:
+        sink: Receiver of the measurement, or None when disabled.
+        stage: Name of the stage being timed.
+        stats: Statistics of the cache consulted during the stage; a
+            ``<stage>.hit`` or ``<stage>.miss`` event is recorded from them.
+    """
+    if sink is None:
+        return _NULL_SPAN
+    return _Span(sink, stage, stats)
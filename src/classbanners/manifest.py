@@ -0,0 +1,282 @@
+"""Streaming readers for batch manifests and output filename templates."""
+
+from __future__ import annotations
+
+import csv
+import json
+import re
+import string
+from collections.abc import Iterator, Mapping, Sequence
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import IO, Any
+
+from classbanners.banner import BannerConfig
+
+DEFAULT_TEMPLATE = "{number:02d}-{title|slug}.png"
+
+# Manifest columns that may override BannerConfig fields per row.
+_CONFIG_FIELDS = {f.name for f in fields(BannerConfig)}
+
+_CHUNK_SIZE = 64 * 1024
+_WHITESPACE = " \t\r\n"
+
+
+@dataclass
+class ManifestEntry:
+    """A single row of a batch manifest.
+
+    A malformed row still produces an entry, with ``error`` describing the
+    problem, so one bad row does not end the batch; :meth:`config` raises
+    it like an invalid configuration value.
+    """
+
+    index: int
+    title: str
+    subtitle: str = ""
+    number: int | None = None
+    icon: str | None = None
+    overrides: dict[str, Any] = field(default_factory=dict)
+    extra: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+
+    @classmethod
+    def from_row(cls, index: int, row: Any) -> ManifestEntry:
+        """Build an entry from a parsed manifest row.
+
+        Rows that are not objects, have no title or have a non-numeric
+        number give an entry whose ``error`` says so.
+        """
+        try:
+            return cls._parse_row(index, row)
+        except ValueError as exc:
+            return cls(index=index, title="", error=str(exc))
+
+    @classmethod
+    def _parse_row(cls, index: int, row: Any) -> ManifestEntry:
+        if not isinstance(row, Mapping):
+            raise ValueError(f"Manifest row {index} is not an object")
+        title = row.get("title")
+        if not title:
+            raise ValueError(f"Manifest row {index} has no title")
+        number = row.get("number")
+        try:
+            number = int(number) if number not in (None, "") else None
+        except (TypeError, ValueError):
+            raise ValueError(
+                f"Manifest row {index} has an invalid number {number!r}"
+            ) from None
+        overrides = {
+            key: value
+            for key, value in row.items()
+            if key in _CONFIG_FIELDS and value not in (None, "")
+        }
+        extra = {
+            key: value
+            for key, value in row.items()
+            if key not in _CONFIG_FIELDS
+            and key not in ("title", "subtitle", "number", "icon")
+        }
+        return cls(
+            index=index,
+            title=str(title),
+            subtitle=str(row.get("subtitle") or ""),
+            number=number,
+            icon=row.get("icon") or None,
+            overrides=overrides,
+            extra=extra,
+        )
+
+    @property
+    def position(self) -> int:
+        """The entry's topic number, or its 1-based position if unnumbered."""
+        return self.number if self.number is not None else self.index + 1
+
+    def config(self, base: BannerConfig) -> BannerConfig:
+        """Return ``base`` with this entry's per-row overrides applied.
+
+        Raises:
+            ValueError: If an override is invalid or the row is malformed.
+        """
+        if self.error is not None:
+            raise ValueError(self.error)
+        if not self.overrides:
+            return base
+        converted: dict[str, Any] = {}
+        for key, value in self.overrides.items():
+            current = getattr(base, key)
+            if key == "font_path":
+                converted[key] = Path(value)
+            elif isinstance(current, int) and not isinstance(value, int):
+                converted[key] = int(value)
+            else:
+                converted[key] = value
+        return base.replace(**converted)
+
+    def describe(self, exc: Exception) -> str:
+        """Format an error of this entry, prefixed with its title if any."""
+        return f"{self.title}: {exc}" if self.title else str(exc)
+
+    def template_fields(self) -> dict[str, Any]:
+        """Return the values available to output filename templates."""
+        return {
+            **self.extra,
+            **self.overrides,
+            "index": self.index,
+            "number": self.position,
+            "title": self.title,
+            "subtitle": self.subtitle,
+            "icon": self.icon or "",
+        }
+
+
+def read_manifest(path: Path | str) -> Iterator[ManifestEntry]:
+    """Stream entries from a JSON, JSONL or CSV manifest.
+
+    JSON manifests may be a top-level array of rows or an object holding
+    one (like ``data/topics.json``); rows are decoded one at a time rather
+    than loading the whole document. Malformed rows are yielded with their
+    ``error`` set rather than raised.
+
+    Raises:
+        ValueError: If the file extension is not supported or a JSON
+            manifest holds no array of rows.
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".json":
+        reader = _iter_json_rows
+    elif suffix in (".jsonl", ".ndjson"):
+        reader = _iter_jsonl_rows
+    elif suffix == ".csv":
+        reader = _iter_csv_rows
+    else:
+        raise ValueError(f"Unsupported manifest format '{path.suffix}'")
+
+    with path.open(encoding="utf-8", newline="") as fp:
+        for index, row in enumerate(reader(fp)):
+            yield ManifestEntry.from_row(index, row)
+
+
+def _iter_csv_rows(fp: IO[str]) -> Iterator[Mapping[str, Any]]:
+    """Yield rows of a CSV file with a header line."""
+    yield from csv.DictReader(fp)
+
+
+def _iter_jsonl_rows(fp: IO[str]) -> Iterator[Mapping[str, Any]]:
+    """Yield one JSON object per non-blank line."""
+    for line in fp:
+        if line.strip():
+            yield json.loads(line)
+
+
+def _iter_json_rows(fp: IO[str]) -> Iterator[Any]:
+    """Incrementally decode the rows array of a JSON document.
+
+    The rows are the document itself if it is an array, or else the first
+    member of the top-level object whose value is an array.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+
+    def fill() -> bool:
+        nonlocal buffer, pos
+        chunk = fp.read(_CHUNK_SIZE)
+        # Drop what has been consumed so the buffer stays one value long.
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return bool(chunk)
+
+    def skip(separators: str) -> str:
+        """Skip separators and return the next character ("" at the end)."""
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in separators:
+                pos += 1
+            if pos < len(buffer):
+                return buffer[pos]
+            if not fill():
+                return ""
+
+    def decode() -> Any:
+        """Decode the value at ``pos``, reading more input as needed."""
+        nonlocal pos
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if not fill():
+                    raise
+                continue
+            # A number may continue in the next chunk.
+            if end == len(buffer) and fill():
+                continue
+            pos = end
+            return value
+
+    not_found = "Manifest must be a JSON array or an object holding one"
+    start = skip(_WHITESPACE)
+    if start == "{":
+        pos += 1
+        while True:
+            if skip(_WHITESPACE + ",") != '"':
+                raise ValueError(not_found)
+            decode()
+            if skip(_WHITESPACE) != ":":
+                raise ValueError("Malformed JSON object in manifest")
+            pos += 1
+            if skip(_WHITESPACE) == "[":
+                break
+            decode()
+    elif start != "[":
+        raise ValueError(not_found)
+    pos += 1
+
+    while True:
+        separator = skip(_WHITESPACE + ",")
+        if not separator:
+            raise ValueError("Unterminated JSON array in manifest")
+        if separator == "]":
+            return
+        yield decode()
+
+
+def slugify(value: str) -> str:
+    """Convert text to a lowercase, hyphen-separated filename fragment."""
+    return re.sub(r"[^a-z0-9]+", "-", value.lower()).strip("-")
+
+
+_FILTERS = {
+    "slug": slugify,
+    "lower": str.lower,
+    "upper": str.upper,
+}
+
+
+class _TemplateFormatter(string.Formatter):
+    """``str.format`` with ``{field|filter}`` support."""
+
+    def get_field(
+        self, field_name: str, args: Sequence[Any], kwargs: Mapping[str, Any]
+    ) -> tuple[Any, str]:
+        name, *filters = field_name.split("|")
+        value, used = super().get_field(name, args, kwargs)
+        for name in filters:
+            try:
+                value = _FILTERS[name](str(value))
+            except KeyError:
+                raise ValueError(f"Unknown template filter '{name}'") from None
+        return value, used
+
+
+_formatter = _TemplateFormatter()
+
+
+def format_output_name(template: str, entry: ManifestEntry) -> str:
+    """Render an output filename for ``entry`` from ``template``.
+
+    Templates use ``str.format`` syntax plus ``|slug``, ``|lower`` and
+    ``|upper`` filters, e.g. ``{number:02d}-{title|slug}.png``.
+    """
+    return _formatter.vformat(template, (), entry.template_fields())
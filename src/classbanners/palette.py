@@ -0,0 +1,118 @@
+"""Reduced-color rendering for banners that use only a few colors.
+
+Most banners use just a background and a text color, with a border in one
+of the two if any. Such banners are rendered as single-channel images
+instead of RGB: "L" when every color is a shade of gray, otherwise
+palettized "P" with a ramp of blends between the background and text colors
+that keeps antialiased text edges intact. Either way the pixels are exactly
+those of an RGB render.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Union
+
+from classbanners.banner import COLOR_MODES
+
+RGB = tuple[int, int, int]
+
+#: A fill value in the mode of the image being drawn on.
+Ink = Union[int, RGB]
+
+
+@dataclass(frozen=True)
+class ColorPlan:
+    """How a banner's colors are drawn in its image mode.
+
+    Attributes:
+        mode: Image mode of the canvas ('L', 'P' or 'RGB').
+        background: Fill value of the background.
+        text: Fill value of the text; partially covered pixels blend
+            between ``background`` and ``text``.
+        border: Fill value of the border.
+        palette: Flat RGB palette for 'P' mode, otherwise None.
+    """
+
+    mode: str
+    background: Ink
+    text: Ink
+    border: Ink
+    palette: tuple[int, ...] | None = None
+
+
+def blend(background: int, foreground: int, alpha: int) -> int:
+    """Blend one channel the way Pillow composites a fill through a mask."""
+    value = background * (255 - alpha) + foreground * alpha + 128
+    return ((value >> 8) + value) >> 8
+
+
+def _ramp(background: RGB, text: RGB, levels: int) -> list[int]:
+    """Return palette entries blending ``background`` into ``text``.
+
+    Entry ``i`` holds the color of a pixel whose text coverage is
+    ``i / (levels - 1)``.
+    """
+    palette: list[int] = []
+    for index in range(levels):
+        alpha = round(index * 255 / (levels - 1))
+        palette.extend(blend(b, t, alpha) for b, t in zip(background, text))
+    return palette
+
+
+@lru_cache(maxsize=256)
+def plan_colors(
+    background: RGB,
+    text: RGB,
+    border: RGB | None,
+    color_mode: str = "auto",
+) -> ColorPlan:
+    """Choose the image mode and fill values for a set of banner colors.
+
+    Colors are RGB tuples, as drawn on an RGB image (any alpha dropped);
+    ``border`` is None for banners without a border.
+
+    With ``color_mode="auto"`` a reduced mode is only chosen when it is
+    pixel-identical to RGB:
+
+    - If every color is gray, the banner is drawn in "L" mode.
+    - Otherwise, a background and text color (plus a border matching one of
+      them) use a 256-entry palette ramp whose index is the text coverage.
+    - A third, distinct border color is drawn in RGB: text overlapping the
+      border blends towards the border color, which a single ramp from the
+      background cannot represent.
+
+    The ramp also blends text over a partly covered icon pixel with
+    different rounding; the generator draws banners whose text overlaps
+    their icon in RGB.
+
+    ``color_mode="rgb"`` always draws in full RGB.
+
+    Raises:
+        ValueError: If ``color_mode`` is unknown.
+    """
+    if color_mode not in COLOR_MODES:
+        raise ValueError(
+            f"color_mode must be one of {', '.join(COLOR_MODES)}, got '{color_mode}'"
+        )
+    if border is None:
+        border = background
+
+    if color_mode == "rgb":
+        return ColorPlan("RGB", background, text, border)
+
+    if all(r == g == b for r, g, b in (background, text, border)):
+        return ColorPlan("L", background[0], text[0], border[0])
+
+    if border in (background, text):
+        # Palette index == text coverage, exactly as Pillow blends it.
+        return ColorPlan(
+            "P",
+            0,
+            255,
+            0 if border == background else 255,
+            tuple(_ramp(background, text, 256)),
+        )
+    return ColorPlan("RGB", background, text, border)
+
@@ -0,0 +1,404 @@
+"""Pipelined batch output: render, encode and write stages run concurrently.
+
+Rendering runs on one thread (which may drive a process pool), encoding
+on a thread pool and writes (to files or an archive) on writer threads.
+Pillow's encoders and file I/O release the GIL, so the stages overlap
+instead of taking turns.
+Bounded queues between the stages apply backpressure: a slow stage stalls
+the one before it, so memory stays flat however large the batch is.
+"""
+
+from __future__ import annotations
+
+import os
+import queue
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from classbanners.banner import Banner
+from classbanners.encoding import encode_image, resolve_encoding
+from classbanners.instrument import span
+
+if TYPE_CHECKING:
+    from classbanners.generator import BannerGenerator
+
+PIPELINE_STAGES = ("render", "encode", "write")
+
+# Seconds between checks for cancellation while blocked on a queue.
+_POLL = 0.1
+
+_DONE = object()
+
+
+@dataclass
+class StageUtilization:
+    """How busy one pipeline stage was.
+
+    Attributes:
+        workers: Threads running the stage.
+        items: Items the stage processed.
+        busy: Seconds spent working, summed over the threads.
+        blocked: Seconds spent waiting for room in the next stage's queue,
+            summed over the threads.
+        wall: Wall-clock duration of the run.
+    """
+
+    workers: int
+    items: int = 0
+    busy: float = 0.0
+    blocked: float = 0.0
+    wall: float = 0.0
+
+    @property
+    def utilization(self) -> float:
+        """Fraction of the stage's thread time spent working."""
+        capacity = self.workers * self.wall
+        return min(self.busy / capacity, 1.0) if capacity > 0 else 0.0
+
+
+@dataclass
+class PipelineReport:
+    """Per-stage utilization of a pipeline run."""
+
+    stages: dict[str, StageUtilization] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+    def format(self) -> str:
+        """Format the utilization of every stage on one line."""
+        return "Stages: " + ", ".join(
+            f"{name} {stats.utilization:.0%} busy"
+            f" ({stats.workers} thread{'s' if stats.workers != 1 else ''},"
+            f" {stats.blocked:.2f}s blocked)"
+            for name, stats in self.stages.items()
+        )
+
+
+@dataclass
+class PipelineResult:
+    """Outcome of one item of a pipelined batch."""
+
+    index: int
+    path: Path
+    title: str = ""
+    nbytes: int = 0
+    error: Exception | None = None
+    duration: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """Whether the banner was written."""
+        return self.error is None
+
+
+@dataclass
+class _Work:
+    """An item moving through the pipeline."""
+
+    index: int
+    path: Path
+    title: str
+    duration: float
+    banner: Banner | None = None
+    data: Any = None
+
+
+class OutputSink:
+    """Destination of the encoded banners of a pipeline.
+
+    ``write`` may be called from several writer threads at once.
+    """
+
+    def write(self, path: Path, data: Any) -> None:
+        """Store the encoded bytes of the banner destined for ``path``."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Finish the output; the default does nothing."""
+
+
+class FileSink(OutputSink):
+    """Writes each banner to its own file."""
+
+    def write(self, path: Path, data: Any) -> None:
+        try:
+            path.write_bytes(data)
+        except FileNotFoundError:
+            # Only create the parent directory when it is actually missing.
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+
+
+class _Stop(Exception):
+    """Raised inside a stage thread when the run is cancelled."""
+
+
+class BannerPipeline:
+    """Renders a batch and writes every banner to an output sink.
+
+    The sink decides where encoded banners go: a file per banner by
+    default, or entries of an archive. Results are yielded as banners are
+    written, one per item, with errors reported per item rather than
+    aborting the batch.
+    """
+
+    def __init__(
+        self,
+        generator: BannerGenerator,
+        jobs: int | None = 1,
+        chunksize: int = 1,
+        encode_threads: int | None = None,
+        write_threads: int = 1,
+        queue_size: int | None = None,
+        image_format: str | None = None,
+        preset: str | None = None,
+        sink: OutputSink | None = None,
+    ) -> None:
+        """Initialize the pipeline.
+
+        Args:
+            generator: Generator used for the render stage.
+            jobs: Render worker processes, as for ``generate_many``.
+            chunksize: Banners sent to a render worker at a time.
+            encode_threads: Encoder threads (default: CPU count).
+            write_threads: Writer threads.
+            queue_size: Capacity of each queue between stages (default:
+                twice the threads of the stage it feeds).
+            image_format: Output format. Auto-detected from each path if None.
+            preset: Encoder preset.
+            sink: Where encoded banners go (default: a file per banner).
+                The pipeline does not close it.
+        """
+        if encode_threads is None:
+            encode_threads = os.cpu_count() or 1
+        if encode_threads < 1 or write_threads < 1:
+            raise ValueError("Thread counts must be positive")
+        if queue_size is not None and queue_size < 1:
+            raise ValueError("queue_size must be positive")
+        self.generator = generator
+        self.jobs = jobs
+        self.chunksize = chunksize
+        self.encode_threads = encode_threads
+        self.write_threads = write_threads
+        self.queue_size = queue_size
+        self.image_format = image_format
+        self.preset = preset
+        self.sink = sink if sink is not None else FileSink()
+        self.report = PipelineReport()
+
+    def run(
+        self, items: Iterable[tuple[Banner, Path | str]]
+    ) -> Iterator[PipelineResult]:
+        """Render, encode and write ``(banner, path)`` items.
+
+        ``items`` is consumed lazily on the render thread. Results arrive
+        in completion order; ``report`` holds the stage utilization once
+        the iterator is exhausted.
+
+        Raises:
+            Exception: Whatever iterating ``items`` raised, once the items
+                before it have been written.
+        """
+        encode_queue: queue.Queue[Any] = queue.Queue(
+            self.queue_size or 2 * self.encode_threads
+        )
+        write_queue: queue.Queue[Any] = queue.Queue(
+            self.queue_size or 2 * self.write_threads
+        )
+        results: queue.Queue[Any] = queue.Queue()
+        stop = threading.Event()
+        stages = {
+            name: StageUtilization(workers)
+            for name, workers in zip(
+                PIPELINE_STAGES, (1, self.encode_threads, self.write_threads)
+            )
+        }
+        lock = threading.Lock()
+        failure: list[BaseException] = []
+        remaining = {"encode": self.encode_threads, "write": self.write_threads}
+
+        def put(target: queue.Queue[Any], item: Any, stage: str) -> None:
+            start = time.perf_counter()
+            try:
+                while True:
+                    if stop.is_set():
+                        raise _Stop
+                    try:
+                        target.put(item, timeout=_POLL)
+                        return
+                    except queue.Full:
+                        continue
+            finally:
+                with lock:
+                    stages[stage].blocked += time.perf_counter() - start
+
+        def get(source: queue.Queue[Any]) -> Any:
+            while True:
+                if stop.is_set():
+                    raise _Stop
+                try:
+                    return source.get(timeout=_POLL)
+                except queue.Empty:
+                    continue
+
+        def account(stage: str, seconds: float) -> None:
+            with lock:
+                stats = stages[stage]
+                stats.items += 1
+                stats.busy += seconds
+
+        def render() -> None:
+            paths: dict[int, tuple[Path, str]] = {}
+
+            def banners() -> Iterator[Banner]:
+                for index, (banner, path) in enumerate(items):
+                    paths[index] = (Path(path), banner.title)
+                    yield banner
+
+            try:
+                batch = iter(
+                    self.generator.generate_many(
+                        banners(), jobs=self.jobs, chunksize=self.chunksize
+                    )
+                )
+                while True:
+                    start = time.perf_counter()
+                    try:
+                        result = next(batch)
+                    except StopIteration:
+                        break
+                    account("render", time.perf_counter() - start)
+                    path, title = paths.pop(result.index)
+                    work = _Work(result.index, path, title, result.duration)
+                    if result.banner is None:
+                        results.put(_failed(work, result.error))
+                        continue
+                    work.banner = result.banner
+                    put(encode_queue, work, "render")
+            except _Stop:
+                return
+            except BaseException as exc:
+                failure.append(exc)
+            for _ in range(self.encode_threads):
+                try:
+                    put(encode_queue, _DONE, "render")
+                except _Stop:
+                    return
+
+        def encode() -> None:
+            try:
+                while True:
+                    work = get(encode_queue)
+                    if work is _DONE:
+                        break
+                    start = time.perf_counter()
+                    try:
+                        image_format, settings = resolve_encoding(
+                            work.path, self.image_format, self.preset
+                        )
+                        image = work.banner.image if work.banner else None
+                        if image is None:
+                            raise ValueError("No image to encode")
+                        with span(self.generator.metrics, "encode"):
+                            work.data = encode_image(image, image_format, **settings)
+                    except Exception as exc:
+                        results.put(_failed(work, exc))
+                        continue
+                    finally:
+                        # Release the pixels as soon as they are encoded.
+                        work.banner = None
+                    elapsed = time.perf_counter() - start
+                    work.duration += elapsed
+                    account("encode", elapsed)
+                    put(write_queue, work, "encode")
+            except _Stop:
+                return
+            with lock:
+                remaining["encode"] -= 1
+                last = remaining["encode"] == 0
+            if last:
+                for _ in range(self.write_threads):
+                    try:
+                        put(write_queue, _DONE, "encode")
+                    except _Stop:
+                        return
+
+        def write() -> None:
+            try:
+                while True:
+                    work = get(write_queue)
+                    if work is _DONE:
+                        break
+                    start = time.perf_counter()
+                    try:
+                        with span(self.generator.metrics, "write"):
+                            self.sink.write(work.path, work.data)
+                        nbytes = len(work.data)
+                    except Exception as exc:
+                        results.put(_failed(work, exc))
+                        continue
+                    finally:
+                        work.data = None
+                    elapsed = time.perf_counter() - start
+                    account("write", elapsed)
+                    results.put(
+                        PipelineResult(
+                            work.index,
+                            work.path,
+                            work.title,
+                            nbytes,
+                            duration=work.duration + elapsed,
+                        )
+                    )
+            except _Stop:
+                return
+            with lock:
+                remaining["write"] -= 1
+                last = remaining["write"] == 0
+            if last:
+                results.put(_DONE)
+
+        threads = [threading.Thread(target=render, name="banner-render")]
+        threads += [
+            threading.Thread(target=encode, name=f"banner-encode-{i}")
+            for i in range(self.encode_threads)
+        ]
+        threads += [
+            threading.Thread(target=write, name=f"banner-write-{i}")
+            for i in range(self.write_threads)
+        ]
+        self.report = PipelineReport(stages)
+        start = time.perf_counter()
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+        try:
+            while True:
+                result = results.get()
+                if result is _DONE:
+                    break
+                yield result
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+            self.report.elapsed = time.perf_counter() - start
+            for stats in stages.values():
+                stats.wall = self.report.elapsed
+        if failure:
+            raise failure[0]
+
+
+def _failed(work: _Work, error: BaseException | None) -> PipelineResult:
+    """Build the result of an item that failed in some stage."""
+    return PipelineResult(
+        work.index,
+        work.path,
+        work.title,
+        error=error if isinstance(error, Exception) else RuntimeError(str(error)),
+        duration=work.duration,
+    )
+
@@ -0,0 +1,406 @@
+"""Asyncio HTTP service that renders banners on demand."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, fields
+from http import HTTPStatus
+from typing import Any
+from urllib.parse import parse_qsl, urlsplit
+
+from classbanners.banner import Banner, BannerConfig
+from classbanners.buildcache import render_key
+from classbanners.encoding import encoder_options, normalize_format
+from classbanners.generator import BannerGenerator
+from classbanners.icons import IconRegistry
+
+logger = logging.getLogger(__name__)
+
+_CONTENT_TYPES = {
+    "PNG": "image/png",
+    "WEBP": "image/webp",
+    "JPEG": "image/jpeg",
+    "SVG": "image/svg+xml",
+}
+
+# Short query parameter names accepted alongside BannerConfig field names.
+_PARAM_ALIASES = {
+    "background": "background_color",
+    "color": "text_color",
+    "font": "font_path",
+    "fill": "background_fill",
+}
+_CONFIG_FIELDS = {f.name for f in fields(BannerConfig)}
+# Fields naming files on the server; only the server's own config sets them.
+_SERVER_FIELDS = {"font_path"}
+
+_MAX_HEADER_BYTES = 16 * 1024
+_MAX_BODY_BYTES = 64 * 1024
+
+
+class HTTPError(Exception):
+    """An error that maps directly to an HTTP response."""
+
+    def __init__(self, status: HTTPStatus, message: str = "") -> None:
+        super().__init__(message or status.phrase)
+        self.status = status
+        self.message = message or status.phrase
+
+
+@dataclass
+class RenderRequest:
+    """A parsed banner request."""
+
+    banner: Banner
+    image_format: str = "PNG"
+    preset: str | None = None
+    options: dict[str, Any] = field(default_factory=dict)
+
+    def etag(self, icons: IconRegistry | None = None) -> str:
+        """Return a strong ETag derived from the banner content and encoding.
+
+        Args:
+            icons: Registry the banner's icon is looked up in (default: the
+                bundled icons).
+        """
+        encoding = {"format": self.image_format, **self.options}
+        return f'"{render_key(self.banner, encoding, icons)}"'
+
+
+def parse_render_request(
+    params: dict[str, str],
+    default_config: BannerConfig,
+    default_preset: str | None = None,
+) -> RenderRequest:
+    """Build a RenderRequest from request parameters.
+
+    Raises:
+        HTTPError: If a parameter is missing or invalid.
+    """
+    title = params.get("title")
+    if not title:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Missing 'title' parameter")
+
+    image_format = normalize_format(params.get("format", "PNG"))
+    if image_format not in _CONTENT_TYPES:
+        raise HTTPError(
+            HTTPStatus.BAD_REQUEST, f"Unsupported format '{params['format']}'"
+        )
+
+    overrides: dict[str, Any] = {}
+    for name, value in params.items():
+        name = _PARAM_ALIASES.get(name, name)
+        if name in _SERVER_FIELDS:
+            raise HTTPError(
+                HTTPStatus.BAD_REQUEST, f"'{name}' cannot be set per request"
+            )
+        if name not in _CONFIG_FIELDS:
+            continue
+        current = getattr(default_config, name)
+        try:
+            if isinstance(current, int):
+                overrides[name] = int(value)
+            else:
+                overrides[name] = value
+        except ValueError:
+            raise HTTPError(
+                HTTPStatus.BAD_REQUEST, f"Invalid value for '{name}': {value!r}"
+            ) from None
+
+    preset = params.get("preset", default_preset)
+    try:
+        config = default_config.replace(**overrides)
+        options = encoder_options(image_format, preset)
+    except ValueError as exc:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, str(exc)) from None
+
+    banner = Banner(
+        title=title,
+        subtitle=params.get("subtitle", ""),
+        config=config,
+        icon=params.get("icon") or None,
+    )
+    return RenderRequest(banner, image_format, preset, options)
+
+
+class BannerServer:
+    """HTTP server rendering banners on a thread pool.
+
+    ``GET /banner?title=...`` (or a POST with a JSON or form body) returns
+    the encoded image. Responses carry an ETag so clients can revalidate
+    with If-None-Match, and requests beyond ``max_in_flight`` are rejected
+    with 503 instead of queueing without bound.
+    """
+
+    def __init__(
+        self,
+        generator: BannerGenerator | None = None,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        workers: int = 4,
+        max_in_flight: int = 16,
+        preset: str | None = None,
+        max_pixels: int = 16_000_000,
+    ) -> None:
+        """Initialize the server.
+
+        Args:
+            generator: Generator whose default config and caches are used.
+            host: Interface to listen on.
+            port: Port to listen on (0 picks a free port).
+            workers: Number of rendering threads.
+            max_in_flight: Maximum concurrent renders before returning 503.
+            preset: Default encoder preset.
+            max_pixels: Largest banner (width x height) a request may ask for.
+        """
+        if workers <= 0:
+            raise ValueError("workers must be positive")
+        if max_in_flight <= 0:
+            raise ValueError("max_in_flight must be positive")
+        self.generator = generator or BannerGenerator()
+        self.host = host
+        self.port = port
+        self.max_in_flight = max_in_flight
+        self.preset = preset
+        self.max_pixels = max_pixels
+        self.in_flight = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="classbanners-render"
+        )
+        self._server: asyncio.AbstractServer | None = None
+        self._connections: set[asyncio.StreamWriter] = set()
+
+    async def start(self) -> None:
+        """Start listening for connections."""
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port
+        )
+        sockets = self._server.sockets or ()
+        if sockets:
+            self.port = sockets[0].getsockname()[1]
+        logger.info("Serving banners on http://%s:%d/banner", self.host, self.port)
+
+    async def serve_forever(self) -> None:
+        """Start the server (if needed) and serve until cancelled."""
+        if self._server is None:
+            await self.start()
+        assert self._server is not None
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """Stop listening and shut down the render threads."""
+        if self._server is not None:
+            self._server.close()
+            # Idle keep-alive connections would otherwise hold wait_closed().
+            for writer in list(self._connections):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+        self._executor.shutdown(wait=False)
+
+    def _render(self, request: RenderRequest) -> bytes:
+        """Render and encode a banner (runs on the thread pool)."""
+        if request.image_format == "SVG":
+            return self.generator.generate_svg(request.banner).encode("utf-8")
+        self.generator.generate(request.banner)
+        return request.banner.to_bytes(request.image_format, **request.options)
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self._connections.add(writer)
+        try:
+            keep_alive = True
+            while keep_alive:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    break
+                except asyncio.LimitOverrunError:
+                    await self._send_error(
+                        writer, HTTPError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE)
+                    )
+                    break
+                if len(head) > _MAX_HEADER_BYTES:
+                    await self._send_error(
+                        writer, HTTPError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE)
+                    )
+                    break
+                keep_alive = await self._handle_request(head, reader, writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+    async def _handle_request(
+        self,
+        head: bytes,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> bool:
+        """Handle one request; return whether to keep the connection open."""
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, version = lines[0].split(" ", 2)
+        except ValueError:
+            await self._send_error(writer, HTTPError(HTTPStatus.BAD_REQUEST))
+            return False
+        headers: dict[str, str] = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+
+        connection = headers.get("connection", "").lower()
+        keep_alive = (
+            connection == "keep-alive"
+            if version == "HTTP/1.0"
+            else connection != "close"
+        )
+
+        try:
+            body = await self._read_body(headers, reader)
+        except HTTPError as exc:
+            # The unread body would be parsed as the next request.
+            await self._send_error(writer, exc)
+            return False
+        try:
+            status, response_headers, payload = await self._dispatch(
+                method, target, headers, body
+            )
+        except HTTPError as exc:
+            await self._send_error(writer, exc, keep_alive)
+            return keep_alive
+        except Exception:
+            logger.exception("Failed to render %s", target)
+            await self._send_error(
+                writer, HTTPError(HTTPStatus.INTERNAL_SERVER_ERROR), keep_alive
+            )
+            return keep_alive
+
+        await self._send(writer, status, response_headers, payload, keep_alive)
+        return keep_alive
+
+    async def _read_body(
+        self, headers: dict[str, str], reader: asyncio.StreamReader
+    ) -> bytes:
+        try:
+            length = int(headers.get("content-length", "0"))
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length") from None
+        if length < 0:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+        if length > _MAX_BODY_BYTES:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+        return await reader.readexactly(length) if length else b""
+
+    async def _dispatch(
+        self, method: str, target: str, headers: dict[str, str], body: bytes
+    ) -> tuple[HTTPStatus, dict[str, str], bytes]:
+        url = urlsplit(target)
+        path = url.path.rstrip("/")
+        if path != "/banner" and not path.startswith("/banner."):
+            raise HTTPError(HTTPStatus.NOT_FOUND)
+        if method not in ("GET", "HEAD", "POST"):
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED)
+
+        params = dict(parse_qsl(url.query))
+        if path.startswith("/banner."):
+            params.setdefault("format", path.split(".", 1)[1])
+        if method == "POST" and body:
+            params.update(self._parse_body(headers, body))
+
+        request = parse_render_request(
+            params, self.generator.default_config, self.preset
+        )
+        config = request.banner.config
+        if config.width * config.height > self.max_pixels:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Requested banner is too large")
+        # Text and icons larger than the banner cost time and memory but
+        # cannot be shown.
+        for name in ("font_size", "icon_size"):
+            if getattr(config, name) > config.height:
+                raise HTTPError(
+                    HTTPStatus.BAD_REQUEST,
+                    f"{name} cannot exceed the banner height ({config.height})",
+                )
+
+        if self.in_flight >= self.max_in_flight:
+            raise HTTPError(HTTPStatus.SERVICE_UNAVAILABLE, "Server busy, retry later")
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            # The ETag hashes the font and icon files, so it is computed on
+            # the render threads rather than on the event loop.
+            etag = await loop.run_in_executor(
+                self._executor, request.etag, self.generator.icons
+            )
+            response_headers = {"ETag": etag}
+            if_none_match = headers.get("if-none-match", "").split(",")
+            if etag in (tag.strip() for tag in if_none_match):
+                return HTTPStatus.NOT_MODIFIED, response_headers, b""
+            payload = await loop.run_in_executor(self._executor, self._render, request)
+        except ValueError as exc:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, str(exc)) from None
+        finally:
+            self.in_flight -= 1
+
+        response_headers["Content-Type"] = _CONTENT_TYPES[request.image_format]
+        if method == "HEAD":
+            response_headers["Content-Length"] = str(len(payload))
+            payload = b""
+        return HTTPStatus.OK, response_headers, payload
+
+    @staticmethod
+    def _parse_body(headers: dict[str, str], body: bytes) -> dict[str, str]:
+        content_type = headers.get("content-type", "").split(";")[0].strip()
+        try:
+            if content_type == "application/json":
+                data = json.loads(body)
+                if not isinstance(data, dict):
+                    raise ValueError("JSON body must be an object")
+                return {key: str(value) for key, value in data.items()}
+            return dict(parse_qsl(body.decode("utf-8")))
+        except (ValueError, UnicodeDecodeError) as exc:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"Invalid body: {exc}") from None
+
+    async def _send_error(
+        self,
+        writer: asyncio.StreamWriter,
+        error: HTTPError,
+        keep_alive: bool = False,
+    ) -> None:
+        headers = {"Content-Type": "text/plain; charset=utf-8"}
+        if error.status == HTTPStatus.SERVICE_UNAVAILABLE:
+            headers["Retry-After"] = "1"
+        payload = (error.message + "\n").encode("utf-8")
+        await self._send(writer, error.status, headers, payload, keep_alive)
+
+    @staticmethod
+    async def _send(
+        writer: asyncio.StreamWriter,
+        status: HTTPStatus,
+        headers: dict[str, str],
+        payload: bytes,
+        keep_alive: bool,
+    ) -> None:
+        headers.setdefault("Content-Length", str(len(payload)))
+        headers["Connection"] = "keep-alive" if keep_alive else "close"
+        head = f"HTTP/1.1 {status.value} {status.phrase}\r\n" + "".join(
+            f"{name}: {value}\r\n" for name, value in headers.items()
+        )
+        writer.write(head.encode("latin-1") + b"\r\n" + payload)
+        await writer.drain()
+
+
+def serve(server: BannerServer) -> None:
+    """Run ``server`` until interrupted."""
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,324 @@
+"""Incremental PNG and TIFF writers for banners rendered in strips.
+
+Very large print banners are rendered as horizontal strips (see
+:meth:`BannerGenerator.render_strips`). The writers here encode each strip
+as it arrives, so peak memory is bounded by the strip height rather than
+by the full image.
+"""
+
+from __future__ import annotations
+
+import struct
+import zlib
+from collections.abc import Sequence
+from typing import IO, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+DEFAULT_STRIP_HEIGHT = 256
+
+#: Image formats that can be written strip by strip.
+STRIP_FORMATS = ("PNG", "TIFF")
+
+# Encoded PNG data is flushed as an IDAT chunk once this much is buffered.
+_IDAT_SIZE = 256 * 1024
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_PNG_COLOR_TYPES = {"L": 0, "P": 3, "RGB": 2, "RGBA": 6}
+_CHANNELS = {"L": 1, "P": 1, "RGB": 3, "RGBA": 4}
+
+
+class StripWriter:
+    """Base class of the incremental writers.
+
+    Strips must be written top to bottom, all with the writer's mode and
+    width, and together cover exactly the image height.
+    """
+
+    def __init__(
+        self,
+        fp: IO[bytes],
+        width: int,
+        height: int,
+        mode: str = "RGB",
+        palette: Sequence[int] | None = None,
+    ) -> None:
+        """Initialize the writer.
+
+        Args:
+            fp: Binary file object to write to.
+            width: Image width in pixels.
+            height: Image height in pixels.
+            mode: Pillow image mode of the strips ('L', 'P', 'RGB' or 'RGBA').
+            palette: Flat RGB palette, required for 'P' mode.
+
+        Raises:
+            ValueError: If the size or mode is not supported.
+        """
+        if width <= 0 or height <= 0:
+            raise ValueError("Image size must be positive")
+        if mode not in _CHANNELS:
+            raise ValueError(f"Unsupported strip mode '{mode}'")
+        if (mode == "P") != (palette is not None):
+            raise ValueError("A palette is required for, and only for, 'P' mode")
+        if palette is not None and (len(palette) % 3 or len(palette) > 768):
+            raise ValueError("Palette must hold at most 256 RGB entries")
+        self.fp = fp
+        self.width = width
+        self.height = height
+        self.mode = mode
+        self.palette = list(palette) if palette is not None else None
+        self.rows_written = 0
+
+    def write(self, strip: Image.Image) -> None:
+        """Encode and write the next strip.
+
+        Raises:
+            ValueError: If the strip does not match the image or would run
+                past its bottom edge.
+        """
+        if strip.mode != self.mode or strip.width != self.width:
+            raise ValueError(
+                f"Expected a {self.mode} strip {self.width} pixels wide, "
+                f"got {strip.mode} {strip.width}x{strip.height}"
+            )
+        if self.rows_written + strip.height > self.height:
+            raise ValueError("Strips extend past the bottom of the image")
+        self._write_rows(strip.tobytes(), strip.height)
+        self.rows_written += strip.height
+
+    def close(self) -> None:
+        """Finish the file.
+
+        Raises:
+            ValueError: If fewer rows than the image height were written.
+        """
+        if self.rows_written != self.height:
+            raise ValueError(
+                f"Only {self.rows_written} of {self.height} rows were written"
+            )
+        self._finish()
+
+    def _write_rows(self, data: bytes, rows: int) -> None:
+        raise NotImplementedError
+
+    def _finish(self) -> None:
+        raise NotImplementedError
+
+
+class PNGStripWriter(StripWriter):
+    """Streams rows through a single zlib stream into IDAT chunks.
+
+    Rows are stored with PNG filter type 0, so no previous row has to be
+    kept around; flat banner backgrounds still deflate well.
+    """
+
+    def __init__(
+        self,
+        fp: IO[bytes],
+        width: int,
+        height: int,
+        mode: str = "RGB",
+        palette: Sequence[int] | None = None,
+        compress_level: int = 6,
+    ) -> None:
+        """Initialize the writer and write the PNG header.
+
+        Args:
+            fp: Binary file object to write to.
+            width: Image width in pixels.
+            height: Image height in pixels.
+            mode: Pillow image mode of the strips ('L', 'P', 'RGB' or 'RGBA').
+            palette: Flat RGB palette, required for 'P' mode.
+            compress_level: zlib compression level (0-9).
+        """
+        super().__init__(fp, width, height, mode, palette)
+        self._compressor = zlib.compressobj(compress_level)
+        self._pending: list[bytes] = []
+        self._pending_size = 0
+        self._row_bytes = width * _CHANNELS[mode]
+        fp.write(_PNG_SIGNATURE)
+        header = struct.pack(
+            ">IIBBBBB", width, height, 8, _PNG_COLOR_TYPES[mode], 0, 0, 0
+        )
+        self._chunk(b"IHDR", header)
+        if self.palette is not None:
+            self._chunk(b"PLTE", bytes(self.palette))
+
+    def _write_rows(self, data: bytes, rows: int) -> None:
+        row_bytes = self._row_bytes
+        filtered = b"".join(
+            b"\x00" + data[offset : offset + row_bytes]
+            for offset in range(0, rows * row_bytes, row_bytes)
+        )
+        self._buffer(self._compressor.compress(filtered))
+
+    def _finish(self) -> None:
+        self._buffer(self._compressor.flush())
+        self._flush_idat()
+        self._chunk(b"IEND", b"")
+
+    def _buffer(self, data: bytes) -> None:
+        if not data:
+            return
+        self._pending.append(data)
+        self._pending_size += len(data)
+        if self._pending_size >= _IDAT_SIZE:
+            self._flush_idat()
+
+    def _flush_idat(self) -> None:
+        if self._pending:
+            self._chunk(b"IDAT", b"".join(self._pending))
+            self._pending = []
+            self._pending_size = 0
+
+    def _chunk(self, tag: bytes, data: bytes) -> None:
+        self.fp.write(struct.pack(">I", len(data)) + tag + data)
+        self.fp.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(tag))))
+
+
+# TIFF tag types.
+_SHORT = 3
+_LONG = 4
+
+_TIFF_DEFLATE = 8
+_TIFF_PHOTOMETRIC = {"L": 1, "P": 3, "RGB": 2, "RGBA": 2}
+
+
+class TIFFStripWriter(StripWriter):
+    """Writes each strip as one deflate-compressed TIFF strip.
+
+    The image file directory is written after the strips, so the file
+    object must be seekable to patch its offset into the header.
+    """
+
+    def __init__(
+        self,
+        fp: IO[bytes],
+        width: int,
+        height: int,
+        mode: str = "RGB",
+        palette: Sequence[int] | None = None,
+        compress_level: int = 6,
+    ) -> None:
+        """Initialize the writer and write the TIFF header.
+
+        Args:
+            fp: Seekable binary file object to write to.
+            width: Image width in pixels.
+            height: Image height in pixels.
+            mode: Pillow image mode of the strips ('L', 'P', 'RGB' or 'RGBA').
+            palette: Flat RGB palette, required for 'P' mode.
+            compress_level: zlib compression level (0-9).
+        """
+        super().__init__(fp, width, height, mode, palette)
+        self.compress_level = compress_level
+        self._start = fp.tell()
+        self._strip_offsets: list[int] = []
+        self._strip_sizes: list[int] = []
+        self._rows_per_strip = 0
+        # Little-endian header; the IFD offset is patched in by close().
+        fp.write(b"II*\x00" + struct.pack("<I", 0))
+        self._offset = 8
+
+    def _write_rows(self, data: bytes, rows: int) -> None:
+        # RowsPerStrip is a single value: every strip but the last must
+        # have the height of the first.
+        if not self._strip_sizes:
+            self._rows_per_strip = rows
+        elif (
+            rows > self._rows_per_strip
+            or self.rows_written != len(self._strip_sizes) * self._rows_per_strip
+        ):
+            raise ValueError("Only the last TIFF strip may be shorter than the first")
+        compressed = zlib.compress(data, self.compress_level)
+        self._strip_offsets.append(self._offset)
+        self._strip_sizes.append(len(compressed))
+        self.fp.write(compressed)
+        self._offset += len(compressed)
+
+    def _finish(self) -> None:
+        channels = _CHANNELS[self.mode]
+        # Out-of-line values go right after the strips, then the IFD; both
+        # must start on a word boundary.
+        extra = bytearray(self._offset % 2)
+
+        def out_of_line(fmt: str, values: list[int]) -> int:
+            offset = self._offset + len(extra)
+            extra.extend(struct.pack(f"<{len(values)}{fmt}", *values))
+            if len(extra) % 2:
+                extra.append(0)
+            return offset
+
+        def array(tag: int, kind: int, values: list[int]) -> tuple[int, int, int, int]:
+            if len(values) == 1:
+                return tag, kind, 1, values[0]
+            fmt = "H" if kind == _SHORT else "I"
+            return tag, kind, len(values), out_of_line(fmt, values)
+
+        entries = [
+            (256, _LONG, 1, self.width),
+            (257, _LONG, 1, self.height),
+            array(258, _SHORT, [8] * channels),
+            (259, _SHORT, 1, _TIFF_DEFLATE),
+            (262, _SHORT, 1, _TIFF_PHOTOMETRIC[self.mode]),
+            array(273, _LONG, self._strip_offsets),
+            (277, _SHORT, 1, channels),
+            (278, _LONG, 1, self._rows_per_strip),
+            array(279, _LONG, self._strip_sizes),
+            (284, _SHORT, 1, 1),
+        ]
+        if self.palette is not None:
+            # ColorMap: all reds, then greens, then blues, as 16-bit values
+            # for each of the 256 possible indices.
+            padded = self.palette + [0] * (768 - len(self.palette))
+            colormap = [
+                padded[index * 3 + channel] * 257
+                for channel in range(3)
+                for index in range(256)
+            ]
+            entries.append(array(320, _SHORT, colormap))
+        if self.mode == "RGBA":
+            # ExtraSamples: unassociated alpha.
+            entries.append((338, _SHORT, 1, 2))
+
+        ifd_offset = self._offset + len(extra)
+        if ifd_offset + 6 + 12 * len(entries) > 0xFFFFFFFF:
+            raise ValueError("TIFF output exceeds 4 GiB")
+        ifd = bytearray(struct.pack("<H", len(entries)))
+        for tag, kind, count, value in entries:
+            # Single SHORT values are left-justified in the 4-byte field.
+            fmt = "<HHIHxx" if kind == _SHORT and count == 1 else "<HHII"
+            ifd.extend(struct.pack(fmt, tag, kind, count, value))
+        ifd.extend(struct.pack("<I", 0))
+        self.fp.write(bytes(extra) + bytes(ifd))
+
+        end = self.fp.tell()
+        self.fp.seek(self._start + 4)
+        self.fp.write(struct.pack("<I", ifd_offset))
+        self.fp.seek(end)
+
+
+def open_strip_writer(
+    fp: IO[bytes],
+    image_format: str,
+    width: int,
+    height: int,
+    mode: str = "RGB",
+    palette: Sequence[int] | None = None,
+    compress_level: int = 6,
+) -> StripWriter:
+    """Return the incremental writer for ``image_format``.
+
+    Raises:
+        ValueError: If the format cannot be written strip by strip.
+    """
+    if image_format == "PNG":
+        return PNGStripWriter(fp, width, height, mode, palette, compress_level)
+    if image_format == "TIFF":
+        return TIFFStripWriter(fp, width, height, mode, palette, compress_level)
+    raise ValueError(
+        f"Strip rendering supports {', '.join(STRIP_FORMATS)} output, "
+        f"not '{image_format}'"
+    )
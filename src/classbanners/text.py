@@ -0,0 +1,154 @@
+"""Cache of measured and rasterized text runs."""
+
+from __future__ import annotations
+
+from collections.abc import Hashable
+from dataclasses import dataclass
+
+from PIL import Image, ImageDraw
+
+from classbanners.cache import CacheStats, LRUCache
+from classbanners.fonts import Font
+from classbanners.palette import Ink
+
+BBox = tuple[int, int, int, int]
+
+DEFAULT_TEXT_BUDGET = 32 * 1024 * 1024
+
+
+@dataclass
+class TextRun:
+    """A measured text run and its rasterized alpha mask.
+
+    The mask covers ``bbox`` (relative to the text origin) and is None for
+    runs with an empty bounding box.
+    """
+
+    text: str
+    font: Font
+    bbox: BBox
+    mask: Image.Image | None
+
+    @property
+    def width(self) -> int:
+        """Width of the run's bounding box."""
+        return self.bbox[2] - self.bbox[0]
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the alpha mask."""
+        return self.mask.width * self.mask.height if self.mask is not None else 0
+
+    def paste(
+        self, image: Image.Image, xy: tuple[int, int], color: Ink | str
+    ) -> None:
+        """Composite the run onto ``image`` with its origin at ``xy``."""
+        if self.mask is None:
+            return
+        x, y = xy
+        left, top, right, bottom = self.bbox
+        image.paste(color, (x + left, y + top, x + right, y + bottom), self.mask)
+
+
+def _font_identity(font: Font) -> Hashable:
+    """Return a hashable identity for a loaded font."""
+    path = getattr(font, "path", None)
+    if isinstance(path, str):
+        return (path, getattr(font, "index", 0), getattr(font, "size", None))
+    return id(font)
+
+
+# Scratch surface used only for measuring text.
+_measure_draw = ImageDraw.Draw(Image.new("L", (1, 1)))
+
+
+def measure_text(text: str, font: Font) -> BBox:
+    """Measure a text run without rasterizing it."""
+    left, top, right, bottom = _measure_draw.textbbox((0, 0), text, font=font)
+    return int(left), int(top), int(right), int(bottom)
+
+
+def render_text_run(text: str, font: Font) -> TextRun:
+    """Measure and rasterize a text run."""
+    bbox = measure_text(text, font)
+    left, top, right, bottom = bbox
+    if right <= left or bottom <= top:
+        return TextRun(text, font, bbox, None)
+    mask = Image.new("L", (right - left, bottom - top))
+    ImageDraw.Draw(mask).text((-left, -top), text, font=font, fill=255)
+    return TextRun(text, font, bbox, mask)
+
+
+class TextRunCache:
+    """LRU cache of text runs keyed by (text, font identity, size).
+
+    Masks are accounted against a byte budget so long unique titles cannot
+    crowd out memory.
+    """
+
+    def __init__(
+        self, max_entries: int = 1024, max_bytes: int = DEFAULT_TEXT_BUDGET
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached runs.
+            max_bytes: Memory budget for cached masks in bytes.
+        """
+        self._cache: LRUCache[Hashable, TextRun] = LRUCache(
+            max_entries=max_entries,
+            max_bytes=max_bytes,
+            sizeof=lambda run: run.nbytes,
+        )
+        # Bounding boxes measured without rasterizing, e.g. while searching
+        # for a font size that fits.
+        self._bboxes: LRUCache[Hashable, tuple[Font, BBox]] = LRUCache(
+            max_entries=max_entries * 4
+        )
+
+    @property
+    def stats(self) -> CacheStats:
+        """Hit, miss and eviction counters."""
+        return self._cache.stats
+
+    @property
+    def current_bytes(self) -> int:
+        """Memory currently used by cached masks in bytes."""
+        return self._cache.current_bytes
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def get(self, text: str, font: Font) -> TextRun:
+        """Return the run for ``text`` in ``font``, rendering it on a miss."""
+        key = (text, _font_identity(font))
+        run = self._cache.get(key)
+        # Fonts without a file path are keyed by id(); make sure the id
+        # has not been reused by a different font object.
+        if run is None or (run.font is not font and isinstance(key[1], int)):
+            run = render_text_run(text, font)
+            self._cache.put(key, run)
+        return run
+
+    def measure(self, text: str, font: Font) -> BBox:
+        """Return the bounding box of ``text`` in ``font`` without rasterizing."""
+        key = (text, _font_identity(font))
+        cached = self._bboxes.get(key)
+        if cached is not None and (cached[0] is font or not isinstance(key[1], int)):
+            return cached[1]
+        bbox = measure_text(text, font)
+        self._bboxes.put(key, (font, bbox))
+        return bbox
+
+    def clear(self) -> None:
+        """Drop all cached runs and reset the statistics."""
+        self._cache.clear()
+        self._bboxes.clear()
+
+
+_text_cache = TextRunCache()
+
+
+def get_text_cache() -> TextRunCache:
+    """Return the process-wide text run cache."""
+    return _text_cache
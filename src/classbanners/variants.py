@@ -0,0 +1,222 @@
+"""Multi-resolution variants of a banner derived from a single render."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Literal
+
+from classbanners.banner import BannerConfig
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+    from classbanners.palette import ColorPlan
+
+#: Values of ``Variant.fit``.
+VARIANT_FITS = ("pad", "crop")
+
+#: Named variant specs accepted by :func:`parse_variant`.
+VARIANT_PRESETS = {
+    "thumb": "320w",
+    "card": "1200x630",
+}
+
+_SCALE_SPEC = re.compile(r"^(\d+(?:\.\d+)?)x$")
+_WIDTH_SPEC = re.compile(r"^(\d+)w$")
+_SIZE_SPEC = re.compile(r"^(\d+)x(\d+)(?::(pad|crop))?$")
+
+
+@dataclass(frozen=True)
+class Variant:
+    """One output size of a banner.
+
+    A variant either scales the whole banner (``scale``, relative to its
+    configured size) or fills a fixed ``size`` such as a social card. Fixed
+    sizes with ``fit="pad"`` scale the banner to fit and extend its
+    background; ``fit="crop"`` scales it to cover and crops the center.
+
+    Attributes:
+        name: Name of the variant, used in output file names.
+        scale: Scale factor relative to the configured banner size.
+        size: Exact output size in pixels, instead of ``scale``.
+        fit: How a fixed ``size`` with another aspect ratio is filled.
+    """
+
+    name: str
+    scale: float = 1.0
+    size: tuple[int, int] | None = None
+    fit: Literal["pad", "crop"] = "pad"
+
+    def __post_init__(self) -> None:
+        """Validate the variant."""
+        if not self.name:
+            raise ValueError("Variant name cannot be empty")
+        if self.scale <= 0:
+            raise ValueError("Variant scale must be positive")
+        if self.size is not None and min(self.size) <= 0:
+            raise ValueError("Variant size must be positive")
+        if self.fit not in VARIANT_FITS:
+            raise ValueError(
+                f"fit must be one of {', '.join(VARIANT_FITS)}, got '{self.fit}'"
+            )
+
+    def banner_scale(self, config: BannerConfig) -> float:
+        """Return the scale the banner is drawn at in this variant."""
+        if self.size is None:
+            return self.scale
+        width, height = self.size
+        scales = (width / config.width, height / config.height)
+        return max(scales) if self.fit == "crop" else min(scales)
+
+    def output_size(self, config: BannerConfig) -> tuple[int, int]:
+        """Return the pixel size of this variant of a banner."""
+        if self.size is not None:
+            return self.size
+        return _scaled_size(config, self.scale)
+
+
+def parse_variant(spec: str, config: BannerConfig | None = None) -> Variant:
+    """Parse a variant spec.
+
+    Specs are ``2x`` (a scale), ``320w`` (a width; requires ``config``),
+    ``1200x630`` or ``1200x630:crop`` (a fixed size), or a name from
+    :data:`VARIANT_PRESETS`.
+
+    Raises:
+        ValueError: If the spec is malformed.
+    """
+    spec = spec.strip()
+    name = spec.replace(":", "-")
+    spec = VARIANT_PRESETS.get(spec, spec)
+    match = _SCALE_SPEC.match(spec)
+    if match:
+        return Variant(name, scale=float(match.group(1)))
+    match = _WIDTH_SPEC.match(spec)
+    if match:
+        if config is None:
+            raise ValueError(f"Variant '{name}' needs the banner width")
+        return Variant(name, scale=int(match.group(1)) / config.width)
+    match = _SIZE_SPEC.match(spec)
+    if match:
+        width, height, fit = match.groups()
+        return Variant(
+            name, size=(int(width), int(height)), fit="crop" if fit == "crop" else "pad"
+        )
+    raise ValueError(
+        f"Invalid size '{name}' (expected e.g. 2x, 320w, 1200x630 or one of "
+        f"{', '.join(VARIANT_PRESETS)})"
+    )
+
+
+def parse_variants(specs: str, config: BannerConfig | None = None) -> list[Variant]:
+    """Parse a comma-separated list of variant specs.
+
+    Raises:
+        ValueError: If a spec is malformed or names repeat.
+    """
+    variants = [
+        parse_variant(spec, config) for spec in specs.split(",") if spec.strip()
+    ]
+    if not variants:
+        raise ValueError("No sizes given")
+    names = [variant.name for variant in variants]
+    if len(set(names)) != len(names):
+        raise ValueError("Sizes must be unique")
+    return variants
+
+
+def variant_path(path: Path | str, variant: Variant) -> Path:
+    """Return the output path of a variant, e.g. ``banner@2x.png``.
+
+    The ``1x`` variant keeps the plain path.
+    """
+    path = Path(path)
+    if variant.name == "1x":
+        return path
+    return path.with_name(f"{path.stem}@{variant.name}{path.suffix}")
+
+
+def _scaled_size(config: BannerConfig, scale: float) -> tuple[int, int]:
+    return max(1, round(config.width * scale)), max(1, round(config.height * scale))
+
+
+def scale_config(config: BannerConfig, scale: float) -> BannerConfig:
+    """Return ``config`` with every pixel measurement multiplied by ``scale``."""
+    if scale == 1:
+        return config
+    width, height = _scaled_size(config, scale)
+    return config.replace(
+        width=width,
+        height=height,
+        font_size=max(1, round(config.font_size * scale)),
+        padding=round(config.padding * scale),
+        border_width=round(config.border_width * scale),
+        icon_size=round(config.icon_size * scale),
+    )
+
+
+def master_scale(config: BannerConfig, variants: list[Variant]) -> float:
+    """Return the scale to render at so every variant is a downsample."""
+    return max(variant.banner_scale(config) for variant in variants)
+
+
+def _resample(image: Image.Image, size: tuple[int, int]) -> Image.Image:
+    """Downsample ``image`` to ``size``, with a fast path for integer factors."""
+    from PIL import Image
+
+    if image.size == size:
+        return image
+    source = image
+    if image.mode == "P":
+        # Index == text coverage: resample the indices as a gray plane.
+        source = Image.frombytes("L", image.size, image.tobytes())
+
+    factor_x, remainder_x = divmod(image.width, size[0])
+    factor_y, remainder_y = divmod(image.height, size[1])
+    if remainder_x == remainder_y == 0:
+        resized = source.reduce((factor_x, factor_y))
+    else:
+        resized = source.resize(size, Image.Resampling.LANCZOS)
+
+    if source is not image:
+        resized = Image.frombytes("P", size, resized.tobytes())
+        resized.putpalette(image.getpalette() or [])
+    return resized
+
+
+def derive_variant(
+    master: Image.Image,
+    config: BannerConfig,
+    variant: Variant,
+    colors: ColorPlan,
+) -> Image.Image:
+    """Derive a variant from a banner rendered at :func:`master_scale`.
+
+    Args:
+        master: The rendered banner.
+        config: The banner's configuration at 1x.
+        variant: The variant to derive.
+        colors: The color plan ``master`` was drawn with.
+    """
+    from PIL import Image
+
+    size = _scaled_size(config, variant.banner_scale(config))
+    scaled = _resample(master, size)
+    if variant.size is None or scaled.size == variant.size:
+        return scaled
+    width, height = variant.size
+    left = (scaled.width - width) // 2
+    top = (scaled.height - height) // 2
+    if variant.fit == "crop":
+        return scaled.crop((left, top, left + width, top + height))
+    if scaled.mode == master.mode:
+        background = colors.background
+    else:
+        background = config.background_rgba[:3]
+    card = Image.new(scaled.mode, variant.size, background)
+    if scaled.mode == "P":
+        card.putpalette(scaled.getpalette() or [])
+    card.paste(scaled, (-left, -top))
+    return card
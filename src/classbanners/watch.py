@@ -0,0 +1,194 @@
+"""Watch a manifest and re-render only the entries that change."""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Union
+
+from classbanners.banner import Banner, BannerConfig
+from classbanners.generator import BannerGenerator
+from classbanners.manifest import DEFAULT_TEMPLATE, format_output_name, read_manifest
+
+DEFAULT_INTERVAL = 0.5
+DEFAULT_DEBOUNCE = 0.25
+
+# What an output depends on: title, subtitle, effective config and icon.
+EntryKey = tuple[str, str, BannerConfig, Union[str, None]]
+
+
+@dataclass
+class SyncReport:
+    """Summary of one pass over the manifest."""
+
+    rendered: list[Path] = field(default_factory=list)
+    removed: list[Path] = field(default_factory=list)
+    unchanged: int = 0
+    errors: list[str] = field(default_factory=list)
+    duration: float = 0.0
+
+
+class ManifestWatcher:
+    """Keeps a directory of banners in sync with a manifest.
+
+    Each :meth:`sync` compares the parsed manifest with the previous pass
+    and renders only the entries whose title, subtitle, icon or effective
+    configuration changed (or whose output went missing), and deletes the
+    outputs of entries that were removed. Rendering happens in-process on
+    one generator, so its fonts, canvases and text runs stay warm between
+    passes.
+    """
+
+    def __init__(
+        self,
+        manifest: Path | str,
+        output: Path | str,
+        generator: BannerGenerator | None = None,
+        template: str = DEFAULT_TEMPLATE,
+        preset: str | None = None,
+        interval: float = DEFAULT_INTERVAL,
+        debounce: float = DEFAULT_DEBOUNCE,
+    ) -> None:
+        """Initialize the watcher.
+
+        Args:
+            manifest: Manifest file to watch.
+            output: Directory the banners are written to.
+            generator: Generator to render with; its default config is the
+                base of every entry.
+            template: Output filename template.
+            preset: Encoder preset.
+            interval: Seconds between checks of the manifest.
+            debounce: Seconds the manifest must stay unchanged before a
+                pass, so a save in progress is not read half-written.
+        """
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        if debounce < 0:
+            raise ValueError("debounce cannot be negative")
+        self.manifest = Path(manifest)
+        self.output = Path(output)
+        self.generator = generator if generator is not None else BannerGenerator()
+        self.template = template
+        self.preset = preset
+        self.interval = interval
+        self.debounce = debounce
+        # Outputs written by previous passes and what they were rendered from.
+        self._state: dict[Path, EntryKey] = {}
+
+    def sync(self) -> SyncReport:
+        """Bring the output directory up to date with the manifest.
+
+        Raises:
+            OSError: If the manifest cannot be read.
+            ValueError: If the manifest cannot be parsed; no output is
+                touched in that case.
+        """
+        start = time.perf_counter()
+        report = SyncReport()
+        base_config = self.generator.default_config
+        wanted: dict[Path, EntryKey] = {}
+        pending: list[tuple[Path, Banner]] = []
+        for entry in read_manifest(self.manifest):
+            try:
+                path = self.output / format_output_name(self.template, entry)
+            except (KeyError, ValueError) as exc:
+                report.errors.append(entry.describe(exc))
+                continue
+            try:
+                config = entry.config(base_config)
+            except ValueError as exc:
+                report.errors.append(entry.describe(exc))
+                # Keep the last good output of an entry being edited.
+                if path in self._state:
+                    wanted[path] = self._state[path]
+                continue
+            key = (entry.title, entry.subtitle, config, entry.icon)
+            wanted[path] = key
+            if self._state.get(path) == key and path.exists():
+                report.unchanged += 1
+            else:
+                pending.append((path, Banner(*key)))
+
+        state = {path: key for path, key in self._state.items() if path in wanted}
+        results = self.generator.generate_many(
+            [banner for _, banner in pending], jobs=1
+        )
+        for result in results:
+            path, banner = pending[result.index]
+            try:
+                if result.banner is None:
+                    raise ValueError(str(result.error))
+                result.banner.save(path, preset=self.preset)
+            except (ValueError, OSError) as exc:
+                # Keep what the last good output was rendered from, so the
+                # entry is retried and its output still removed with it.
+                report.errors.append(f"{banner.title}: {exc}")
+                continue
+            state[path] = wanted[path]
+            report.rendered.append(path)
+
+        for path in self._state.keys() - wanted.keys():
+            try:
+                path.unlink(missing_ok=True)
+            except OSError as exc:
+                report.errors.append(f"{path}: {exc}")
+                continue
+            report.removed.append(path)
+
+        self._state = state
+        report.duration = time.perf_counter() - start
+        return report
+
+    def run(
+        self,
+        on_sync: Callable[[SyncReport], None] | None = None,
+        stop: threading.Event | None = None,
+    ) -> None:
+        """Sync now and again after every change to the manifest.
+
+        The manifest is polled every ``interval`` seconds. A pass that
+        fails to read the manifest (e.g. while it is invalid JSON) is
+        reported with the error and the outputs are left as they are.
+
+        Args:
+            on_sync: Called with the report of every pass.
+            stop: Event that ends the loop once set (default: run until
+                interrupted).
+        """
+        if stop is None:
+            stop = threading.Event()
+        seen: tuple[int, int] | None = None
+        first = True
+        while not stop.is_set():
+            stamp = self._stamp()
+            if first or stamp != seen:
+                # Wait until the file has stopped changing.
+                while self.debounce and not stop.wait(self.debounce):
+                    settled = self._stamp()
+                    if settled == stamp:
+                        break
+                    stamp = settled
+                if stop.is_set():
+                    return
+                first = False
+                seen = stamp
+                try:
+                    report = self.sync()
+                except (OSError, ValueError) as exc:
+                    report = SyncReport(errors=[f"{self.manifest}: {exc}"])
+                if on_sync is not None:
+                    on_sync(report)
+            stop.wait(self.interval)
+
+    def _stamp(self) -> tuple[int, int] | None:
+        """Return the manifest's modification time and size, if it exists."""
+        try:
+            stat = os.stat(self.manifest)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
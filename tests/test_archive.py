@@ -0,0 +1,80 @@
+"""Tests for the archive sinks."""
+
+import io
+import tarfile
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from classbanners.archive import TarSink, ZipSink, is_archive_path, open_archive
+from classbanners.banner import Banner
+from classbanners.generator import BannerGenerator
+from classbanners.pipeline import BannerPipeline
+
+
+class TestZipSink:
+    """Tests for ZipSink."""
+
+    def test_images_are_stored_others_deflated(self) -> None:
+        """Test that compressed formats are stored without deflating."""
+        buffer = io.BytesIO()
+        with ZipSink(buffer) as sink:
+            sink.write(Path("banners/01-intro.png"), b"png bytes")
+            sink.write(Path("index.json"), b"{}" * 100)
+
+        with zipfile.ZipFile(buffer) as archive:
+            png = archive.getinfo("banners/01-intro.png")
+            assert png.compress_type == zipfile.ZIP_STORED
+            assert archive.read(png) == b"png bytes"
+            assert archive.getinfo("index.json").compress_type == zipfile.ZIP_DEFLATED
+
+    def test_duplicate_entries_are_rejected(self) -> None:
+        """Test that writing the same name twice raises ValueError."""
+        with ZipSink(io.BytesIO()) as sink:
+            sink.write(Path("a.png"), b"1")
+            with pytest.raises(ValueError, match="Duplicate archive entry 'a.png'"):
+                sink.write(Path("a.png"), b"2")
+
+
+class TestTarSink:
+    """Tests for TarSink."""
+
+    def test_entries_round_trip(self) -> None:
+        """Test that entries are written in order with their contents."""
+        buffer = io.BytesIO()
+        with TarSink(buffer) as sink:
+            sink.write(Path("a.png"), memoryview(b"first"))
+            sink.write(Path("b.png"), b"second")
+        buffer.seek(0)
+
+        with tarfile.open(fileobj=buffer) as archive:
+            assert archive.getnames() == ["a.png", "b.png"]
+            member = archive.extractfile("a.png")
+            assert member is not None
+            assert member.read() == b"first"
+
+
+class TestOpenArchive:
+    """Tests for open_archive."""
+
+    def test_suffixes(self, tmp_path: Path) -> None:
+        """Test archive detection and unsupported suffixes."""
+        assert is_archive_path("banners.ZIP")
+        assert is_archive_path("banners.tar")
+        assert not is_archive_path("banners")
+        with pytest.raises(ValueError, match="Unsupported archive"):
+            open_archive(tmp_path / "banners.rar")
+
+    def test_pipeline_streams_into_zip(self, tmp_path: Path) -> None:
+        """Test that a pipelined batch is written straight into a zip."""
+        path = tmp_path / "nested" / "banners.zip"
+        items = [(Banner(f"Topic {i}"), Path(f"{i:02d}.png")) for i in range(5)]
+        with open_archive(path) as sink:
+            results = list(BannerPipeline(BannerGenerator(), sink=sink).run(items))
+
+        assert all(result.ok for result in results)
+        assert sorted(path.parent.iterdir()) == [path]
+        with zipfile.ZipFile(path) as archive:
+            assert sorted(archive.namelist()) == [f"{i:02d}.png" for i in range(5)]
+            assert archive.read("00.png").startswith(b"\x89PNG")
@@ -0,0 +1,94 @@
+"""Tests for sprite-sheet atlas output."""
+
+import json
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from classbanners.atlas import pack_shelves
+from classbanners.banner import BannerConfig
+from classbanners.generator import BannerGenerator
+
+SMALL = BannerConfig(width=200, height=50, font_size=20)
+
+
+def _items(titles: list[str]) -> list[tuple[str, tuple[str, str, BannerConfig]]]:
+    return [(str(i + 1), (title, "", SMALL)) for i, title in enumerate(titles)]
+
+
+class TestPackShelves:
+    """Tests for the shelf packer."""
+
+    def test_fills_shelves_then_sheets(self) -> None:
+        """Test placement across shelves and sheets."""
+        placements = pack_shelves([(60, 10)] * 5, max_width=120, max_height=20)
+        assert placements == [
+            (0, 0, 0),
+            (0, 60, 0),
+            (0, 0, 10),
+            (0, 60, 10),
+            (1, 0, 0),
+        ]
+
+    def test_tallest_first(self) -> None:
+        """Test that taller rectangles open the first shelf."""
+        placements = pack_shelves([(10, 5), (10, 20)], max_width=100, max_height=100)
+        assert placements == [(0, 10, 0), (0, 0, 0)]
+
+    def test_oversized_raises_error(self) -> None:
+        """Test that rectangles larger than a sheet raise ValueError."""
+        with pytest.raises(ValueError, match="does not fit"):
+            pack_shelves([(200, 10)], max_width=100, max_height=100)
+
+
+class TestGenerateAtlas:
+    """Tests for BannerGenerator.generate_atlas."""
+
+    def test_builds_sheets_and_index(self, tmp_path: Path) -> None:
+        """Test that banners are packed and indexed by id."""
+        generator = BannerGenerator()
+        report = generator.generate_atlas(
+            _items(["One", "Two", "Three"]), tmp_path, max_size=(400, 50)
+        )
+
+        assert report.rendered == 3
+        assert len(report.sheets_written) == 2
+        index = json.loads((tmp_path / "atlas.json").read_text())
+        assert index["sheets"] == ["atlas-0.png", "atlas-1.png"]
+        slot = index["banners"]["2"]
+        assert (slot["sheet"], slot["x"], slot["y"]) == (0, 200, 0)
+
+        sheet = Image.open(tmp_path / "atlas-0.png")
+        expected = generator.create_banner("Two", "", SMALL).image
+        assert expected is not None
+        region = sheet.crop((200, 0, 400, 50)).convert("RGB")
+        assert region.tobytes() == expected.convert("RGB").tobytes()
+
+    def test_updates_only_changed_region(self, tmp_path: Path) -> None:
+        """Test that changing one banner re-renders only that banner."""
+        generator = BannerGenerator()
+        generator.generate_atlas(_items(["One", "Two", "Three"]), tmp_path, max_size=(400, 50))
+
+        report = generator.generate_atlas(
+            _items(["One", "Two", "Changed"]), tmp_path, max_size=(400, 50)
+        )
+        assert report.rendered == 1
+        assert report.reused == 2
+        assert [p.name for p in report.sheets_written] == ["atlas-1.png"]
+        index = json.loads((tmp_path / "atlas.json").read_text())
+        assert index["banners"]["3"]["title"] == "Changed"
+
+    def test_unchanged_atlas_writes_nothing(self, tmp_path: Path) -> None:
+        """Test that an unchanged batch re-encodes no sheets."""
+        generator = BannerGenerator()
+        generator.generate_atlas(_items(["One"]), tmp_path)
+        report = generator.generate_atlas(_items(["One"]), tmp_path)
+        assert report.rendered == 0
+        assert report.sheets_written == []
+
+    def test_duplicate_ids_raise_error(self, tmp_path: Path) -> None:
+        """Test that banner ids must be unique."""
+        items = [("1", ("A",)), ("1", ("B",))]
+        with pytest.raises(ValueError, match="unique"):
+            BannerGenerator().generate_atlas(items, tmp_path)
@@ -1,6 +1,10 @@
 """Tests for Banner and BannerConfig classes."""
 
+import dataclasses
+import pickle
+
 import pytest
+from PIL import Image
 
 from classbanners.banner import Banner, BannerConfig
 
@@ -75,6 +79,23 @@ class TestBannerConfig:
         with pytest.raises(ValueError, match="border_color must be a valid hex color"):
             BannerConfig(border_color="#GGG")
 
+    def test_invalid_color_mode_raises_error(self) -> None:
+        """Test that unknown color modes raise ValueError."""
+        with pytest.raises(ValueError, match="color_mode must be one of auto, rgb"):
+            BannerConfig(color_mode="cmyk")  # type: ignore[arg-type]
+
+    def test_invalid_fit_raises_error(self) -> None:
+        """Test that unknown fit modes raise ValueError."""
+        with pytest.raises(ValueError, match="fit must be one of none, shrink"):
+            BannerConfig(fit="grow")  # type: ignore[arg-type]
+
+    def test_invalid_background_fill_raises_error(self) -> None:
+        """Test that malformed fills and fill colors raise ValueError."""
+        with pytest.raises(ValueError, match="background_fill must be one of"):
+            BannerConfig(background_fill="plaid")
+        with pytest.raises(ValueError, match="fill_color"):
+            BannerConfig(background_fill="linear", fill_color="navy")
+
     def test_valid_short_hex_colors(self) -> None:
         """Test that short hex colors are accepted."""
         config = BannerConfig(background_color="#ABC", text_color="#FFF")
@@ -88,6 +109,85 @@ class TestBannerConfig:
         assert config.text_color == "#00FF00AA"
 
 
+class TestImmutableConfig:
+    """Tests for the frozen, hashable BannerConfig."""
+
+    def test_config_is_frozen(self) -> None:
+        """Test that fields cannot be reassigned."""
+        config = BannerConfig()
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            config.width = 100  # type: ignore[misc]
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            config.extra = 1  # type: ignore[attr-defined]
+
+    def test_config_uses_slots(self) -> None:
+        """Test that configs carry no per-instance __dict__."""
+        assert not hasattr(BannerConfig(), "__dict__")
+
+    def test_equal_configs_hash_equal(self) -> None:
+        """Test that configs can key dictionaries."""
+        cache = {BannerConfig(width=900): "wide"}
+        assert cache[BannerConfig(width=900)] == "wide"
+        assert BannerConfig() != BannerConfig(width=900)
+
+    def test_colors_are_parsed(self) -> None:
+        """Test that colors are available as RGBA tuples."""
+        config = BannerConfig(
+            background_color="#4A90D9", text_color="#FFF8", border_color="#00FF0080"
+        )
+        assert config.background_rgba == (0x4A, 0x90, 0xD9, 255)
+        assert config.text_rgba == (255, 255, 255, 0x88)
+        assert config.border_rgba == (0, 255, 0, 0x80)
+
+    def test_replace_applies_changes(self) -> None:
+        """Test that replace returns a validated, changed copy."""
+        config = BannerConfig()
+        wide = config.replace(width=1200, text_color="#000")
+
+        assert (wide.width, wide.text_color) == (1200, "#000")
+        assert config.width == 800
+        assert config.replace() is config
+
+    def test_replace_interns_results(self) -> None:
+        """Test that equal replaced configs are the same object."""
+        base = BannerConfig()
+        assert base.replace(font_size=31) is base.replace(font_size=31)
+
+    def test_construction_interns_results(self) -> None:
+        """Test that equal constructed configs are the same object."""
+        config = BannerConfig(width=640, text_color="#000")
+
+        assert BannerConfig(width=640, text_color="#000") is config
+        assert BannerConfig().replace(width=640, text_color="#000") is config
+        assert dataclasses.replace(config) is config
+        assert BannerConfig(width=641) is not config
+
+    def test_replace_validates(self) -> None:
+        """Test that replace raises the constructor's errors."""
+        with pytest.raises(ValueError, match="Width must be positive"):
+            BannerConfig().replace(width=0)
+        with pytest.raises(TypeError, match="Unknown BannerConfig field 'colour'"):
+            BannerConfig().replace(colour="#FFF")
+
+    def test_pickle_round_trip_is_interned(self) -> None:
+        """Test that unpickled configs are equal and shared."""
+        config = BannerConfig(width=1234).intern()
+
+        assert pickle.loads(pickle.dumps(config)) is config
+        other = pickle.loads(pickle.dumps(BannerConfig(width=4321)))
+        assert other == BannerConfig(width=4321)
+        assert other.background_rgba == (0x4A, 0x90, 0xD9, 255)
+
+    def test_dataclass_helpers_still_work(self) -> None:
+        """Test backward compatibility with dataclasses.replace and asdict."""
+        config = dataclasses.replace(BannerConfig(), height=300)
+
+        assert config.height == 300
+        assert dataclasses.asdict(config)["height"] == 300
+        with pytest.raises(ValueError, match="Height must be positive"):
+            dataclasses.replace(config, height=0)
+
+
 class TestBanner:
     """Tests for Banner dataclass."""
 
@@ -122,3 +222,12 @@ class TestBanner:
         banner = Banner(title="Test")
         with pytest.raises(ValueError, match="No image to show"):
             banner.show()
+
+    def test_release_drops_image(self) -> None:
+        """Test that release() frees the image, after which save fails."""
+        banner = Banner(title="Test")
+        banner._image = Image.new("RGB", (10, 10))
+        banner.release()
+        assert banner.image is None
+        with pytest.raises(ValueError, match="No image to save"):
+            banner.save("test.png")
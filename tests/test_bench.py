@@ -0,0 +1,108 @@
+"""Tests for the benchmark suite's regression checks."""
+
+import importlib.util
+import json
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+import pytest
+
+BENCH_PATH = Path(__file__).resolve().parent.parent / "benchmarks" / "bench.py"
+
+
+@pytest.fixture(scope="module")
+def bench() -> ModuleType:
+    """Load benchmarks/bench.py, which is a script rather than a package."""
+    spec = importlib.util.spec_from_file_location("bench", BENCH_PATH)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _report(**results: dict[str, Any]) -> dict[str, Any]:
+    return {"results": results}
+
+
+class TestFindRegressions:
+    """Tests for find_regressions."""
+
+    def test_within_threshold(self, bench: ModuleType) -> None:
+        """Test that changes up to the threshold are not regressions."""
+        baseline = _report(generate={"p50_ms": 10.0, "banners_per_sec": 100.0})
+        current = _report(generate={"p50_ms": 11.0, "banners_per_sec": 90.0})
+        assert bench.find_regressions(baseline, current, 0.1) == []
+
+    def test_beyond_threshold(self, bench: ModuleType) -> None:
+        """Test that slower timings and lower throughput are flagged."""
+        baseline = _report(generate={"p50_ms": 10.0, "banners_per_sec": 100.0})
+        current = _report(generate={"p50_ms": 11.5, "banners_per_sec": 85.0})
+        assert bench.find_regressions(baseline, current, 0.1) == [
+            ("generate", "p50_ms", 10.0, 11.5),
+            ("generate", "banners_per_sec", 100.0, 85.0),
+        ]
+
+    def test_improvements_not_flagged(self, bench: ModuleType) -> None:
+        """Test that faster timings and higher throughput pass."""
+        baseline = _report(generate={"p50_ms": 10.0, "banners_per_sec": 100.0})
+        current = _report(generate={"p50_ms": 5.0, "banners_per_sec": 200.0})
+        assert bench.find_regressions(baseline, current, 0.0) == []
+
+    def test_missing_and_new_cases_skipped(self, bench: ModuleType) -> None:
+        """Test that benchmarks or metrics absent from either side are skipped."""
+        baseline = _report(
+            generate={"p50_ms": 10.0}, removed={"p50_ms": 1.0}, batch={"banners": 4}
+        )
+        current = _report(
+            generate={"p50_ms": 10.0, "p95_ms": 99.0},
+            added={"p50_ms": 50.0},
+            batch={"banners": 8},
+        )
+        assert bench.find_regressions(baseline, current, 0.1) == []
+
+    def test_zero_baseline_skipped(self, bench: ModuleType) -> None:
+        """Test that a zero baseline does not flag every change."""
+        baseline = _report(generate={"p50_ms": 0.0})
+        current = _report(generate={"p50_ms": 3.0})
+        assert bench.find_regressions(baseline, current, 0.1) == []
+
+
+class TestCompare:
+    """Tests for the compare command."""
+
+    def _compare(
+        self,
+        bench: ModuleType,
+        tmp_path: Path,
+        current: dict[str, Any],
+        *options: str,
+    ) -> int:
+        baseline_path = tmp_path / "base.json"
+        current_path = tmp_path / "current.json"
+        baseline_path.write_text(json.dumps(_report(generate={"p50_ms": 10.0})))
+        current_path.write_text(json.dumps(current))
+        return int(
+            bench.main(["compare", str(baseline_path), str(current_path), *options])
+        )
+
+    def test_no_regressions_exit_zero(
+        self, bench: ModuleType, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test that compare exits with 0 when nothing regressed."""
+        current = _report(generate={"p50_ms": 10.5})
+        assert self._compare(bench, tmp_path, current) == 0
+        assert "No regressions beyond 10%" in capsys.readouterr().out
+
+    def test_regressions_exit_one(
+        self, bench: ModuleType, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test that compare exits with 1 and lists regressed metrics."""
+        current = _report(generate={"p50_ms": 12.0})
+        assert self._compare(bench, tmp_path, current) == 1
+        assert "generate p50_ms: 10.00 -> 12.00 (+20.0%)" in capsys.readouterr().out
+
+    def test_threshold_option(self, bench: ModuleType, tmp_path: Path) -> None:
+        """Test that --threshold widens the allowed slowdown."""
+        current = _report(generate={"p50_ms": 12.0})
+        assert self._compare(bench, tmp_path, current, "--threshold", "0.25") == 0
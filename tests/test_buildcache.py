@@ -0,0 +1,102 @@
+"""Tests for the incremental build cache."""
+
+import os
+from pathlib import Path
+
+from PIL import Image
+
+from classbanners.banner import Banner, BannerConfig
+from classbanners.buildcache import INDEX_NAME, BuildCache, render_key
+from classbanners.generator import BannerGenerator
+from classbanners.icons import IconRegistry
+
+
+class TestRenderKey:
+    """Tests for render_key."""
+
+    def test_stable_for_equal_banners(self) -> None:
+        """Test that equal banners produce the same key."""
+        assert render_key(Banner("Title", "Sub")) == render_key(Banner("Title", "Sub"))
+
+    def test_changes_with_content(self) -> None:
+        """Test that titles, subtitles and config fields affect the key."""
+        base = render_key(Banner("Title"))
+        assert render_key(Banner("Other")) != base
+        assert render_key(Banner("Title", "Sub")) != base
+        assert render_key(Banner("Title", config=BannerConfig(padding=5))) != base
+
+    def test_changes_with_icon(self) -> None:
+        """Test that the icon name affects the key."""
+        base = render_key(Banner("Title"))
+        rocket = render_key(Banner("Title", icon="rocket"))
+        assert rocket != base
+        assert render_key(Banner("Title", icon="cloud")) != rocket
+
+    def test_changes_with_font_content(self, tmp_path: Path) -> None:
+        """Test that editing the font file changes the key."""
+        font = tmp_path / "font.ttf"
+        font.write_bytes(b"one")
+        banner = Banner("Title", config=BannerConfig(font_path=font))
+        before = render_key(banner)
+        font.write_bytes(b"two!")
+        assert render_key(banner) != before
+
+
+class TestBuildCache:
+    """Tests for BuildCache."""
+
+    def test_render_file_skips_up_to_date_output(self, tmp_path: Path) -> None:
+        """Test that an unchanged banner is not rendered twice."""
+        generator = BannerGenerator()
+        output = tmp_path / "banner.png"
+
+        with BuildCache(tmp_path) as cache:
+            assert generator.render_file(Banner("Title"), output, cache) is True
+        with BuildCache(tmp_path) as cache:
+            banner = Banner("Title")
+            assert generator.render_file(banner, output, cache) is False
+            assert banner.image is None
+            assert generator.render_file(Banner("Changed"), output, cache) is True
+
+        assert (tmp_path / INDEX_NAME).exists()
+
+    def test_custom_icon_change_is_stale(self, tmp_path: Path) -> None:
+        """Test that editing an icon of a custom registry re-renders."""
+        icons = tmp_path / "icons"
+        icons.mkdir()
+        Image.new("L", (32, 32), 255).save(icons / "logo.png")
+        generator = BannerGenerator(icons=IconRegistry(icons))
+        output = tmp_path / "out" / "banner.png"
+        cache = BuildCache(output.parent)
+
+        assert generator.render_file(Banner("Title", icon="logo"), output, cache)
+        assert not generator.render_file(Banner("Title", icon="logo"), output, cache)
+        Image.new("L", (48, 48), 128).save(icons / "logo.png")
+        assert generator.render_file(Banner("Title", icon="logo"), output, cache)
+
+    def test_modified_output_is_stale(self, tmp_path: Path) -> None:
+        """Test that touching the output invalidates the entry."""
+        generator = BannerGenerator()
+        output = tmp_path / "banner.png"
+        cache = BuildCache(tmp_path)
+        generator.render_file(Banner("Title"), output, cache)
+
+        stat = output.stat()
+        os.utime(output, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert not cache.is_current(output, render_key(Banner("Title")))
+
+    def test_deleted_output_is_stale(self, tmp_path: Path) -> None:
+        """Test that a missing output is re-rendered."""
+        generator = BannerGenerator()
+        output = tmp_path / "banner.png"
+        cache = BuildCache(tmp_path)
+        generator.render_file(Banner("Title"), output, cache)
+        output.unlink()
+
+        assert generator.render_file(Banner("Title"), output, cache) is True
+        assert output.exists()
+
+    def test_corrupt_index_is_ignored(self, tmp_path: Path) -> None:
+        """Test that an unreadable index starts an empty cache."""
+        (tmp_path / INDEX_NAME).write_text("{not json")
+        assert len(BuildCache(tmp_path)) == 0
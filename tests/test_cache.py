@@ -0,0 +1,75 @@
+"""Tests for the LRU cache."""
+
+import pytest
+
+from classbanners.cache import LRUCache
+
+
+class TestLRUCache:
+    """Tests for LRUCache."""
+
+    def test_get_and_put(self) -> None:
+        """Test storing and retrieving values."""
+        cache: LRUCache[str, int] = LRUCache(max_entries=2)
+        assert cache.get("a") is None
+        cache.put("a", 1)
+        assert cache.get("a") == 1
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+
+    def test_evicts_least_recently_used(self) -> None:
+        """Test that the least recently used entry is evicted first."""
+        cache: LRUCache[str, int] = LRUCache(max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+        assert cache.stats.evictions == 1
+
+    def test_byte_budget(self) -> None:
+        """Test eviction once the byte budget is exceeded."""
+        cache: LRUCache[str, bytes] = LRUCache(
+            max_entries=None, max_bytes=10, sizeof=len
+        )
+        cache.put("a", b"12345")
+        cache.put("b", b"12345")
+        assert cache.current_bytes == 10
+        cache.put("c", b"1")
+
+        assert "a" not in cache
+        assert cache.current_bytes == 6
+
+    def test_oversized_value_not_cached(self) -> None:
+        """Test that values larger than the budget are never stored."""
+        cache: LRUCache[str, bytes] = LRUCache(max_bytes=4, sizeof=len)
+        cache.put("a", b"12345")
+        assert len(cache) == 0
+
+    def test_shrinking_max_entries_evicts(self) -> None:
+        """Test that lowering max_entries trims the cache."""
+        cache: LRUCache[int, int] = LRUCache(max_entries=5)
+        for i in range(5):
+            cache.put(i, i)
+        cache.max_entries = 2
+        assert len(cache) == 2
+        assert 4 in cache
+
+    def test_clear(self) -> None:
+        """Test that clear empties the cache and resets statistics."""
+        cache: LRUCache[str, int] = LRUCache()
+        cache.put("a", 1)
+        cache.get("a")
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.stats.hits == 0
+
+    def test_negative_limits_raise_error(self) -> None:
+        """Test that negative limits raise ValueError."""
+        with pytest.raises(ValueError, match="max_entries cannot be negative"):
+            LRUCache(max_entries=-1)
+        with pytest.raises(ValueError, match="max_bytes cannot be negative"):
+            LRUCache(max_bytes=-1)
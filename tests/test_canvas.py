@@ -0,0 +1,82 @@
+"""Tests for the base canvas cache."""
+
+from PIL import Image
+
+from classbanners.banner import BannerConfig
+from classbanners.canvas import CanvasCache, image_nbytes
+from classbanners.generator import BannerGenerator
+
+
+def _solid(size: tuple[int, int], color: str = "#123456") -> Image.Image:
+    return Image.new("RGB", size, color)
+
+
+class TestCanvasCache:
+    """Tests for CanvasCache."""
+
+    def test_returns_independent_copies(self) -> None:
+        """Test that drawing on a canvas does not alter the cached one."""
+        cache = CanvasCache()
+        first = cache.get("key", lambda: _solid((10, 10)))
+        first.putpixel((0, 0), (255, 0, 0))
+        second = cache.get("key", lambda: _solid((10, 10)))
+
+        assert second.getpixel((0, 0)) == (0x12, 0x34, 0x56)
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+
+    def test_memory_budget_evicts(self) -> None:
+        """Test that canvases are evicted once the budget is exceeded."""
+        size = image_nbytes(_solid((100, 100)))
+        cache = CanvasCache(max_bytes=size * 2)
+        for key in ("a", "b", "c"):
+            cache.get(key, lambda: _solid((100, 100)))
+
+        assert len(cache) == 2
+        assert cache.current_bytes == size * 2
+        assert cache.stats.evictions == 1
+
+    def test_oversized_canvas_not_cached(self) -> None:
+        """Test that canvases larger than the budget bypass the cache."""
+        cache = CanvasCache(max_bytes=10)
+        image = cache.get("big", lambda: _solid((100, 100)))
+
+        assert image.size == (100, 100)
+        assert len(cache) == 0
+
+    def test_metrics_record_build_time(self) -> None:
+        """Test that build and copy times are tracked."""
+        cache = CanvasCache()
+        cache.get("key", lambda: _solid((50, 50)))
+        cache.get("key", lambda: _solid((50, 50)))
+
+        assert cache.metrics.build_seconds > 0
+        assert cache.metrics.copy_seconds > 0
+        cache.clear()
+        assert cache.metrics.build_seconds == 0
+
+
+class TestGeneratorCanvasCache:
+    """Tests for canvas reuse in BannerGenerator."""
+
+    def test_shared_config_reuses_canvas(self) -> None:
+        """Test that banners sharing a config reuse the base canvas."""
+        cache = CanvasCache()
+        generator = BannerGenerator(BannerConfig(border_width=4), canvas_cache=cache)
+        generator.create_banner("One")
+        generator.create_banner("Two")
+
+        assert cache.stats.misses == 1
+        assert cache.stats.hits == 1
+
+    def test_cached_canvas_matches_fresh_render(self) -> None:
+        """Test that output is identical with a warm or cold cache."""
+        config = BannerConfig(border_width=6, border_color="#FF0000")
+        warm = BannerGenerator(config, canvas_cache=CanvasCache())
+        warm.create_banner("Warm up")
+        cached = warm.create_banner("Same", "Text")
+        fresh = BannerGenerator(config, canvas_cache=CanvasCache(max_bytes=0))
+        uncached = fresh.create_banner("Same", "Text")
+
+        assert cached.image is not None and uncached.image is not None
+        assert cached.image.tobytes() == uncached.image.tobytes()
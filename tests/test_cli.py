@@ -1,9 +1,24 @@
 """Tests for CLI module."""
 
+import socket
+import tarfile
+import tempfile
+import threading
+import zipfile
 from pathlib import Path
 from tempfile import TemporaryDirectory
 
-from classbanners.cli import main, parse_args
+import pytest
+from PIL import Image
+
+from classbanners.cli import main, parse_args, parse_watch_args
+from classbanners.daemon import SOCKET_ENV
+
+
+@pytest.fixture(autouse=True)
+def _no_daemon(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    # Keep a daemon running on this machine out of the tests.
+    monkeypatch.setenv(SOCKET_ENV, str(tmp_path / "no-daemon.sock"))
 
 
 class TestParseArgs:
@@ -68,6 +83,17 @@ class TestMain:
             assert result == 0
             assert output.exists()
 
+    @pytest.mark.parametrize("title", ["batch", "serve", "watch", "daemon"])
+    def test_main_title_named_like_subcommand(self, title: str) -> None:
+        """Test that titles matching a subcommand render after '--' or options."""
+        with TemporaryDirectory() as tmpdir:
+            output = Path(tmpdir) / "test.png"
+            assert main(["--", title, "-o", str(output)]) == 0
+            assert output.exists()
+            output.unlink()
+            assert main(["-o", str(output), title]) == 0
+            assert output.exists()
+
     def test_main_with_subtitle(self) -> None:
         """Test main with subtitle argument."""
         with TemporaryDirectory() as tmpdir:
@@ -92,3 +118,327 @@ class TestMain:
 
             assert result == 0
             assert output.exists()
+
+    def test_main_with_fit(self) -> None:
+        """Test that --fit shrink is accepted."""
+        with TemporaryDirectory() as tmpdir:
+            output = Path(tmpdir) / "fit.png"
+            result = main(
+                ["Long title for a small banner", "-W", "200", "-o", str(output), "--fit", "shrink"]
+            )
+
+            assert result == 0
+            assert output.exists()
+
+    def test_main_with_sizes(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test that --sizes writes one file per size."""
+        with TemporaryDirectory() as tmpdir:
+            output = Path(tmpdir) / "math.png"
+            result = main(["Math", "-o", str(output), "--sizes", "1x,2x,thumb"])
+
+            assert result == 0
+            with Image.open(Path(tmpdir) / "math@2x.png") as image:
+                assert image.size == (1600, 400)
+            assert output.exists()
+            assert (Path(tmpdir) / "math@thumb.png").exists()
+            assert capsys.readouterr().out.count("Banner saved to") == 3
+
+    def test_invalid_sizes(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test that malformed --sizes are reported."""
+        assert main(["Math", "--sizes", "huge"]) == 1
+        assert "Invalid size 'huge'" in capsys.readouterr().err
+
+    def test_main_with_rgb_color_mode(self) -> None:
+        """Test that --color-mode rgb writes a full-color PNG."""
+        with TemporaryDirectory() as tmpdir:
+            output = Path(tmpdir) / "rgb.png"
+            result = main(["Title", "-o", str(output), "--color-mode", "rgb"])
+
+            assert result == 0
+            with Image.open(output) as image:
+                assert image.mode == "RGB"
+
+    def test_main_with_strip_height(self) -> None:
+        """Test that --strip-height writes the banner in strips."""
+        with TemporaryDirectory() as tmpdir:
+            output = Path(tmpdir) / "print.tiff"
+            result = main(["Print", "-o", str(output), "--strip-height", "32"])
+
+            assert result == 0
+            assert output.exists()
+
+    def test_main_with_icon(self) -> None:
+        """Test that --icon draws a bundled icon."""
+        with TemporaryDirectory() as tmpdir:
+            output = Path(tmpdir) / "icon.png"
+            result = main(["Topic", "-o", str(output), "--icon", "rocket"])
+
+            assert result == 0
+            assert output.exists()
+
+    def test_unknown_icon(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test that unknown icons are reported."""
+        with TemporaryDirectory() as tmpdir:
+            output = Path(tmpdir) / "icon.png"
+            result = main(["Topic", "-o", str(output), "--icon", "nope"])
+
+            assert result == 1
+            assert not output.exists()
+            assert "Unknown icon 'nope'" in capsys.readouterr().err
+
+    def test_strip_height_rejects_jpeg(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test that --strip-height reports unsupported formats."""
+        with TemporaryDirectory() as tmpdir:
+            output = Path(tmpdir) / "print.jpg"
+            result = main(["Print", "-o", str(output), "--strip-height", "32"])
+
+            assert result == 1
+            assert "Strip rendering supports" in capsys.readouterr().err
+
+
+class TestSvgOutput:
+    """Tests for .svg output."""
+
+    def test_svg_output(self, tmp_path: Path) -> None:
+        """Test that a .svg output path writes a vector banner."""
+        output = tmp_path / "banner.svg"
+        assert main(["Vector", "-o", str(output), "--embed-font"]) == 0
+        document = output.read_text(encoding="utf-8")
+        assert document.startswith("<svg ")
+        assert "@font-face" in document
+
+    def test_svg_rejects_raster_options(
+        self, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test that raster-only options cannot write SVG."""
+        assert main(["T", "-o", "banner.svg", "--sizes", "2x"]) == 1
+        assert "--sizes cannot be combined with SVG output" in capsys.readouterr().err
+
+
+class TestFillOption:
+    """Tests for the background fill options."""
+
+    def test_fill_arguments(self) -> None:
+        """Test that --fill and --fill-color reach the config."""
+        from classbanners.cli import _config_from_args
+
+        config = _config_from_args(
+            parse_args(["T", "--fill", "radial", "--fill-color", "#102040"])
+        )
+        assert config.background_fill == "radial"
+        assert config.fill_color == "#102040"
+
+    def test_invalid_fill(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test that malformed fills are reported."""
+        assert main(["T", "--fill", "plaid"]) == 1
+        assert "background_fill must be one of" in capsys.readouterr().err
+
+
+class TestBatch:
+    """Tests for the batch subcommand."""
+
+    def test_batch_renders_manifest(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test rendering every row of a manifest."""
+        with TemporaryDirectory() as tmpdir:
+            manifest = Path(tmpdir) / "topics.jsonl"
+            manifest.write_text(
+                '{"number": 1, "title": "Intro"}\n{"number": 2, "title": "Lab: PCA"}\n'
+            )
+            output = Path(tmpdir) / "out"
+            result = main(["batch", str(manifest), "-o", str(output), "-j", "1"])
+
+            assert result == 0
+            assert sorted(p.name for p in output.iterdir()) == [
+                "01-intro.png",
+                "02-lab-pca.png",
+            ]
+        assert "Rendered 2 banners" in capsys.readouterr().out
+
+    def test_batch_reports_bad_rows(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test that invalid rows fail without stopping the batch."""
+        with TemporaryDirectory() as tmpdir:
+            manifest = Path(tmpdir) / "topics.csv"
+            manifest.write_text("title,text_color\nGood,\nBad,red\n")
+            output = Path(tmpdir) / "out"
+            result = main(["batch", str(manifest), "-o", str(output), "-j", "1"])
+
+            assert result == 1
+            assert [p.name for p in output.iterdir()] == ["01-good.png"]
+        assert "1 banners failed" in capsys.readouterr().err
+
+    def test_batch_continues_after_untitled_row(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test that a row without a title does not stop later rows."""
+        manifest = tmp_path / "topics.csv"
+        manifest.write_text("title,subtitle\nFirst,\n,orphan\nLast,\n")
+        output = tmp_path / "out"
+        result = main(["batch", str(manifest), "-o", str(output), "-j", "1"])
+
+        assert result == 1
+        assert sorted(p.name for p in output.iterdir()) == ["01-first.png", "03-last.png"]
+        assert "error: Manifest row 1 has no title" in capsys.readouterr().err
+
+    def test_batch_missing_manifest(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test that a missing manifest is reported as an error."""
+        assert main(["batch", "missing.json"]) == 1
+        assert "error:" in capsys.readouterr().err
+
+    def test_batch_incremental(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test that a second incremental run skips unchanged banners."""
+        with TemporaryDirectory() as tmpdir:
+            manifest = Path(tmpdir) / "topics.jsonl"
+            manifest.write_text('{"title": "Intro"}\n{"title": "Lab"}\n')
+            args = ["batch", str(manifest), "-o", tmpdir, "-j", "1", "--incremental"]
+            assert main(args) == 0
+            capsys.readouterr()
+
+            manifest.write_text('{"title": "Intro"}\n{"title": "Lab 2"}\n')
+            assert main(args) == 0
+        assert "1 rendered, 1 up-to-date" in capsys.readouterr().out
+
+    def test_batch_incremental_custom_icons(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test that replacing an --icons file re-renders banners using it."""
+        icons = tmp_path / "icons"
+        icons.mkdir()
+        Image.new("L", (32, 32), 255).save(icons / "logo.png")
+        manifest = tmp_path / "topics.jsonl"
+        manifest.write_text('{"title": "Intro", "icon": "logo"}\n')
+        output = tmp_path / "out"
+        args = ["batch", str(manifest), "-o", str(output), "-j", "1"]
+        args += ["--incremental", "--icons", str(icons)]
+        assert main(args) == 0
+        capsys.readouterr()
+
+        Image.new("L", (48, 48), 128).save(icons / "logo.png")
+        assert main(args) == 0
+        assert "1 rendered, 0 up-to-date" in capsys.readouterr().out
+
+
+class TestPreset:
+    """Tests for the --preset option."""
+
+    def test_preset_choices(self) -> None:
+        """Test that presets are parsed."""
+        assert parse_args(["Title", "--preset", "fast"]).preset == "fast"
+        assert parse_args(["Title"]).preset is None
+
+    def test_main_with_preset(self) -> None:
+        """Test rendering with an encoder preset."""
+        with TemporaryDirectory() as tmpdir:
+            output = Path(tmpdir) / "fast.png"
+            assert main(["Title", "-o", str(output), "--preset", "smallest"]) == 0
+            assert output.exists()
+
+
+class TestProfile:
+    """Tests for the --profile option."""
+
+    def test_profile_prints_breakdown(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test that --profile prints a per-stage table."""
+        with TemporaryDirectory() as tmpdir:
+            output = Path(tmpdir) / "banner.png"
+            assert main(["Title", "-o", str(output), "--profile"]) == 0
+        out = capsys.readouterr().out
+        assert "stage" in out
+        assert "encode" in out
+
+    @pytest.mark.parametrize("suffix", [".zip", ".tar"])
+    def test_batch_into_archive(
+        self, suffix: str, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test that -o banners.zip/.tar streams the batch into an archive."""
+        with TemporaryDirectory() as tmpdir:
+            manifest = Path(tmpdir) / "topics.jsonl"
+            manifest.write_text('{"number": 1, "title": "Intro"}\n{"number": 2, "title": "Lab"}\n')
+            output = Path(tmpdir) / f"banners{suffix}"
+            result = main(["batch", str(manifest), "-o", str(output), "-j", "1"])
+
+            assert result == 0
+            if suffix == ".zip":
+                with zipfile.ZipFile(output) as archive:
+                    names = archive.namelist()
+            else:
+                with tarfile.open(output) as archive:
+                    names = archive.getnames()
+            assert sorted(names) == ["01-intro.png", "02-lab.png"]
+            assert f"written to {output}" in capsys.readouterr().out
+
+    def test_archive_rejects_incremental(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test that --incremental cannot target an archive."""
+        result = main(["batch", "topics.json", "-o", "banners.zip", "--incremental"])
+        assert result == 1
+        assert "--incremental cannot write into an archive" in capsys.readouterr().err
+
+    def test_batch_atlas(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test packing a manifest into an atlas."""
+        with TemporaryDirectory() as tmpdir:
+            manifest = Path(tmpdir) / "topics.jsonl"
+            manifest.write_text('{"number": 1, "title": "Intro"}\n{"number": 2, "title": "Lab"}\n')
+            output = Path(tmpdir) / "out"
+            args = ["batch", str(manifest), "-o", str(output), "--atlas", "topics", "-j", "1"]
+            assert main(args) == 0
+            assert sorted(p.name for p in output.iterdir()) == ["topics-0.png", "topics.json"]
+        assert "2 rendered, 0 reused" in capsys.readouterr().out
+
+
+class TestWatch:
+    """Tests for the watch subcommand."""
+
+    def test_parse_watch_args(self) -> None:
+        """Test watch arguments and their defaults."""
+        args = parse_watch_args(["topics.json", "-o", "out", "--interval", "2"])
+        assert args.manifest == Path("topics.json")
+        assert args.output == Path("out")
+        assert args.interval == 2.0
+        assert args.debounce == 0.25
+
+    def test_watch_rejects_invalid_interval(
+        self, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test that invalid polling settings are reported."""
+        assert main(["watch", "topics.json", "--interval", "0"]) == 1
+        assert "interval must be positive" in capsys.readouterr().err
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+class TestDaemon:
+    """Tests for rendering through a running daemon."""
+
+    def test_main_uses_running_daemon(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that single banners go to the daemon, unless --no-daemon."""
+        from classbanners.daemon import BannerDaemon
+        from classbanners.generator import BannerGenerator
+
+        with TemporaryDirectory(prefix="cb", dir=tempfile.gettempdir()) as tmpdir:
+            daemon = BannerDaemon(BannerGenerator(), Path(tmpdir) / "d.sock")
+            daemon.start()
+            thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+            thread.start()
+            monkeypatch.setenv(SOCKET_ENV, str(daemon.path))
+            try:
+                remote = tmp_path / "remote.png"
+                local = tmp_path / "local.png"
+                assert main(["Intro", "-o", str(remote), "-W", "300"]) == 0
+                assert main(["Intro", "-o", str(local), "-W", "300", "--no-daemon"]) == 0
+                assert daemon.served == 1
+            finally:
+                daemon.shutdown()
+                thread.join()
+                daemon.close()
+
+        with Image.open(remote) as a, Image.open(local) as b:
+            assert a.tobytes() == b.tobytes()
+
+    def test_main_falls_back_without_daemon(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that the banner is rendered in-process with no daemon."""
+        monkeypatch.setenv(SOCKET_ENV, str(tmp_path / "missing.sock"))
+        output = tmp_path / "banner.png"
+        assert main(["Intro", "-o", str(output)]) == 0
+        assert output.is_file()
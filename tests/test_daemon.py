@@ -0,0 +1,149 @@
+"""Tests for the warm render daemon."""
+
+import io
+import os
+import shutil
+import socket
+import tempfile
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from classbanners.banner import Banner, BannerConfig
+from classbanners.daemon import (
+    SOCKET_ENV,
+    BannerDaemon,
+    build_request,
+    default_socket_path,
+    is_trusted_socket,
+    render_via_daemon,
+)
+from classbanners.generator import BannerGenerator
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX"), reason="Unix sockets are not available"
+)
+
+
+@pytest.fixture
+def socket_dir() -> Iterator[Path]:
+    # Unix socket paths are limited to about 100 bytes; keep them short.
+    directory = Path(tempfile.mkdtemp(prefix="cb"))
+    yield directory
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+@pytest.fixture
+def daemon(socket_dir: Path) -> Iterator[BannerDaemon]:
+    daemon = BannerDaemon(BannerGenerator(), socket_dir / "d.sock")
+    daemon.start()
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    yield daemon
+    daemon.shutdown()
+    thread.join()
+    daemon.close()
+
+
+class TestBannerDaemon:
+    """Tests for BannerDaemon and its client."""
+
+    def test_matches_in_process_render(self, daemon: BannerDaemon) -> None:
+        """Test that the daemon returns the same image as a local render."""
+        banner = Banner("Intro", "Week 1", BannerConfig(width=400, height=100))
+        data = render_via_daemon(build_request(banner, ".png"), daemon.path)
+
+        assert data is not None
+        BannerGenerator().generate(banner)
+        with Image.open(io.BytesIO(data)) as image:
+            assert image.size == (400, 100)
+            assert image.tobytes() == banner.image.tobytes()
+        assert daemon.served == 1
+
+    def test_format_follows_suffix(self, daemon: BannerDaemon) -> None:
+        """Test that the output suffix selects the encoder."""
+        data = render_via_daemon(build_request(Banner("Intro"), ".webp"), daemon.path)
+        assert data is not None and data[8:12] == b"WEBP"
+
+    def test_rejected_banner_raises_error(self, daemon: BannerDaemon) -> None:
+        """Test that render errors are reported instead of falling back."""
+        request = build_request(Banner("Intro", icon="no-such-icon"), ".png")
+        with pytest.raises(ValueError, match="Unknown icon 'no-such-icon'"):
+            render_via_daemon(request, daemon.path)
+
+    def test_version_mismatch_falls_back(self, daemon: BannerDaemon) -> None:
+        """Test that a daemon of another version is not used."""
+        request = build_request(Banner("Intro"), ".png")
+        request["version"] = "0.0.0"
+        assert render_via_daemon(request, daemon.path) is None
+        assert daemon.served == 0
+
+    def test_second_daemon_refuses_to_start(self, daemon: BannerDaemon) -> None:
+        """Test that a live socket is not taken over."""
+        with pytest.raises(ValueError, match="already listening"):
+            BannerDaemon(BannerGenerator(), daemon.path).start()
+
+    def test_no_daemon(self, socket_dir: Path) -> None:
+        """Test that a missing or stale socket means rendering locally."""
+        path = socket_dir / "d.sock"
+        request = build_request(Banner("Intro"), ".png")
+        assert render_via_daemon(request, path) is None
+
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(str(path))
+        stale.close()
+        assert render_via_daemon(request, path) is None
+
+        # A new daemon replaces the stale socket and removes it on close.
+        daemon = BannerDaemon(BannerGenerator(), path)
+        daemon.start()
+        daemon.close()
+        assert not path.exists()
+
+    def test_socket_path_from_environment(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that $CLASSBANNERS_SOCKET overrides the default socket."""
+        monkeypatch.setenv(SOCKET_ENV, "/run/banners.sock")
+        assert default_socket_path() == Path("/run/banners.sock")
+
+    def test_default_socket_in_private_directory(
+        self, monkeypatch: pytest.MonkeyPatch, socket_dir: Path
+    ) -> None:
+        """Test that the default socket lives in a per-user subdirectory."""
+        monkeypatch.delenv(SOCKET_ENV, raising=False)
+        monkeypatch.setenv("XDG_RUNTIME_DIR", str(socket_dir))
+        path = default_socket_path()
+        assert path.parent == socket_dir / f"classbanners-{os.getuid()}"
+
+        daemon = BannerDaemon(BannerGenerator(), path)
+        daemon.start()
+        try:
+            assert path.parent.stat().st_mode & 0o777 == 0o700
+            assert is_trusted_socket(path)
+        finally:
+            daemon.close()
+
+    def test_shared_directory_not_trusted(
+        self, daemon: BannerDaemon, socket_dir: Path
+    ) -> None:
+        """Test that a socket others could have planted is not used."""
+        request = build_request(Banner("Intro"), ".png")
+        socket_dir.chmod(0o777)
+        try:
+            assert not is_trusted_socket(daemon.path)
+            assert render_via_daemon(request, daemon.path) is None
+        finally:
+            socket_dir.chmod(0o700)
+        assert daemon.served == 0
+
+    def test_refuses_shared_directory(self, socket_dir: Path) -> None:
+        """Test that the daemon does not listen in a world-writable directory."""
+        shared = socket_dir / "shared"
+        shared.mkdir()
+        shared.chmod(0o777)
+        with pytest.raises(ValueError, match="writable by other users"):
+            BannerDaemon(BannerGenerator(), shared / "d.sock").start()
@@ -0,0 +1,92 @@
+"""Tests for image encoding."""
+
+import io
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from classbanners.banner import Banner
+from classbanners.encoding import (
+    encode_image,
+    encoder_options,
+    format_for_path,
+    normalize_format,
+)
+from classbanners.generator import BannerGenerator
+
+
+class TestEncoderOptions:
+    """Tests for encoder presets."""
+
+    def test_png_presets(self) -> None:
+        """Test PNG compression levels for each preset."""
+        assert encoder_options("PNG", "fast") == {"compress_level": 1}
+        assert encoder_options("png", "smallest") == {
+            "compress_level": 9,
+            "optimize": True,
+        }
+
+    def test_explicit_options_override_preset(self) -> None:
+        """Test that explicit settings win over the preset."""
+        assert encoder_options("WEBP", "fast", quality=50)["quality"] == 50
+
+    def test_unknown_preset_raises_error(self) -> None:
+        """Test that unknown presets raise ValueError."""
+        with pytest.raises(ValueError, match="preset must be one of"):
+            encoder_options("PNG", "tiny")
+
+    def test_format_for_path(self) -> None:
+        """Test format detection from file extensions."""
+        assert format_for_path("a.png") == "PNG"
+        assert format_for_path(Path("a.jpg")) == "JPEG"
+        assert normalize_format("jpg") == "JPEG"
+        with pytest.raises(ValueError, match="Unknown image format"):
+            format_for_path("a.unknown")
+
+
+class TestEncodeImage:
+    """Tests for in-memory encoding."""
+
+    def test_encode_reuses_buffer(self) -> None:
+        """Test encoding twice into the same buffer."""
+        image = Image.new("RGB", (40, 20), "#4A90D9")
+        buffer = io.BytesIO()
+        with encode_image(image, "PNG", "fast", buffer) as view:
+            first = view.tobytes()
+        with encode_image(image, "PNG", "fast", buffer) as view:
+            assert view.tobytes() == first
+        assert Image.open(io.BytesIO(first)).size == (40, 20)
+
+
+class TestBannerEncoding:
+    """Tests for Banner.to_bytes and Banner.encode."""
+
+    @pytest.mark.parametrize("image_format", ["PNG", "WEBP", "JPEG"])
+    def test_to_bytes_round_trips(self, image_format: str) -> None:
+        """Test that every supported format decodes back to the banner size."""
+        banner = BannerGenerator().create_banner("Encoded")
+        data = banner.to_bytes(image_format, preset="fast")
+
+        decoded = Image.open(io.BytesIO(data))
+        assert decoded.format == image_format
+        assert decoded.size == (800, 200)
+
+    def test_smallest_preset_is_not_larger(self) -> None:
+        """Test that the smallest preset does not grow the PNG."""
+        banner = BannerGenerator().create_banner("Compressed", "Subtitle")
+        fast = banner.to_bytes("PNG", preset="fast")
+        smallest = banner.to_bytes("PNG", preset="smallest")
+        assert len(smallest) <= len(fast)
+
+    def test_encode_without_image_raises_error(self) -> None:
+        """Test that encoding before generating raises ValueError."""
+        with pytest.raises(ValueError, match="No image to encode"):
+            Banner(title="Test").encode()
+
+    def test_save_with_preset(self, tmp_path: Path) -> None:
+        """Test saving with an encoder preset."""
+        banner = BannerGenerator().create_banner("Saved")
+        output = tmp_path / "nested" / "banner.webp"
+        assert banner.save(output, preset="balanced") is True
+        assert Image.open(output).format == "WEBP"
@@ -0,0 +1,102 @@
+"""Tests for gradient and pattern background fills."""
+
+import logging
+import sys
+
+import pytest
+
+from classbanners import fills
+from classbanners.fills import Fill, parse_fill, render_fill
+
+BLUE = (0, 64, 255)
+BLACK = (0, 0, 0)
+
+
+class TestParseFill:
+    """Tests for parse_fill."""
+
+    def test_specs(self) -> None:
+        """Test every kind with and without arguments."""
+        assert parse_fill("solid") == Fill()
+        assert parse_fill("linear") == Fill("linear")
+        assert parse_fill("Linear:90") == Fill("linear", angle=90.0)
+        assert parse_fill("radial") == Fill("radial")
+        assert parse_fill("stripes") == Fill("stripes", angle=45.0, period=24)
+        assert parse_fill("stripes:10:0") == Fill("stripes", angle=0.0, period=10)
+        assert parse_fill("noise:20") == Fill("noise", amount=20)
+
+    @pytest.mark.parametrize(
+        ("spec", "message"),
+        [
+            ("plaid", "background_fill must be one of solid, linear"),
+            ("radial:5", "Too many arguments"),
+            ("linear:steep", "Invalid number"),
+            ("stripes:1", "Stripe period must be a whole number"),
+            ("noise:0", "Noise amount must be a whole percent"),
+        ],
+    )
+    def test_invalid_specs(self, spec: str, message: str) -> None:
+        """Test that malformed specs raise ValueError."""
+        with pytest.raises(ValueError, match=message):
+            parse_fill(spec)
+
+
+class TestRenderFill:
+    """Tests for render_fill."""
+
+    def test_solid_is_not_rendered(self) -> None:
+        """Test that solid fills leave the plain background."""
+        assert render_fill(Fill(), BLUE, BLACK, 10, 10) is None
+
+    def test_linear_gradient_runs_between_colors(self) -> None:
+        """Test that a horizontal gradient starts and ends at its colors."""
+        pytest.importorskip("numpy")
+        image = render_fill(parse_fill("linear"), BLUE, BLACK, 256, 4)
+
+        assert image is not None and image.mode == "RGB"
+        assert image.size == (256, 4)
+        assert image.getpixel((0, 0)) == BLUE
+        assert image.getpixel((255, 3)) == BLACK
+        assert image.getpixel((128, 0))[2] == 127
+
+    def test_radial_gradient_is_symmetric(self) -> None:
+        """Test that a radial gradient is lightest in the middle."""
+        pytest.importorskip("numpy")
+        image = render_fill(parse_fill("radial"), BLUE, BLACK, 100, 50)
+
+        assert image is not None
+        assert image.getpixel((50, 25))[2] >= 250
+        assert image.getpixel((0, 0))[2] <= 5
+        assert image.getpixel((0, 0)) == image.getpixel((99, 49))
+
+    @pytest.mark.parametrize("spec", ["linear:30", "radial", "stripes:7:60", "noise:50"])
+    def test_rows_match_full_render(self, spec: str) -> None:
+        """Test that rendering a range of rows matches the full fill."""
+        pytest.importorskip("numpy")
+        full = render_fill(parse_fill(spec), BLUE, BLACK, 120, 40)
+        rows = render_fill(parse_fill(spec), BLUE, BLACK, 120, 40, top=13, rows=9)
+
+        assert full is not None and rows is not None
+        assert rows.tobytes() == full.crop((0, 13, 120, 22)).tobytes()
+
+    def test_noise_stays_within_amount(self) -> None:
+        """Test that noise moves at most AMOUNT percent towards the fill color."""
+        pytest.importorskip("numpy")
+        image = render_fill(parse_fill("noise:10"), BLUE, BLACK, 64, 64)
+
+        assert image is not None
+        low, high = image.getextrema()[2]
+        assert 255 - 26 <= low < high <= 255
+
+    def test_missing_numpy_degrades_to_solid(
+        self, monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """Test that fills are skipped with one warning without NumPy."""
+        monkeypatch.setitem(sys.modules, "numpy", None)
+        monkeypatch.setattr(fills, "_warned_missing_numpy", False)
+        with caplog.at_level(logging.WARNING, logger="classbanners.fills"):
+            assert render_fill(parse_fill("radial"), BLUE, BLACK, 10, 10) is None
+            assert render_fill(parse_fill("linear"), BLUE, BLACK, 10, 10) is None
+
+        assert len(caplog.records) == 1
+        assert "NumPy is not installed" in caplog.text
@@ -0,0 +1,65 @@
+"""Tests for font loading and caching."""
+
+import logging
+from pathlib import Path
+
+import pytest
+
+from classbanners.fonts import FontCache, get_font_cache
+from classbanners.generator import BannerGenerator
+
+
+class TestFontCache:
+    """Tests for FontCache."""
+
+    def test_repeated_lookup_hits_cache(self) -> None:
+        """Test that the same font is only loaded once."""
+        cache = FontCache()
+        first = cache.get(24)
+        second = cache.get(24)
+
+        assert first is second
+        assert cache.stats.misses == 1
+        assert cache.stats.hits == 1
+
+    def test_different_sizes_are_separate_entries(self) -> None:
+        """Test that each size gets its own entry."""
+        cache = FontCache()
+        cache.get(24)
+        cache.get(12)
+        assert len(cache) == 2
+
+    def test_max_entries(self) -> None:
+        """Test that the cache is bounded."""
+        cache = FontCache(max_entries=2)
+        for size in (10, 11, 12):
+            cache.get(size)
+        assert len(cache) == 2
+        assert cache.stats.evictions == 1
+
+    def test_missing_font_warns_once(
+        self, tmp_path: Path, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """Test that a missing custom font falls back and warns only once."""
+        cache = FontCache()
+        missing = tmp_path / "missing.ttf"
+
+        with caplog.at_level(logging.WARNING, logger="classbanners.fonts"):
+            cache.get(20, missing)
+            cache.get(20, missing)
+
+        warnings = [r for r in caplog.records if "Failed to load font" in r.message]
+        assert len(warnings) == 1
+        assert cache.stats.hits == 1
+
+    def test_clear(self) -> None:
+        """Test that clear drops loaded fonts."""
+        cache = FontCache()
+        cache.get(24)
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.stats.misses == 0
+
+    def test_generator_uses_shared_cache_by_default(self) -> None:
+        """Test that generators share the process-wide cache."""
+        assert BannerGenerator().font_cache is get_font_cache()
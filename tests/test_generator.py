@@ -1,12 +1,19 @@
 """Tests for BannerGenerator class."""
 
+import xml.etree.ElementTree as ET
 from pathlib import Path
 from tempfile import TemporaryDirectory
 
-from PIL import Image
+import pytest
+from PIL import Image, ImageChops
 
 from classbanners.banner import Banner, BannerConfig
-from classbanners.generator import BannerGenerator
+from classbanners.canvas import CanvasCache
+from classbanners.fonts import Font
+from classbanners.generator import BannerGenerator, _bisect_size
+from classbanners.icons import IconCache
+from classbanners.manifest import ManifestEntry
+from classbanners.text import TextRunCache
 
 
 class TestBannerGenerator:
@@ -105,3 +112,567 @@ class TestBannerGenerator:
             config = BannerConfig(text_align=align)  # type: ignore[arg-type]
             banner = generator.create_banner("Aligned Text", config=config)
             assert banner.image is not None
+
+
+class TestColorModes:
+    """Tests for reduced-color rendering."""
+
+    @pytest.mark.parametrize("border_color", [None, "#FFFFFF", "#4A90D9"])
+    def test_two_color_banner_is_palettized(self, border_color: str | None) -> None:
+        """Test that two-color banners render in P mode, identical to RGB."""
+        generator = BannerGenerator()
+        border = {"border_width": 4, "border_color": border_color} if border_color else {}
+        config = BannerConfig(**border)  # type: ignore[arg-type]
+        rgb_config = BannerConfig(color_mode="rgb", **border)  # type: ignore[arg-type]
+
+        reduced = generator.create_banner("Palette", "Room 204", config).image
+        full = generator.create_banner("Palette", "Room 204", rgb_config).image
+        assert reduced is not None and full is not None
+
+        assert reduced.mode == "P"
+        assert full.mode == "RGB"
+        assert reduced.convert("RGB").tobytes() == full.tobytes()
+
+    def test_gray_banner_uses_l_mode(self) -> None:
+        """Test that all-gray banners render in L mode, identical to RGB."""
+        generator = BannerGenerator()
+        colors = {"background_color": "#202020", "text_color": "#EEEEEE"}
+        reduced = generator.create_banner("Gray", config=BannerConfig(**colors)).image
+        full = generator.create_banner(
+            "Gray", config=BannerConfig(color_mode="rgb", **colors)
+        ).image
+        assert reduced is not None and full is not None
+
+        assert reduced.mode == "L"
+        assert reduced.convert("RGB").tobytes() == full.tobytes()
+
+    def test_text_over_distinct_border_matches_rgb(self) -> None:
+        """Test that text overlapping a third, border color blends exactly."""
+        generator = BannerGenerator()
+        # Left-aligned without padding, so the title is drawn over the border.
+        colors = {
+            "border_width": 12,
+            "border_color": "#CC0000",
+            "padding": 0,
+            "text_align": "left",
+        }
+        auto = generator.create_banner("Border", config=BannerConfig(**colors)).image
+        full = generator.create_banner(
+            "Border", config=BannerConfig(color_mode="rgb", **colors)
+        ).image
+        assert auto is not None and full is not None
+
+        assert auto.mode == "RGB"
+        assert auto.tobytes() == full.tobytes()
+
+    def test_text_over_icon_matches_rgb(self) -> None:
+        """Test that text overlapping the icon blends exactly."""
+        generator = BannerGenerator()
+        title = "An overlong title running across the icon"
+        # Too wide for the space beside the icon, so centering overlaps it.
+        colors = {"background_color": "#BDB525", "text_color": "#C958BB"}
+        auto = Banner(title, config=BannerConfig(**colors), icon="brain")
+        full = Banner(title, config=BannerConfig(color_mode="rgb", **colors), icon="brain")
+        generator.generate(auto)
+        generator.generate(full)
+        assert auto.image is not None and full.image is not None
+
+        assert auto.image.mode == "RGB"
+        assert auto.image.tobytes() == full.image.tobytes()
+        strips = list(generator.iter_strips(auto, 7))
+        assert b"".join(strip.tobytes() for strip in strips) == full.image.tobytes()
+
+    def test_text_beside_icon_stays_palettized(self) -> None:
+        """Test that an icon clear of the text keeps the palette mode."""
+        config = BannerConfig(background_color="#BDB525", text_color="#C958BB")
+        banner = Banner("Biology", config=config, icon="brain")
+        BannerGenerator().generate(banner)
+        assert banner.image is not None
+        assert banner.image.mode == "P"
+
+    def test_canvas_shared_across_text_colors(self) -> None:
+        """Test that a cached canvas gets the palette of each text color."""
+        generator = BannerGenerator(canvas_cache=CanvasCache())
+        for text_color in ("#FFFFFF", "#FFCC00"):
+            config = BannerConfig(text_color=text_color)
+            reduced = generator.create_banner("Shared", config=config).image
+            full = generator.create_banner(
+                "Shared", config=BannerConfig(text_color=text_color, color_mode="rgb")
+            ).image
+            assert reduced is not None and full is not None
+            assert reduced.convert("RGB").tobytes() == full.tobytes()
+        assert generator.canvas_cache.stats.hits >= 1
+
+    def test_palettized_png_is_smaller(self) -> None:
+        """Test that palettized banners encode to smaller PNGs."""
+        generator = BannerGenerator()
+        reduced = generator.create_banner("Introduction to NLP", "Room 204")
+        full = generator.create_banner(
+            "Introduction to NLP", "Room 204", BannerConfig(color_mode="rgb")
+        )
+
+        assert len(reduced.to_bytes("PNG")) < len(full.to_bytes("PNG"))
+
+
+class TestStrips:
+    """Tests for strip rendering."""
+
+    @pytest.mark.parametrize("border_width", [0, 7])
+    @pytest.mark.parametrize("strip_height", [1, 16, 500])
+    def test_strips_match_full_render(self, border_width: int, strip_height: int) -> None:
+        """Test that stacked strips are pixel-identical to generate()."""
+        generator = BannerGenerator()
+        config = BannerConfig(width=320, height=120, border_width=border_width)
+        full = generator.generate(Banner("Strips", "Room 204", config)).image
+        assert full is not None
+
+        stacked = Image.new(full.mode, full.size)
+        top = 0
+        for strip in generator.iter_strips(Banner("Strips", "Room 204", config), strip_height):
+            assert strip.height <= strip_height
+            stacked.paste(strip, (0, top))
+            top += strip.height
+
+        assert top == config.height
+        assert stacked.tobytes() == full.tobytes()
+
+    @pytest.mark.parametrize("suffix", [".png", ".tif"])
+    def test_render_strips_writes_file(self, suffix: str) -> None:
+        """Test that render_strips writes a file identical to generate()."""
+        generator = BannerGenerator()
+        config = BannerConfig(width=300, height=90, border_width=3)
+        full = generator.generate(Banner("Print", config=config)).image
+        assert full is not None
+
+        with TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "nested" / f"banner{suffix}"
+            generator.render_strips(Banner("Print", config=config), path, strip_height=20)
+
+            assert not path.with_name(path.name + ".tmp").exists()
+            with Image.open(path) as image:
+                assert image.mode == full.mode
+                assert image.convert("RGB").tobytes() == full.convert("RGB").tobytes()
+
+    def test_render_strips_rejects_other_formats(self) -> None:
+        """Test that formats without incremental encoders raise ValueError."""
+        generator = BannerGenerator()
+        with TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "banner.jpg"
+            with pytest.raises(ValueError, match="Strip rendering supports"):
+                generator.render_strips(Banner("Print"), path)
+            assert not path.exists()
+
+    def test_invalid_strip_height_raises_error(self) -> None:
+        """Test that non-positive strip heights raise ValueError."""
+        with pytest.raises(ValueError, match="strip_height must be positive"):
+            list(BannerGenerator().iter_strips(Banner("Print"), 0))
+
+
+class TestFills:
+    """Tests for gradient and pattern backgrounds."""
+
+    def test_fill_is_computed_once_per_spec(self) -> None:
+        """Test that banners sharing a gradient reuse its canvas."""
+        pytest.importorskip("numpy")
+        generator = BannerGenerator(canvas_cache=CanvasCache())
+        config = BannerConfig(
+            width=320, height=80, background_fill="linear", fill_color="#000000"
+        )
+        images = [
+            generator.generate(Banner(title, config=config)).image
+            for title in ("One", "Two", "Three")
+        ]
+
+        assert generator.canvas_cache.stats.misses == 1
+        assert generator.canvas_cache.stats.hits == 2
+        assert images[0] is not None and images[0].mode == "RGB"
+        assert images[0].getpixel((0, 0)) != images[0].getpixel((319, 0))
+
+    def test_fill_changes_canvas_key(self) -> None:
+        """Test that configs differing only in the fill get their own canvas."""
+        pytest.importorskip("numpy")
+        generator = BannerGenerator(canvas_cache=CanvasCache())
+        for spec in ("solid", "radial", "stripes"):
+            generator.generate(Banner("T", config=BannerConfig(background_fill=spec)))
+        assert generator.canvas_cache.stats.misses == 3
+
+    def test_strips_match_full_render_with_fill(self) -> None:
+        """Test that fills are painted per strip in banner coordinates."""
+        pytest.importorskip("numpy")
+        generator = BannerGenerator()
+        config = BannerConfig(
+            width=240, height=90, border_width=3, background_fill="stripes:9:30"
+        )
+        full = generator.generate(Banner("Striped", config=config)).image
+        assert full is not None
+        stacked = Image.new(full.mode, full.size)
+        top = 0
+        for strip in generator.iter_strips(Banner("Striped", config=config), 16):
+            stacked.paste(strip, (0, top))
+            top += strip.height
+
+        assert stacked.tobytes() == full.tobytes()
+
+
+class TestSvg:
+    """Tests for SVG output."""
+
+    def test_text_positions_match_raster(self) -> None:
+        """Test that SVG text starts where the raster text does."""
+        generator = BannerGenerator()
+        config = BannerConfig(width=500, height=150, color_mode="rgb")
+        banner = Banner("Positions", "Room 204", config)
+        root = ET.fromstring(generator.generate_svg(banner))
+        texts = root.findall("{http://www.w3.org/2000/svg}text")
+        assert [text.text for text in texts] == ["Positions", "Room 204"]
+
+        image = generator.generate(banner).image
+        assert image is not None
+        background = Image.new("RGB", image.size, config.background_rgba[:3])
+        ink = ImageChops.difference(image, background).getbbox()
+        assert ink is not None
+        # The SVG origin plus the glyphs' own offset is where raster ink starts.
+        font = generator.font_cache.get(config.font_size)
+        run = generator.text_cache.get("Positions", font)
+        assert run.mask is not None
+        mask_left, mask_top, _, _ = run.mask.getbbox() or (0, 0, 0, 0)
+        ascent = font.getmetrics()[0]  # type: ignore[union-attr]
+        assert int(texts[0].get("x", "")) + run.bbox[0] + mask_left == ink[0]
+        assert int(texts[0].get("y", "")) - ascent + run.bbox[1] + mask_top == ink[1]
+
+    def test_svg_skips_rasterization(self) -> None:
+        """Test that SVG output never rasterizes text runs or canvases."""
+        text_cache = TextRunCache()
+        canvas_cache = CanvasCache()
+        generator = BannerGenerator(text_cache=text_cache, canvas_cache=canvas_cache)
+        generator.generate_svg(Banner("Vector", "only", BannerConfig(border_width=2)))
+
+        assert len(text_cache) == 0
+        assert len(canvas_cache) == 0
+
+    def test_icon_and_embedded_font(self) -> None:
+        """Test that icons and embedded fonts are part of the document."""
+        document = BannerGenerator().generate_svg(
+            Banner("Launch", icon="rocket"), embed_font=True
+        )
+        root = ET.fromstring(document)
+        assert root.find("{http://www.w3.org/2000/svg}style") is not None
+        assert 'mask="url(#icon)"' in document
+        assert 'font-family="banner-font, DejaVu Sans, sans-serif"' in document
+
+    def test_save_svg(self) -> None:
+        """Test that save_svg writes the document, creating directories."""
+        with TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "nested" / "banner.svg"
+            BannerGenerator().save_svg(Banner("Saved"), path)
+            assert path.read_text(encoding="utf-8").startswith("<svg ")
+
+
+class TestFit:
+    """Tests for fit="shrink" font sizing."""
+
+    LONG_TITLE = "Introduction to Unsupervised Learning"
+
+    def _title_font_size(self, generator: BannerGenerator, banner: Banner) -> int:
+        _, font, _ = generator._text_lines(banner)[0]
+        return int(font.size)
+
+    def test_short_title_keeps_font_size(self) -> None:
+        """Test that titles that already fit are not shrunk."""
+        config = BannerConfig(fit="shrink")
+        assert self._title_font_size(BannerGenerator(), Banner("Math", config=config)) == 48
+
+    def test_long_title_shrinks_to_largest_fitting_size(self) -> None:
+        """Test that the chosen size fits and one size larger does not."""
+        generator = BannerGenerator()
+        config = BannerConfig(fit="shrink")
+        size = self._title_font_size(generator, Banner(self.LONG_TITLE, config=config))
+        available = config.width - 2 * config.padding
+
+        def width(font_size: int) -> int:
+            left, _, right, _ = generator.text_cache.measure(
+                self.LONG_TITLE, generator.font_cache.get(font_size)
+            )
+            return right - left
+
+        assert size < 48
+        assert width(size) <= available < width(size + 1)
+
+    def test_shrunk_text_stays_inside_padding(self) -> None:
+        """Test that the rendered title stays within the padding."""
+        config = BannerConfig(fit="shrink", text_align="left", padding=30)
+        image = BannerGenerator().generate(Banner(self.LONG_TITLE, config=config)).image
+        assert image is not None
+        background = Image.new("RGB", image.size, config.background_color)
+        box = ImageChops.difference(image.convert("RGB"), background).getbbox()
+
+        assert box is not None
+        assert box[2] <= config.width - config.padding
+
+    def test_subtitle_is_fitted_too(self) -> None:
+        """Test that a long subtitle also limits the size."""
+        generator = BannerGenerator()
+        config = BannerConfig(fit="shrink")
+        lines = generator._text_lines(Banner("Math", "Room 204 " * 12, config))
+        assert int(lines[1][1].size) == int(lines[0][1].size) // 2
+        assert int(lines[0][1].size) < 48
+
+    def test_search_uses_few_measurements(self) -> None:
+        """Test that sizing a title takes a handful of measurements."""
+        generator = BannerGenerator(text_cache=TextRunCache())
+        config = BannerConfig(fit="shrink", font_size=400, width=2000)
+        measured: list[int] = []
+        measure = generator.text_cache.measure
+
+        def counting_measure(text: str, font: Font) -> tuple[int, int, int, int]:
+            measured.append(int(font.size))
+            return measure(text, font)
+
+        generator.text_cache.measure = counting_measure  # type: ignore[method-assign]
+        generator._text_lines(Banner(self.LONG_TITLE, config=config))
+        assert len(measured) <= 6
+
+    def test_bisect_size(self) -> None:
+        """Test the size search against a known threshold."""
+        for guess in range(1, 41):
+            assert _bisect_size(lambda size: size <= 23, 1, 40, guess) == 23
+        assert _bisect_size(lambda size: False, 2, 40, 10) == 2
+        assert _bisect_size(lambda size: True, 2, 40, 10) == 40
+
+
+class TestIcons:
+    """Tests for icon rendering."""
+
+    def test_icon_is_drawn_beside_text(self) -> None:
+        """Test that the icon is painted and the text moves past it."""
+        generator = BannerGenerator()
+        config = BannerConfig(width=400, height=100, text_align="left", padding=10)
+        plain = generator.generate(Banner("Topic", config=config)).image
+        with_icon = generator.generate(Banner("Topic", config=config, icon="rocket")).image
+        assert plain is not None and with_icon is not None
+
+        background = Image.new("RGB", plain.size, config.background_color)
+        plain_box = ImageChops.difference(plain.convert("RGB"), background).getbbox()
+        icon_box = ImageChops.difference(with_icon.convert("RGB"), background).getbbox()
+        assert plain_box is not None and icon_box is not None
+        assert icon_box[0] >= 10
+        # The text is pushed right by the icon's width plus the padding.
+        shift = 10 + generator.icon_cache.get(generator.icons.path("rocket"), 80).width
+        assert icon_box[2] == plain_box[2] + shift
+
+    @pytest.mark.parametrize("position", ["left", "right"])
+    def test_text_bounds_exclude_icon(self, position: str) -> None:
+        """Test that the text area ends where the icon starts."""
+        generator = BannerGenerator()
+        config = BannerConfig(width=400, height=100, icon_size=60, icon_position=position)
+        icon = generator._place_icon(Banner("Topic", config=config, icon="cloud"))
+        assert icon is not None
+        mask, x, y = icon
+        left, right = generator._text_bounds(config, icon)
+
+        assert mask.size[1] <= 60 and y == (100 - mask.height) // 2
+        if position == "left":
+            assert (x, left, right) == (config.padding, x + mask.width, 400)
+        else:
+            assert (x + mask.width, left, right) == (400 - config.padding, 0, x)
+
+    def test_explicit_icon_size_kept_within_padding(self) -> None:
+        """Test that an icon_size taller than the banner is clamped."""
+        generator = BannerGenerator()
+        config = BannerConfig(width=400, height=100, padding=20, icon_size=300)
+        icon = generator._place_icon(Banner("Topic", config=config, icon="cloud"))
+        assert icon is not None
+        mask, _, y = icon
+
+        assert max(mask.size) <= 60
+        assert y >= 20 and y + mask.height <= 80
+
+    def test_icon_cache_shared_across_banners(self) -> None:
+        """Test that banners with the same icon and size reuse one mask."""
+        cache = IconCache()
+        generator = BannerGenerator(icon_cache=cache)
+        for title in ("One", "Two", "Three"):
+            generator.generate(Banner(title, icon="trophy"))
+
+        assert cache.stats.misses == 1
+        assert cache.stats.hits == 2
+
+    def test_strips_match_full_render_with_icon(self) -> None:
+        """Test that strips split through the icon stay pixel-identical."""
+        generator = BannerGenerator()
+        config = BannerConfig(width=320, height=120, icon_position="right")
+        banner = Banner("Strips", "Room 204", config, icon="brain")
+        full = generator.generate(banner).image
+        assert full is not None
+
+        stacked = Image.new(full.mode, full.size)
+        top = 0
+        for strip in generator.iter_strips(banner, 7):
+            stacked.paste(strip, (0, top))
+            top += strip.height
+        assert stacked.tobytes() == full.tobytes()
+
+    def test_unknown_icon_raises_error(self) -> None:
+        """Test that unknown icon names raise ValueError."""
+        with pytest.raises(ValueError, match="Unknown icon 'nope'"):
+            BannerGenerator().generate(Banner("Topic", icon="nope"))
+
+
+class TestGenerateMany:
+    """Tests for BannerGenerator.generate_many."""
+
+    def test_in_process_batch(self) -> None:
+        """Test rendering a batch without a process pool."""
+        generator = BannerGenerator()
+        items = [("One", "Sub"), ("Two",), Banner(title="Three")]
+        results = list(generator.generate_many(items, jobs=1))
+
+        assert [r.index for r in results] == [0, 1, 2]
+        assert all(r.ok for r in results)
+        assert [r.banner.title for r in results if r.banner] == ["One", "Two", "Three"]
+
+    def test_process_pool_preserves_order(self) -> None:
+        """Test that ordered results come back in input order."""
+        generator = BannerGenerator(BannerConfig(width=300, height=100))
+        items = [(f"Topic {i}", "", None) for i in range(6)]
+        results = list(generator.generate_many(items, jobs=2, chunksize=2))
+
+        assert [r.index for r in results] == list(range(6))
+        for result in results:
+            assert result.banner is not None
+            assert result.banner.image is not None
+            assert result.banner.image.size == (300, 100)
+
+    def test_unordered_results_cover_all_items(self) -> None:
+        """Test that unordered results contain every item exactly once."""
+        generator = BannerGenerator()
+        items = [(f"Topic {i}",) for i in range(5)]
+        results = list(generator.generate_many(items, jobs=2, ordered=False))
+
+        assert sorted(r.index for r in results) == list(range(5))
+
+    def test_invalid_item_does_not_abort_batch(self) -> None:
+        """Test that a bad item is reported without stopping the batch."""
+        generator = BannerGenerator()
+        items = [("Good",), "not a tuple", ("Also good",)]
+        results = list(generator.generate_many(items, jobs=2))  # type: ignore[arg-type]
+
+        assert [r.ok for r in results] == [True, False, True]
+        assert isinstance(results[1].error, TypeError)
+
+    def test_invalid_jobs_raises_error(self) -> None:
+        """Test that non-positive job counts raise ValueError."""
+        generator = BannerGenerator()
+        with pytest.raises(ValueError, match="jobs must be positive"):
+            list(generator.generate_many([("Title",)], jobs=0))
+
+
+class TestIterBanners:
+    """Tests for BannerGenerator.iter_banners."""
+
+    def test_yields_banners_in_order(self) -> None:
+        """Test that every item is rendered and yielded in input order."""
+        generator = BannerGenerator(BannerConfig(width=300, height=100))
+        items = [(f"Topic {i}",) for i in range(5)]
+        results = list(generator.iter_banners(items))
+
+        assert [r.index for r in results] == list(range(5))
+        assert [r.banner.title for r in results if r.banner] == [
+            f"Topic {i}" for i in range(5)
+        ]
+
+    def test_manifest_entries_and_paths(self, tmp_path: Path) -> None:
+        """Test rendering manifest entries, given directly or as a file."""
+        generator = BannerGenerator(BannerConfig(width=300, height=100))
+        entry = ManifestEntry(0, "Intro", overrides={"width": 400})
+        (result,) = generator.iter_banners([entry])
+        assert result.banner is not None
+        assert result.banner.config.width == 400
+
+        manifest = tmp_path / "topics.jsonl"
+        manifest.write_text('{"title": "One"}\n{"title": "Two"}\n')
+        titles = [r.banner.title for r in generator.iter_banners(manifest) if r.banner]
+        assert titles == ["One", "Two"]
+
+        titles = [
+            r.banner.title for r in generator.iter_banners(str(manifest)) if r.banner
+        ]
+        assert titles == ["One", "Two"]
+
+    def test_keeps_every_worker_busy(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a small prefetch still submits a chunk per worker."""
+        generator = BannerGenerator(BannerConfig(width=300, height=100))
+        seen = {}
+        generate_many = generator.generate_many
+
+        def recording(items, **kwargs):
+            seen.update(kwargs)
+            return generate_many(items, **kwargs)
+
+        monkeypatch.setattr(generator, "generate_many", recording)
+        results = list(generator.iter_banners([("A",), ("B",)], jobs=2, chunksize=4))
+
+        assert [r.ok for r in results] == [True, True]
+        assert seen["max_in_flight"] == 2
+
+    def test_image_released_after_save(self, tmp_path: Path) -> None:
+        """Test that saving or encoding a streamed banner drops its pixels."""
+        generator = BannerGenerator(BannerConfig(width=300, height=100))
+        saved, encoded = (r.banner for r in generator.iter_banners([("A",), ("B",)]))
+        assert saved is not None and encoded is not None
+
+        assert saved.image is not None
+        saved.save(tmp_path / "a.png")
+        assert saved.image is None
+        assert (tmp_path / "a.png").exists()
+
+        assert encoded.to_bytes("PNG").startswith(b"\x89PNG")
+        assert encoded.image is None
+
+    def test_release_disabled(self) -> None:
+        """Test that release=False keeps the image after encoding."""
+        generator = BannerGenerator(BannerConfig(width=300, height=100))
+        (result,) = generator.iter_banners([("A",)], release=False)
+        assert result.banner is not None
+        result.banner.to_bytes("PNG")
+        assert result.banner.image is not None
+
+    @pytest.mark.parametrize("prefetch", [0, 1, 3])
+    def test_source_pulled_lazily(self, prefetch: int) -> None:
+        """Test that only about ``prefetch`` items are read ahead."""
+        generator = BannerGenerator(BannerConfig(width=300, height=100))
+        pulled = []
+
+        def source():
+            for i in range(50):
+                pulled.append(i)
+                yield (f"Topic {i}",)
+
+        stream = generator.iter_banners(source(), prefetch=prefetch)
+        for consumed, _ in enumerate(stream, 1):
+            if consumed == 5:
+                break
+        stream.close()
+        # Items in the queue, plus one each held by the producer and the
+        # generate_many loop.
+        assert len(pulled) <= 5 + prefetch + 2
+
+    def test_source_error_raised_after_earlier_items(self) -> None:
+        """Test that an error from the source surfaces after prior banners."""
+        generator = BannerGenerator(BannerConfig(width=300, height=100))
+
+        def source():
+            yield ("One",)
+            raise OSError("manifest went away")
+
+        seen = []
+        with pytest.raises(OSError, match="manifest went away"):
+            for result in generator.iter_banners(source()):
+                seen.append(result.index)
+        assert seen == [0]
+
+    def test_negative_prefetch_raises_error(self) -> None:
+        """Test that a negative prefetch depth is rejected."""
+        generator = BannerGenerator()
+        with pytest.raises(ValueError, match="prefetch"):
+            list(generator.iter_banners([("Title",)], prefetch=-1))
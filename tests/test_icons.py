@@ -0,0 +1,93 @@
+"""Tests for the icon registry and scaled icon cache."""
+
+import os
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from classbanners.icons import IconCache, IconRegistry, get_icon_registry
+
+
+def _write_icon(path: Path, size: int = 64) -> Path:
+    image = Image.new("LA", (size, size), (0, 0))
+    image.paste((0, 255), (size // 4, size // 4, size * 3 // 4, size * 3 // 4))
+    image.save(path)
+    return path
+
+
+class TestIconRegistry:
+    """Tests for IconRegistry."""
+
+    def test_bundled_icons(self) -> None:
+        """Test that the bundled icons cover the topics manifest."""
+        registry = get_icon_registry()
+        for name in ("brain", "chart", "cloud", "rocket", "trophy"):
+            assert name in registry
+            assert registry.path(name).is_file()
+
+    def test_bundled_icons_ship_with_the_package(self) -> None:
+        """Test that the default icons are package data, not a checkout path."""
+        import classbanners
+
+        package = Path(classbanners.__file__).parent
+        assert IconRegistry().directory == package / "assets" / "icons"
+
+    def test_unknown_icon_raises_error(self, tmp_path: Path) -> None:
+        """Test that unknown names raise ValueError listing the icons."""
+        _write_icon(tmp_path / "star.png")
+        with pytest.raises(ValueError, match="Unknown icon 'moon' \\(available: star\\)"):
+            IconRegistry(tmp_path).path("moon")
+
+    def test_refresh_picks_up_new_icons(self, tmp_path: Path) -> None:
+        """Test that refresh() rescans the directory."""
+        registry = IconRegistry(tmp_path)
+        assert registry.names == []
+        _write_icon(tmp_path / "star.png")
+        assert "star" not in registry
+        registry.refresh()
+        assert registry.names == ["star"]
+
+
+class TestIconCache:
+    """Tests for IconCache."""
+
+    def test_scales_longer_side(self, tmp_path: Path) -> None:
+        """Test that masks are scaled to the requested size."""
+        path = tmp_path / "wide.png"
+        Image.new("LA", (80, 40), (0, 255)).save(path)
+        mask = IconCache().get(path, 20)
+
+        assert mask.mode == "L"
+        assert mask.size == (20, 10)
+
+    def test_decodes_once_and_scales_once_per_size(self, tmp_path: Path) -> None:
+        """Test that each (icon, size) pair is resampled only once."""
+        path = _write_icon(tmp_path / "star.png")
+        cache = IconCache()
+        first = cache.get(path, 32)
+        assert cache.get(path, 32) is first
+        cache.get(path, 16)
+
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 2
+        assert len(cache._sources) == 1
+
+    def test_modified_icon_is_reloaded(self, tmp_path: Path) -> None:
+        """Test that editing an icon file invalidates its masks."""
+        path = _write_icon(tmp_path / "star.png")
+        cache = IconCache()
+        before = cache.get(path, 32)
+        Image.new("LA", (64, 64), (0, 255)).save(path)
+        mtime = path.stat().st_mtime_ns + 1_000_000_000
+        os.utime(path, ns=(mtime, mtime))
+        after = cache.get(path, 32)
+
+        assert after is not before
+        assert after.getextrema() == (255, 255)
+
+    def test_invalid_size_raises_error(self, tmp_path: Path) -> None:
+        """Test that non-positive sizes raise ValueError."""
+        path = _write_icon(tmp_path / "star.png")
+        with pytest.raises(ValueError, match="Icon size must be positive"):
+            IconCache().get(path, 0)
@@ -0,0 +1,108 @@
+"""Tests for rendering instrumentation."""
+
+from pathlib import Path
+
+from classbanners.banner import BannerConfig
+from classbanners.cache import CacheStats
+from classbanners.generator import BannerGenerator
+from classbanners.instrument import (
+    MetricsSink,
+    RecordingSink,
+    StageProfiler,
+    replay,
+    span,
+)
+
+
+class TestSpan:
+    """Tests for the span helper."""
+
+    def test_disabled_span_records_nothing(self) -> None:
+        """Test that a None sink turns spans into no-ops."""
+        with span(None, "font"):
+            pass
+
+    def test_span_records_cache_outcome(self) -> None:
+        """Test that cache statistics produce hit and miss events."""
+        sink = RecordingSink()
+        stats = CacheStats()
+        with span(sink, "font", stats):
+            stats.misses += 1
+        with span(sink, "font", stats):
+            stats.hits += 1
+
+        events = [name for name, seconds in sink.records if seconds is None]
+        assert events == ["font.miss", "font.hit"]
+
+
+class TestStageProfiler:
+    """Tests for StageProfiler."""
+
+    def test_aggregates_spans(self) -> None:
+        """Test count, total, mean and max per stage."""
+        profiler = StageProfiler()
+        profiler.record_span("encode", 0.1)
+        profiler.record_span("encode", 0.3)
+
+        stats = profiler.stages["encode"]
+        assert stats.count == 2
+        assert abs(stats.total - 0.4) < 1e-9
+        assert abs(stats.mean - 0.2) < 1e-9
+        assert stats.max == 0.3
+        assert "encode" in profiler.report()
+
+    def test_replay_recorded_measurements(self) -> None:
+        """Test forwarding buffered measurements to another sink."""
+        recording = RecordingSink()
+        recording.record_span("draw", 0.5)
+        recording.record_event("text.hit")
+        profiler = StageProfiler()
+        replay(recording.drain(), profiler)
+
+        assert profiler.stages["draw"].count == 1
+        assert profiler.events == {"text.hit": 1}
+        assert recording.records == []
+
+
+class TestGeneratorInstrumentation:
+    """Tests for instrumentation in BannerGenerator and Banner.save."""
+
+    def test_generate_and_save_report_every_stage(self, tmp_path: Path) -> None:
+        """Test that all stages are reported."""
+        profiler = StageProfiler()
+        generator = BannerGenerator(metrics=profiler)
+        banner = generator.create_banner("Title", "Subtitle")
+        banner.save(tmp_path / "banner.png")
+
+        assert set(profiler.stages) == {
+            "font",
+            "canvas",
+            "text",
+            "draw",
+            "encode",
+            "write",
+        }
+        assert profiler.stages["text"].count == 2
+
+    def test_process_pool_measurements_are_returned(self) -> None:
+        """Test that worker measurements reach the caller's sink."""
+        profiler = StageProfiler()
+        generator = BannerGenerator(BannerConfig(width=300, height=100), metrics=profiler)
+        results = list(generator.generate_many([("A",), ("B",)], jobs=2))
+
+        assert all(r.ok for r in results)
+        assert profiler.stages["canvas"].count == 2
+
+    def test_custom_sink(self) -> None:
+        """Test that any MetricsSink subclass receives spans."""
+
+        class Collector(MetricsSink):
+            def __init__(self) -> None:
+                self.stages: list[str] = []
+
+            def record_span(self, stage: str, seconds: float) -> None:
+                self.stages.append(stage)
+
+        sink = Collector()
+        BannerGenerator(metrics=sink).create_banner("Title")
+        assert "canvas" in sink.stages
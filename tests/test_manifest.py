@@ -0,0 +1,143 @@
+"""Tests for manifest reading and output filename templates."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from classbanners.banner import BannerConfig
+from classbanners.manifest import (
+    ManifestEntry,
+    format_output_name,
+    read_manifest,
+    slugify,
+)
+
+TOPICS = Path(__file__).parent.parent / "data" / "topics.json"
+
+
+class TestReadManifest:
+    """Tests for read_manifest."""
+
+    def test_reads_topics_json(self) -> None:
+        """Test streaming the bundled topics manifest."""
+        entries = list(read_manifest(TOPICS))
+
+        assert len(entries) == 24
+        assert entries[0].number == 1
+        assert entries[0].title == "Course Overview and Expectations"
+        assert entries[0].icon == "target"
+
+    def test_reads_top_level_array(self, tmp_path: Path) -> None:
+        """Test a JSON manifest that is a bare array."""
+        path = tmp_path / "rows.json"
+        path.write_text(json.dumps([{"title": "A"}, {"title": "B, [x]"}]))
+
+        assert [e.title for e in read_manifest(path)] == ["A", "B, [x]"]
+
+    def test_reads_large_json_across_chunks(self, tmp_path: Path) -> None:
+        """Test that rows spanning read chunks are decoded correctly."""
+        rows = [{"title": f"Topic {i}", "subtitle": "x" * 500} for i in range(300)]
+        path = tmp_path / "big.json"
+        path.write_text(json.dumps({"topics": rows}))
+
+        entries = list(read_manifest(path))
+        assert len(entries) == 300
+        assert entries[-1].title == "Topic 299"
+
+    def test_reads_jsonl(self, tmp_path: Path) -> None:
+        """Test a JSON Lines manifest."""
+        path = tmp_path / "rows.jsonl"
+        path.write_text('{"title": "A"}\n\n{"title": "B", "subtitle": "S"}\n')
+
+        entries = list(read_manifest(path))
+        assert [(e.title, e.subtitle) for e in entries] == [("A", ""), ("B", "S")]
+
+    def test_reads_csv_with_overrides(self, tmp_path: Path) -> None:
+        """Test a CSV manifest with per-row config overrides."""
+        path = tmp_path / "rows.csv"
+        path.write_text("number,title,width,background_color\n3,Lab,640,#FF0000\n")
+
+        (entry,) = read_manifest(path)
+        config = entry.config(BannerConfig())
+        assert entry.number == 3
+        assert config.width == 640
+        assert config.background_color == "#FF0000"
+
+    def test_unsupported_format_raises_error(self, tmp_path: Path) -> None:
+        """Test that unknown extensions raise ValueError."""
+        with pytest.raises(ValueError, match="Unsupported manifest format"):
+            list(read_manifest(tmp_path / "rows.xml"))
+
+    def test_missing_title_is_a_row_error(self, tmp_path: Path) -> None:
+        """Test that a row without a title fails alone, when configured."""
+        path = tmp_path / "rows.jsonl"
+        path.write_text('{"subtitle": "S"}\n{"title": "B"}\n')
+
+        bad, good = read_manifest(path)
+        assert bad.error == "Manifest row 0 has no title"
+        with pytest.raises(ValueError, match="row 0 has no title"):
+            bad.config(BannerConfig())
+        assert good.error is None
+        assert good.config(BannerConfig()) == BannerConfig()
+
+    def test_non_object_rows_are_row_errors(self, tmp_path: Path) -> None:
+        """Test that rows that are not objects are reported with their number."""
+        path = tmp_path / "rows.json"
+        path.write_text(json.dumps([1, {"title": "A"}, ["B"], {"title": "C", "number": "x"}]))
+
+        entries = list(read_manifest(path))
+        assert [e.error for e in entries] == [
+            "Manifest row 0 is not an object",
+            None,
+            "Manifest row 2 is not an object",
+            "Manifest row 3 has an invalid number 'x'",
+        ]
+
+    def test_finds_rows_array_structurally(self, tmp_path: Path) -> None:
+        """Test that brackets in other members do not hide the rows array."""
+        path = tmp_path / "course.json"
+        path.write_text(
+            json.dumps(
+                {
+                    "course": "ML [2026]",
+                    "weeks": 12,
+                    "meta": {"tags": ["a", "b"]},
+                    "topics": [{"title": "A"}, {"title": "B"}],
+                }
+            )
+        )
+
+        assert [e.title for e in read_manifest(path)] == ["A", "B"]
+
+    def test_json_without_rows_raises_error(self, tmp_path: Path) -> None:
+        """Test that a JSON document holding no array is rejected."""
+        path = tmp_path / "rows.json"
+        for document in ('{"title": "A"}', '"A"', ""):
+            path.write_text(document)
+            with pytest.raises(ValueError, match="must be a JSON array"):
+                list(read_manifest(path))
+
+
+class TestOutputTemplates:
+    """Tests for output filename templates."""
+
+    def test_slugify(self) -> None:
+        """Test slug generation."""
+        assert slugify("Linear Learner: How It Works") == "linear-learner-how-it-works"
+
+    def test_default_style_template(self) -> None:
+        """Test number formatting and the slug filter."""
+        entry = ManifestEntry(index=0, title="Lab: PCA", number=7)
+        assert format_output_name("{number:02d}-{title|slug}.png", entry) == "07-lab-pca.png"
+
+    def test_number_defaults_to_position(self) -> None:
+        """Test that entries without a number use their 1-based position."""
+        entry = ManifestEntry(index=4, title="Intro")
+        assert format_output_name("{number}-{title|upper}", entry) == "5-INTRO"
+
+    def test_unknown_filter_raises_error(self) -> None:
+        """Test that unknown filters raise ValueError."""
+        entry = ManifestEntry(index=0, title="Intro")
+        with pytest.raises(ValueError, match="Unknown template filter"):
+            format_output_name("{title|reverse}", entry)
@@ -0,0 +1,73 @@
+"""Tests for reduced-color rendering plans."""
+
+import pytest
+from PIL import Image
+
+from classbanners.palette import blend, plan_colors
+
+BLACK = (0, 0, 0)
+WHITE = (255, 255, 255)
+BLUE = (0x4A, 0x90, 0xD9)
+
+
+class TestPlanColors:
+    """Tests for choosing the image mode of a banner."""
+
+    def test_two_colors_use_palette_ramp(self) -> None:
+        """Test that background and text colors become a 256-entry ramp."""
+        plan = plan_colors(BLUE, WHITE, None)
+
+        assert plan.mode == "P"
+        assert (plan.background, plan.text) == (0, 255)
+        assert plan.palette is not None
+        assert plan.palette[:3] == (0x4A, 0x90, 0xD9)
+        assert plan.palette[-3:] == (0xFF, 0xFF, 0xFF)
+
+    def test_border_matching_text_shares_ramp(self) -> None:
+        """Test that a border in the text color reuses the ramp's end."""
+        plan = plan_colors(BLUE, WHITE, WHITE)
+
+        assert plan.mode == "P"
+        assert plan.border == 255
+
+    def test_distinct_border_uses_rgb(self) -> None:
+        """Test that a third color falls back to exact RGB fills."""
+        plan = plan_colors(BLUE, WHITE, (0xCC, 0, 0))
+
+        assert plan.mode == "RGB"
+        assert plan.border == (0xCC, 0x00, 0x00)
+        assert plan.palette is None
+
+    def test_grays_use_l_mode(self) -> None:
+        """Test that all-gray colors render in L mode."""
+        plan = plan_colors(BLACK, (128, 128, 128), WHITE)
+
+        assert plan.mode == "L"
+        assert (plan.background, plan.text, plan.border) == (0, 128, 255)
+        assert plan.palette is None
+
+    def test_rgb_mode_forces_full_color(self) -> None:
+        """Test that color_mode='rgb' keeps RGB fills."""
+        plan = plan_colors(BLACK, WHITE, None, color_mode="rgb")
+
+        assert plan.mode == "RGB"
+        assert plan.text == (255, 255, 255)
+
+    def test_unknown_color_mode_raises_error(self) -> None:
+        """Test that unknown color modes raise ValueError."""
+        with pytest.raises(ValueError, match="color_mode must be one of"):
+            plan_colors(BLACK, WHITE, None, color_mode="cmyk")
+
+
+class TestBlend:
+    """Tests for the channel blend used to build palette ramps."""
+
+    def test_matches_pillow_compositing(self) -> None:
+        """Test that blend reproduces Pillow's masked fill exactly."""
+        mask = Image.new("L", (256, 1))
+        mask.putdata(list(range(256)))
+        for background, foreground in ((0, 255), (74, 255), (217, 3)):
+            image = Image.new("L", (256, 1), background)
+            image.paste(foreground, (0, 0, 256, 1), mask)
+            expected = list(image.tobytes())
+            assert [blend(background, foreground, a) for a in range(256)] == expected
@@ -0,0 +1,110 @@
+"""Tests for the pipelined render/encode/write executor."""
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from classbanners.banner import Banner
+from classbanners.generator import BannerGenerator
+from classbanners.instrument import StageProfiler
+from classbanners.pipeline import BannerPipeline
+
+
+def _items(tmp_path: Path, count: int) -> list[tuple[Banner, Path]]:
+    return [(Banner(f"Topic {i}"), tmp_path / f"{i:03d}.png") for i in range(count)]
+
+
+class TestBannerPipeline:
+    """Tests for BannerPipeline."""
+
+    def test_writes_every_banner(self, tmp_path: Path) -> None:
+        """Test that every item is rendered, encoded and written."""
+        generator = BannerGenerator()
+        pipeline = BannerPipeline(generator, encode_threads=3, write_threads=2)
+        results = list(pipeline.run(_items(tmp_path, 12)))
+
+        assert sorted(result.index for result in results) == list(range(12))
+        assert all(result.ok for result in results)
+        expected = generator.generate(Banner("Topic 5")).image
+        assert expected is not None
+        with Image.open(tmp_path / "005.png") as image:
+            assert image.convert("RGB").tobytes() == expected.convert("RGB").tobytes()
+        assert results[0].nbytes == results[0].path.stat().st_size
+
+    def test_reports_stage_utilization(self, tmp_path: Path) -> None:
+        """Test that each stage reports its items and busy time."""
+        pipeline = BannerPipeline(BannerGenerator(), encode_threads=2)
+        list(pipeline.run(_items(tmp_path, 5)))
+        report = pipeline.report
+
+        assert list(report.stages) == ["render", "encode", "write"]
+        for stats in report.stages.values():
+            assert stats.items == 5
+            assert stats.busy > 0
+            assert 0 < stats.utilization <= 1
+        assert report.stages["encode"].workers == 2
+        assert report.format().startswith("Stages: render")
+
+    def test_queues_are_bounded(self, tmp_path: Path) -> None:
+        """Test that a slow consumer stalls rendering instead of buffering."""
+        pulled = 0
+
+        def items() -> Iterator[tuple[Banner, Path]]:
+            nonlocal pulled
+            for item in _items(tmp_path, 50):
+                pulled += 1
+                yield item
+
+        pipeline = BannerPipeline(
+            BannerGenerator(), encode_threads=1, write_threads=1, queue_size=1
+        )
+        results = pipeline.run(items())
+        next(results)
+        # Render, encode and write each hold an item, plus one per queue.
+        assert pulled < 10
+        results.close()
+
+    def test_failures_are_reported_per_item(self, tmp_path: Path) -> None:
+        """Test that a failing write does not abort the batch."""
+        blocker = tmp_path / "blocker"
+        blocker.write_text("not a directory")
+        items = [
+            (Banner("Good"), tmp_path / "good.png"),
+            (Banner("Bad"), blocker / "bad.png"),
+            (Banner("Unknown format"), tmp_path / "banner.xyz"),
+        ]
+        pipeline = BannerPipeline(BannerGenerator())
+        results = {result.title: result for result in pipeline.run(items)}
+
+        assert results["Good"].ok
+        assert isinstance(results["Bad"].error, OSError)
+        assert isinstance(results["Unknown format"].error, ValueError)
+
+    def test_item_source_errors_propagate(self, tmp_path: Path) -> None:
+        """Test that errors reading the items surface after earlier items."""
+
+        def items() -> Iterator[tuple[Banner, Path]]:
+            yield Banner("First"), tmp_path / "first.png"
+            raise ValueError("bad manifest")
+
+        results = []
+        with pytest.raises(ValueError, match="bad manifest"):
+            for result in BannerPipeline(BannerGenerator()).run(items()):
+                results.append(result)
+        assert [result.title for result in results] == ["First"]
+
+    def test_metrics_see_encode_and_write(self, tmp_path: Path) -> None:
+        """Test that encode and write spans reach the generator's sink."""
+        profiler = StageProfiler()
+        list(BannerPipeline(BannerGenerator(metrics=profiler)).run(_items(tmp_path, 3)))
+        assert profiler.stages["encode"].count == 3
+        assert profiler.stages["write"].count == 3
+
+    def test_invalid_settings(self) -> None:
+        """Test that non-positive thread counts raise ValueError."""
+        with pytest.raises(ValueError, match="Thread counts must be positive"):
+            BannerPipeline(BannerGenerator(), encode_threads=0)
+        with pytest.raises(ValueError, match="queue_size must be positive"):
+            BannerPipeline(BannerGenerator(), queue_size=0)
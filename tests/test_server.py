@@ -0,0 +1,230 @@
+"""Tests for the HTTP render service."""
+
+import asyncio
+import io
+import json
+import urllib.error
+import urllib.request
+from collections.abc import Awaitable
+from typing import Callable, TypeVar
+
+import pytest
+from PIL import Image
+
+from classbanners.banner import BannerConfig
+from classbanners.generator import BannerGenerator
+from classbanners.server import BannerServer, HTTPError, parse_render_request
+
+T = TypeVar("T")
+
+
+def _with_server(
+    test: Callable[[BannerServer], Awaitable[T]], **kwargs: int
+) -> T:
+    """Run ``test`` against a server listening on a free localhost port."""
+
+    async def run() -> T:
+        server = BannerServer(
+            BannerGenerator(BannerConfig(width=400, height=100)), port=0, **kwargs
+        )
+        await server.start()
+        try:
+            return await test(server)
+        finally:
+            await server.close()
+
+    return asyncio.run(run())
+
+
+async def _fetch(request: urllib.request.Request | str) -> tuple[int, dict, bytes]:
+    """Perform a blocking HTTP request off the event loop."""
+
+    def fetch() -> tuple[int, dict, bytes]:
+        try:
+            with urllib.request.urlopen(request, timeout=10) as response:
+                return response.status, dict(response.headers), response.read()
+        except urllib.error.HTTPError as exc:
+            return exc.code, dict(exc.headers), exc.read()
+
+    return await asyncio.get_running_loop().run_in_executor(None, fetch)
+
+
+class TestParseRenderRequest:
+    """Tests for request parameter parsing."""
+
+    def test_config_overrides(self) -> None:
+        """Test that config fields and aliases override the defaults."""
+        request = parse_render_request(
+            {"title": "T", "width": "300", "background": "#FF0000", "format": "webp"},
+            BannerConfig(),
+        )
+        assert request.banner.config.width == 300
+        assert request.banner.config.background_color == "#FF0000"
+        assert request.image_format == "WEBP"
+
+    def test_missing_title(self) -> None:
+        """Test that a title is required."""
+        with pytest.raises(HTTPError, match="Missing 'title'"):
+            parse_render_request({}, BannerConfig())
+
+    def test_invalid_values(self) -> None:
+        """Test that invalid config values are client errors."""
+        with pytest.raises(HTTPError, match="Invalid value for 'width'"):
+            parse_render_request({"title": "T", "width": "wide"}, BannerConfig())
+        with pytest.raises(HTTPError, match="text_color must be a valid hex color"):
+            parse_render_request({"title": "T", "color": "red"}, BannerConfig())
+
+    def test_font_path_rejected(self) -> None:
+        """Test that clients cannot point the renderer at server files."""
+        for name in ("font", "font_path"):
+            with pytest.raises(HTTPError, match="'font_path' cannot be set"):
+                parse_render_request({"title": "T", name: "/dev/zero"}, BannerConfig())
+
+
+class TestBannerServer:
+    """Tests for BannerServer against localhost."""
+
+    def test_get_returns_png(self) -> None:
+        """Test rendering a banner with a GET request."""
+
+        async def test(server: BannerServer) -> tuple[int, dict, bytes]:
+            return await _fetch(
+                f"http://127.0.0.1:{server.port}/banner?title=Math+101&subtitle=Room"
+            )
+
+        status, headers, body = _with_server(test)
+        assert status == 200
+        assert headers["Content-Type"] == "image/png"
+        assert Image.open(io.BytesIO(body)).size == (400, 100)
+
+    def test_post_json(self) -> None:
+        """Test rendering a banner from a JSON body."""
+
+        async def test(server: BannerServer) -> tuple[int, dict, bytes]:
+            request = urllib.request.Request(
+                f"http://127.0.0.1:{server.port}/banner.webp",
+                data=json.dumps({"title": "Lab", "height": 150}).encode(),
+                headers={"Content-Type": "application/json"},
+            )
+            return await _fetch(request)
+
+        status, headers, body = _with_server(test)
+        assert status == 200
+        assert headers["Content-Type"] == "image/webp"
+        assert Image.open(io.BytesIO(body)).size == (400, 150)
+
+    def test_get_svg(self) -> None:
+        """Test that /banner.svg returns a vector banner."""
+
+        async def test(server: BannerServer) -> tuple[int, dict, bytes]:
+            return await _fetch(f"http://127.0.0.1:{server.port}/banner.svg?title=Vector")
+
+        status, headers, body = _with_server(test)
+        assert status == 200
+        assert headers["Content-Type"] == "image/svg+xml"
+        assert body.startswith(b'<svg xmlns="http://www.w3.org/2000/svg" width="400"')
+        assert b">Vector</text>" in body
+
+    def test_if_none_match_returns_304(self) -> None:
+        """Test revalidation with the returned ETag."""
+
+        async def test(server: BannerServer) -> tuple[int, int]:
+            url = f"http://127.0.0.1:{server.port}/banner?title=Cached"
+            status, headers, _ = await _fetch(url)
+            request = urllib.request.Request(
+                url, headers={"If-None-Match": headers["ETag"]}
+            )
+            revalidated, _, _ = await _fetch(request)
+            return status, revalidated
+
+        assert _with_server(test) == (200, 304)
+
+    def test_errors(self) -> None:
+        """Test client errors and unknown paths."""
+
+        async def test(server: BannerServer) -> tuple[int, int]:
+            base = f"http://127.0.0.1:{server.port}"
+            missing, _, _ = await _fetch(f"{base}/banner")
+            not_found, _, _ = await _fetch(f"{base}/other?title=T")
+            return missing, not_found
+
+        assert _with_server(test) == (400, 404)
+
+    def test_backpressure_returns_503(self) -> None:
+        """Test that requests beyond the in-flight limit are rejected."""
+
+        async def test(server: BannerServer) -> tuple[int, dict, bytes]:
+            server.in_flight = server.max_in_flight
+            return await _fetch(f"http://127.0.0.1:{server.port}/banner?title=Busy")
+
+        status, headers, _ = _with_server(test, max_in_flight=1)
+        assert status == 503
+        assert headers["Retry-After"] == "1"
+
+    def test_busy_server_skips_etag(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that no files are hashed for requests rejected with 503."""
+        hashed = []
+        monkeypatch.setattr(
+            "classbanners.server.render_key", lambda *args: hashed.append(args)
+        )
+
+        async def test(server: BannerServer) -> tuple[int, dict, bytes]:
+            server.in_flight = server.max_in_flight
+            request = urllib.request.Request(
+                f"http://127.0.0.1:{server.port}/banner?title=Busy",
+                headers={"If-None-Match": '"stale"'},
+            )
+            return await _fetch(request)
+
+        status, _, _ = _with_server(test, max_in_flight=1)
+        assert status == 503
+        assert hashed == []
+
+    def test_render_failure_returns_500(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that unexpected render errors become a 500 response."""
+
+        def fail(request: object) -> bytes:
+            raise OSError("invalid argument")
+
+        async def test(server: BannerServer) -> tuple[int, dict, bytes]:
+            monkeypatch.setattr(server, "_render", fail)
+            return await _fetch(f"http://127.0.0.1:{server.port}/banner?title=Hi")
+
+        status, _, body = _with_server(test)
+        assert status == 500
+        assert b"Internal Server Error" in body
+
+    def test_oversized_text_and_icons_rejected(self) -> None:
+        """Test that font and icon sizes are bounded by the banner height."""
+
+        async def test(server: BannerServer) -> list[int]:
+            base = f"http://127.0.0.1:{server.port}/banner?title=Hi"
+            statuses = []
+            for query in ("&font_size=50000", "&icon_size=20000&icon=brain"):
+                status, _, _ = await _fetch(base + query)
+                statuses.append(status)
+            return statuses
+
+        assert _with_server(test) == [400, 400]
+
+    @pytest.mark.parametrize("length", ["-5", "99999999", "abc"])
+    def test_unread_body_closes_connection(self, length: str) -> None:
+        """Test that a rejected body is not parsed as a second request."""
+        smuggled = b"GET /banner?title=SMUGGLED HTTP/1.1\r\nHost: x\r\n\r\n"
+
+        async def test(server: BannerServer) -> bytes:
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+            writer.write(
+                b"POST /banner HTTP/1.1\r\nHost: x\r\n"
+                + f"Content-Length: {length}\r\n\r\n".encode()
+                + smuggled
+            )
+            await writer.drain()
+            response = await asyncio.wait_for(reader.read(), timeout=10)
+            writer.close()
+            return response
+
+        response = _with_server(test)
+        assert response.startswith((b"HTTP/1.1 400", b"HTTP/1.1 413"))
+        assert b"Connection: close" in response
+        assert response.count(b"HTTP/1.1") == 1
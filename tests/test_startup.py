@@ -0,0 +1,67 @@
+"""Startup-time regression tests.
+
+These run ``python -X importtime`` in a subprocess and check that code paths
+which only parse arguments or validate configuration never import Pillow.
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+
+def _imported_modules(*args: str) -> dict[str, int]:
+    """Run Python with -X importtime and return cumulative microseconds per module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    modules: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        modules[parts[2].strip()] = int(parts[1])
+    return modules
+
+
+def _pillow_modules(modules: dict[str, int]) -> list[str]:
+    return [name for name in modules if name == "PIL" or name.startswith("PIL.")]
+
+
+class TestStartup:
+    """Tests that Pillow is only loaded once rendering starts."""
+
+    def test_package_import_skips_pillow(self) -> None:
+        """Test that importing the package does not load Pillow."""
+        modules = _imported_modules("-c", "import classbanners")
+        assert "classbanners" in modules
+        assert _pillow_modules(modules) == []
+
+    @pytest.mark.parametrize(
+        "argv",
+        [
+            ["--help"],
+            ["batch", "--help"],
+            ["Title", "--background", "not-a-color"],
+        ],
+    )
+    def test_cli_paths_skip_pillow(self, argv: list[str]) -> None:
+        """Test that help and config validation do not load Pillow."""
+        modules = _imported_modules("-m", "classbanners.cli", *argv)
+        assert "classbanners.banner" in modules
+        assert _pillow_modules(modules) == []
+
+    def test_daemon_client_skips_pillow(self) -> None:
+        """Test that talking to a render daemon does not load Pillow."""
+        modules = _imported_modules("-c", "import classbanners.daemon")
+        assert _pillow_modules(modules) == []
+
+    def test_rendering_loads_pillow(self) -> None:
+        """Test that the generator still imports Pillow when used."""
+        code = "from classbanners import BannerGenerator"
+        assert "PIL.Image" in _imported_modules("-c", code)
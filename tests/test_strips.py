@@ -0,0 +1,119 @@
+"""Tests for the incremental strip writers."""
+
+import io
+import os
+
+import pytest
+from PIL import Image, ImageChops
+
+from classbanners.strips import PNGStripWriter, TIFFStripWriter, open_strip_writer
+
+
+def _gradient(width: int, height: int, mode: str = "RGB") -> Image.Image:
+    """Return an image whose rows all differ."""
+    image = Image.new(mode, (width, height))
+    channels = len(mode)
+    image.putdata(
+        [
+            tuple((x + 3 * y + c) % 256 for c in range(channels))
+            if channels > 1
+            else (x + 3 * y) % 256
+            for y in range(height)
+            for x in range(width)
+        ]
+    )
+    return image
+
+
+def _write_strips(writer_class: type, image: Image.Image, strip_height: int) -> bytes:
+    buffer = io.BytesIO()
+    writer = writer_class(buffer, image.width, image.height, image.mode)
+    for top in range(0, image.height, strip_height):
+        bottom = min(top + strip_height, image.height)
+        writer.write(image.crop((0, top, image.width, bottom)))
+    writer.close()
+    return buffer.getvalue()
+
+
+class TestStripWriters:
+    """Tests for PNG and TIFF strip output."""
+
+    @pytest.mark.parametrize("writer_class", [PNGStripWriter, TIFFStripWriter])
+    @pytest.mark.parametrize("mode", ["L", "RGB", "RGBA"])
+    def test_round_trip(self, writer_class: type, mode: str) -> None:
+        """Test that the decoded file matches the source image."""
+        image = _gradient(37, 23, mode)
+        data = _write_strips(writer_class, image, 5)
+
+        with Image.open(io.BytesIO(data)) as decoded:
+            assert decoded.mode == mode
+            assert decoded.size == image.size
+            assert ImageChops.difference(decoded, image).getbbox() is None
+
+    @pytest.mark.parametrize("writer_class", [PNGStripWriter, TIFFStripWriter])
+    def test_palette_round_trip(self, writer_class: type) -> None:
+        """Test that P-mode strips keep their indices and palette."""
+        image = _gradient(40, 20, "L")
+        palette = [channel for i in range(256) for channel in (i, 255 - i, i // 2)]
+        buffer = io.BytesIO()
+        writer = writer_class(buffer, 40, 20, "P", palette)
+        for top in (0, 8, 16):
+            strip = image.crop((0, top, 40, min(top + 8, 20)))
+            strip.putpalette(palette)
+            writer.write(strip)
+        writer.close()
+
+        with Image.open(io.BytesIO(buffer.getvalue())) as decoded:
+            assert decoded.mode == "P"
+            assert decoded.tobytes() == image.tobytes()
+            assert decoded.getpalette()[:768] == palette
+
+    def test_palette_requires_p_mode(self) -> None:
+        """Test that palettes are only accepted for P mode."""
+        with pytest.raises(ValueError, match="palette is required"):
+            PNGStripWriter(io.BytesIO(), 10, 10, "P")
+        with pytest.raises(ValueError, match="palette is required"):
+            PNGStripWriter(io.BytesIO(), 10, 10, "RGB", [0, 0, 0])
+
+    def test_png_splits_large_output_into_chunks(self) -> None:
+        """Test that long streams are written as several IDAT chunks."""
+        image = Image.frombytes("RGB", (512, 512), os.urandom(512 * 512 * 3))
+        data = _write_strips(PNGStripWriter, image, 64)
+
+        assert data.count(b"IDAT") > 1
+        with Image.open(io.BytesIO(data)) as decoded:
+            assert ImageChops.difference(decoded, image).getbbox() is None
+
+    def test_missing_rows_raise_error(self) -> None:
+        """Test that closing an incomplete image raises ValueError."""
+        writer = PNGStripWriter(io.BytesIO(), 10, 10)
+        writer.write(Image.new("RGB", (10, 5)))
+        with pytest.raises(ValueError, match="Only 5 of 10 rows"):
+            writer.close()
+
+    def test_overlong_strips_raise_error(self) -> None:
+        """Test that writing past the bottom edge raises ValueError."""
+        writer = PNGStripWriter(io.BytesIO(), 10, 10)
+        with pytest.raises(ValueError, match="past the bottom"):
+            writer.write(Image.new("RGB", (10, 11)))
+
+    def test_mismatched_strip_raises_error(self) -> None:
+        """Test that strips of the wrong width or mode raise ValueError."""
+        writer = PNGStripWriter(io.BytesIO(), 10, 10)
+        with pytest.raises(ValueError, match="Expected a RGB strip"):
+            writer.write(Image.new("RGB", (9, 5)))
+        with pytest.raises(ValueError, match="Expected a RGB strip"):
+            writer.write(Image.new("L", (10, 5)))
+
+    def test_tiff_rejects_uneven_strips(self) -> None:
+        """Test that only the last TIFF strip may be shorter."""
+        writer = TIFFStripWriter(io.BytesIO(), 10, 10)
+        writer.write(Image.new("RGB", (10, 3)))
+        writer.write(Image.new("RGB", (10, 2)))
+        with pytest.raises(ValueError, match="Only the last TIFF strip"):
+            writer.write(Image.new("RGB", (10, 2)))
+
+    def test_unsupported_format_raises_error(self) -> None:
+        """Test that formats without a strip writer raise ValueError."""
+        with pytest.raises(ValueError, match="supports PNG, TIFF"):
+            open_strip_writer(io.BytesIO(), "JPEG", 10, 10)
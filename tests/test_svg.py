@@ -0,0 +1,121 @@
+"""Tests for the SVG element builders."""
+
+import sys
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import pytest
+
+from classbanners import svg
+from classbanners.banner import BannerConfig
+from classbanners.svg import (
+    background_elements,
+    border_element,
+    font_face,
+    svg_color,
+    svg_document,
+    text_element,
+)
+
+SVG_NS = "{http://www.w3.org/2000/svg}"
+
+
+def _parse(elements: list[str], config: BannerConfig) -> ET.Element:
+    return ET.fromstring(svg_document(config.width, config.height, elements))
+
+
+class TestBackground:
+    """Tests for background_elements."""
+
+    def test_solid(self) -> None:
+        """Test that a solid background is a single rect."""
+        config = BannerConfig(background_color="#ABC")
+        root = _parse(background_elements(config), config)
+        (rect,) = root
+        assert rect.tag == f"{SVG_NS}rect"
+        assert rect.get("fill") == "#aabbcc"
+        assert svg_color(config.text_rgba) == "#ffffff"
+
+    def test_linear_gradient_spans_banner(self) -> None:
+        """Test that a horizontal gradient runs from edge to edge."""
+        config = BannerConfig(width=400, background_fill="linear")
+        root = _parse(background_elements(config), config)
+        gradient = root.find(f"{SVG_NS}defs/{SVG_NS}linearGradient")
+        assert gradient is not None
+        assert (gradient.get("x1"), gradient.get("x2")) == ("0", "400")
+        assert (gradient.get("y1"), gradient.get("y2")) == ("0", "0")
+
+    def test_radial_and_stripes(self) -> None:
+        """Test that radial gradients and stripes become paint servers."""
+        config = BannerConfig(width=400, height=300, background_fill="radial")
+        gradient = _parse(background_elements(config), config).find(
+            f"{SVG_NS}defs/{SVG_NS}radialGradient"
+        )
+        assert gradient is not None and gradient.get("r") == "250"
+
+        config = BannerConfig(background_fill="stripes:10:30")
+        pattern = _parse(background_elements(config), config).find(
+            f"{SVG_NS}defs/{SVG_NS}pattern"
+        )
+        assert pattern is not None
+        assert pattern.get("width") == "10"
+        assert pattern.get("patternTransform") == "rotate(30)"
+
+    def test_noise_is_drawn_solid(self) -> None:
+        """Test that noise, which has no vector form, keeps the background."""
+        config = BannerConfig(background_fill="noise")
+        assert background_elements(config) == background_elements(BannerConfig())
+
+
+class TestElements:
+    """Tests for the border, text and document builders."""
+
+    @pytest.mark.parametrize(("border_width", "x", "width"), [(1, "0.5", 800), (4, "4", 793)])
+    def test_border_matches_raster_outline(
+        self, border_width: int, x: str, width: int
+    ) -> None:
+        """Test that the stroke covers the raster outline's pixels."""
+        config = BannerConfig(border_width=border_width)
+        rect = ET.fromstring(border_element(config) or "")
+        assert rect.get("x") == x
+        assert rect.get("width") == str(width)
+        assert border_element(BannerConfig()) is None
+
+    def test_text_is_escaped(self) -> None:
+        """Test that markup in titles is escaped."""
+        element = ET.fromstring(
+            text_element("<Q&A>", 10, 40, 24, "DejaVu Sans", "#fff", 80.5)
+        )
+        assert element.text == "<Q&A>"
+        assert element.get("textLength") == "80.5"
+
+
+class TestFontFace:
+    """Tests for font embedding."""
+
+    @pytest.fixture
+    def font_path(self) -> Path:
+        from classbanners.fonts import get_font_cache
+
+        font = get_font_cache().get(12)
+        path = getattr(font, "path", None)
+        if not isinstance(path, str):
+            pytest.skip("No TrueType font available")
+        return Path(path)
+
+    def test_whole_font_without_fonttools(
+        self, font_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that the whole font is embedded when fontTools is missing."""
+        monkeypatch.setitem(sys.modules, "fontTools", None)
+        monkeypatch.setattr(svg, "_warned_missing_fonttools", True)
+        style = font_face(font_path, "Hi")
+
+        assert style.startswith('<style>@font-face{font-family:"banner-font"')
+        assert len(style) > font_path.stat().st_size
+
+    def test_subset_font(self, font_path: Path) -> None:
+        """Test that fontTools subsets the font to the characters used."""
+        pytest.importorskip("fontTools")
+        style = font_face(font_path, "Hi")
+        assert len(style) < font_path.stat().st_size / 4
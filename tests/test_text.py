@@ -0,0 +1,90 @@
+"""Tests for the text run cache."""
+
+from PIL import Image, ImageDraw, ImageFont
+
+from classbanners.banner import BannerConfig
+from classbanners.fonts import FontCache
+from classbanners.generator import BannerGenerator
+from classbanners.text import TextRunCache, render_text_run
+
+
+class TestTextRun:
+    """Tests for rasterized text runs."""
+
+    def test_paste_matches_draw_text(self) -> None:
+        """Test that pasting a cached run matches ImageDraw.text."""
+        font = FontCache().get(36)
+        expected = Image.new("RGB", (400, 100), "#4A90D9")
+        ImageDraw.Draw(expected).text((12, 20), "Room 204, gjpq", font=font, fill="#FFF")
+
+        actual = Image.new("RGB", (400, 100), "#4A90D9")
+        render_text_run("Room 204, gjpq", font).paste(actual, (12, 20), "#FFF")
+
+        assert actual.tobytes() == expected.tobytes()
+
+    def test_empty_text_has_no_mask(self) -> None:
+        """Test that empty runs are measured but not rasterized."""
+        run = render_text_run("", FontCache().get(20))
+        assert run.mask is None
+        assert run.width == 0
+
+
+class TestTextRunCache:
+    """Tests for TextRunCache."""
+
+    def test_repeated_text_hits_cache(self) -> None:
+        """Test that identical text in the same font is rendered once."""
+        cache = TextRunCache()
+        font = FontCache().get(24)
+        first = cache.get("Room 204", font)
+        second = cache.get("Room 204", font)
+
+        assert first is second
+        assert cache.stats.hits == 1
+
+    def test_different_sizes_are_separate_entries(self) -> None:
+        """Test that the font size is part of the key."""
+        cache = TextRunCache()
+        fonts = FontCache()
+        cache.get("Room 204", fonts.get(24))
+        cache.get("Room 204", fonts.get(12))
+        assert len(cache) == 2
+
+    def test_pathless_fonts_are_not_confused(self) -> None:
+        """Test that fonts without a file path are keyed by identity."""
+        cache = TextRunCache()
+        small = ImageFont.load_default(size=10)
+        large = ImageFont.load_default(size=30)
+        assert cache.get("x", small).bbox != cache.get("x", large).bbox
+
+    def test_measure_matches_run_without_rasterizing(self) -> None:
+        """Test that measure() caches bounding boxes but not masks."""
+        cache = TextRunCache()
+        font = FontCache().get(24)
+        bbox = cache.measure("Room 204", font)
+
+        assert bbox == render_text_run("Room 204", font).bbox
+        assert cache.measure("Room 204", font) == bbox
+        assert len(cache) == 0
+        assert cache.current_bytes == 0
+
+    def test_byte_budget(self) -> None:
+        """Test that masks are accounted against the byte budget."""
+        cache = TextRunCache(max_bytes=1)
+        cache.get("Too large", FontCache().get(24))
+        assert len(cache) == 0
+        assert cache.current_bytes == 0
+
+
+class TestGeneratorTextCache:
+    """Tests for text run reuse in BannerGenerator."""
+
+    def test_repeated_subtitle_reuses_run(self) -> None:
+        """Test that a subtitle shared by banners is rendered once."""
+        cache = TextRunCache()
+        generator = BannerGenerator(BannerConfig(), text_cache=cache)
+        generator.create_banner("Math 101", "Room 204")
+        generator.create_banner("Physics", "Room 204")
+
+        assert cache.stats.misses == 3
+        assert cache.stats.hits == 1
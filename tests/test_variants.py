@@ -0,0 +1,146 @@
+"""Tests for multi-resolution variants."""
+
+from pathlib import Path
+
+import pytest
+from PIL import Image, ImageChops, ImageStat
+
+from classbanners.banner import Banner, BannerConfig
+from classbanners.generator import BannerGenerator
+from classbanners.instrument import StageProfiler
+from classbanners.variants import (
+    Variant,
+    parse_variant,
+    parse_variants,
+    scale_config,
+    variant_path,
+)
+
+
+class TestParseVariant:
+    """Tests for variant specs."""
+
+    def test_scale_spec(self) -> None:
+        """Test ``Nx`` specs."""
+        assert parse_variant("2x") == Variant("2x", scale=2.0)
+        assert parse_variant("1.5x").scale == 1.5
+
+    def test_width_spec(self) -> None:
+        """Test ``Nw`` specs and the thumb preset."""
+        config = BannerConfig(width=800)
+        assert parse_variant("400w", config).scale == 0.5
+        assert parse_variant("thumb", config) == Variant("thumb", scale=0.4)
+        with pytest.raises(ValueError, match="needs the banner width"):
+            parse_variant("400w")
+
+    def test_size_spec(self) -> None:
+        """Test ``WxH`` specs, their fit suffix and the card preset."""
+        assert parse_variant("card") == Variant("card", size=(1200, 630))
+        crop = parse_variant("600x600:crop")
+        assert crop == Variant("600x600-crop", size=(600, 600), fit="crop")
+
+    @pytest.mark.parametrize("spec", ["", "2", "x2", "huge", "10x10:stretch"])
+    def test_invalid_specs(self, spec: str) -> None:
+        """Test that malformed specs raise ValueError."""
+        with pytest.raises(ValueError):
+            parse_variants(spec)
+
+    def test_duplicate_names(self) -> None:
+        """Test that repeated sizes are rejected."""
+        with pytest.raises(ValueError, match="Sizes must be unique"):
+            parse_variants("1x,2x,1x")
+
+    def test_variant_path(self) -> None:
+        """Test that only the 1x variant keeps the plain path."""
+        assert variant_path("out/math.png", Variant("1x")) == Path("out/math.png")
+        assert variant_path("out/math.png", Variant("2x", 2)) == Path("out/math@2x.png")
+
+
+class TestScaleConfig:
+    """Tests for scale_config."""
+
+    def test_scales_pixel_measurements(self) -> None:
+        """Test that sizes, padding, border and icon size are scaled."""
+        config = BannerConfig(border_width=3, icon_size=40)
+        scaled = scale_config(config, 2)
+        assert (scaled.width, scaled.height, scaled.font_size) == (1600, 400, 96)
+        assert (scaled.padding, scaled.border_width, scaled.icon_size) == (40, 6, 80)
+        assert scaled.background_color == config.background_color
+        assert scale_config(config, 1) is config
+
+
+class TestGenerateVariants:
+    """Tests for BannerGenerator.generate_variants."""
+
+    def test_sizes_and_single_render(self) -> None:
+        """Test that every variant comes from one render at the largest scale."""
+        profiler = StageProfiler()
+        generator = BannerGenerator(metrics=profiler)
+        config = BannerConfig()
+        variants = parse_variants("1x,2x,thumb,card,600x600:crop", config)
+        banners = generator.generate_variants(Banner("Math 101", "Room 204"), variants)
+
+        sizes = {name: banner.image.size for name, banner in banners.items() if banner.image}
+        assert sizes == {
+            "1x": (800, 200),
+            "2x": (1600, 400),
+            "thumb": (320, 80),
+            "card": (1200, 630),
+            "600x600-crop": (600, 600),
+        }
+        # The crop needs a 3x render; one canvas serves every variant.
+        assert profiler.stages["canvas"].count == 1
+        assert banners["2x"].config.font_size == 96
+
+    @pytest.mark.parametrize(
+        "config",
+        [
+            BannerConfig(),
+            BannerConfig(background_color="#222222", text_color="#EEEEEE"),
+            BannerConfig(border_width=4, border_color="#FF0000"),
+        ],
+    )
+    def test_downsample_matches_direct_render(self, config: BannerConfig) -> None:
+        """Test that a derived 1x variant looks like a direct 1x render."""
+        generator = BannerGenerator()
+        banners = generator.generate_variants(
+            Banner("Math 101", config=config), [Variant("1x"), Variant("2x", 2)]
+        )
+        direct = generator.generate(Banner("Math 101", config=config)).image
+        derived = banners["1x"].image
+        assert direct is not None and derived is not None
+
+        difference = ImageChops.difference(direct.convert("RGB"), derived.convert("RGB"))
+        assert max(ImageStat.Stat(difference).mean) < 8
+
+    def test_card_is_padded_with_background(self) -> None:
+        """Test that padded cards extend the banner background."""
+        config = BannerConfig(background_color="#112233")
+        banners = BannerGenerator().generate_variants(
+            Banner("Math", config=config), [Variant("card", size=(1200, 630))]
+        )
+        card = banners["card"].image
+        assert card is not None
+        assert card.convert("RGB").getpixel((0, 0)) == (0x11, 0x22, 0x33)
+
+    def test_requires_unique_variants(self) -> None:
+        """Test that empty or duplicate variant lists raise ValueError."""
+        generator = BannerGenerator()
+        with pytest.raises(ValueError, match="At least one variant"):
+            generator.generate_variants(Banner("Math"), [])
+        with pytest.raises(ValueError, match="must be unique"):
+            generator.generate_variants(Banner("Math"), [Variant("a"), Variant("a", 2)])
+
+    def test_save_variants(self, tmp_path: Path) -> None:
+        """Test that every variant is encoded next to the output path."""
+        paths = BannerGenerator().save_variants(
+            Banner("Math"), parse_variants("1x,2x,thumb", BannerConfig()), tmp_path / "math.png"
+        )
+
+        assert [path.name for path in paths.values()] == [
+            "math.png",
+            "math@2x.png",
+            "math@thumb.png",
+        ]
+        with Image.open(paths["thumb"]) as image:
+            assert image.size == (320, 80)
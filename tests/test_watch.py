@@ -0,0 +1,207 @@
+"""Tests for the manifest watcher."""
+
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+from classbanners.banner import BannerConfig
+from classbanners.generator import BannerGenerator
+from classbanners.instrument import StageProfiler
+from classbanners.watch import ManifestWatcher, SyncReport
+
+
+def _write_manifest(path: Path, rows: list[dict[str, object]]) -> None:
+    path.write_text(json.dumps({"topics": rows}), encoding="utf-8")
+
+
+ROWS: list[dict[str, object]] = [
+    {"number": 1, "title": "Intro"},
+    {"number": 2, "title": "Lab", "subtitle": "Room 204"},
+    {"number": 3, "title": "Review", "icon": "trophy"},
+]
+
+
+class TestSync:
+    """Tests for ManifestWatcher.sync."""
+
+    def test_first_pass_renders_everything(self, tmp_path: Path) -> None:
+        """Test that the first pass renders every entry."""
+        manifest = tmp_path / "topics.json"
+        _write_manifest(manifest, ROWS)
+        report = ManifestWatcher(manifest, tmp_path / "out").sync()
+
+        assert sorted(path.name for path in report.rendered) == [
+            "01-intro.png",
+            "02-lab.png",
+            "03-review.png",
+        ]
+        assert report.unchanged == 0
+        assert report.errors == []
+
+    def test_only_changed_entries_are_rendered(self, tmp_path: Path) -> None:
+        """Test that edits re-render only the entries they touch."""
+        manifest = tmp_path / "topics.json"
+        _write_manifest(manifest, ROWS)
+        watcher = ManifestWatcher(manifest, tmp_path / "out")
+        watcher.sync()
+
+        edited = [dict(row) for row in ROWS]
+        edited[1]["subtitle"] = "Room 301"
+        edited[2]["icon"] = "rocket"
+        _write_manifest(manifest, edited)
+        report = watcher.sync()
+
+        assert sorted(path.name for path in report.rendered) == ["02-lab.png", "03-review.png"]
+        assert report.unchanged == 1
+        assert watcher.sync().rendered == []
+
+    def test_config_changes_are_detected(self, tmp_path: Path) -> None:
+        """Test that per-row config overrides count as changes."""
+        manifest = tmp_path / "topics.json"
+        _write_manifest(manifest, ROWS)
+        watcher = ManifestWatcher(manifest, tmp_path / "out")
+        watcher.sync()
+
+        edited = [dict(row) for row in ROWS]
+        edited[0]["background_color"] = "#000000"
+        _write_manifest(manifest, edited)
+
+        assert [path.name for path in watcher.sync().rendered] == ["01-intro.png"]
+
+    def test_removed_entries_are_deleted(self, tmp_path: Path) -> None:
+        """Test that outputs of removed or renamed entries are deleted."""
+        manifest = tmp_path / "topics.json"
+        _write_manifest(manifest, ROWS)
+        output = tmp_path / "out"
+        watcher = ManifestWatcher(manifest, output)
+        watcher.sync()
+
+        _write_manifest(manifest, [ROWS[0], {"number": 2, "title": "Workshop"}])
+        report = watcher.sync()
+
+        assert sorted(path.name for path in report.removed) == ["02-lab.png", "03-review.png"]
+        assert sorted(path.name for path in output.iterdir()) == [
+            "01-intro.png",
+            "02-workshop.png",
+        ]
+
+    def test_missing_output_is_rendered_again(self, tmp_path: Path) -> None:
+        """Test that a deleted output is restored on the next pass."""
+        manifest = tmp_path / "topics.json"
+        _write_manifest(manifest, ROWS)
+        watcher = ManifestWatcher(manifest, tmp_path / "out")
+        first = watcher.sync()
+        first.rendered[0].unlink()
+
+        assert watcher.sync().rendered == [first.rendered[0]]
+
+    def test_invalid_rows_keep_their_last_output(self, tmp_path: Path) -> None:
+        """Test that a row with a bad override is reported, not deleted."""
+        manifest = tmp_path / "topics.json"
+        _write_manifest(manifest, ROWS)
+        watcher = ManifestWatcher(manifest, tmp_path / "out")
+        watcher.sync()
+
+        edited = [dict(row) for row in ROWS]
+        edited[0]["text_color"] = "#GGG"
+        _write_manifest(manifest, edited)
+        report = watcher.sync()
+
+        assert report.removed == []
+        assert len(report.errors) == 1
+        assert (tmp_path / "out" / "01-intro.png").exists()
+
+    def test_failed_renders_keep_their_last_output(self, tmp_path: Path) -> None:
+        """Test that an entry failing to render is retried and still tracked."""
+        manifest = tmp_path / "topics.json"
+        _write_manifest(manifest, ROWS)
+        output = tmp_path / "out" / "03-review.png"
+        watcher = ManifestWatcher(manifest, tmp_path / "out")
+        watcher.sync()
+
+        edited = [dict(row) for row in ROWS]
+        edited[2]["icon"] = "no-such-icon"
+        _write_manifest(manifest, edited)
+        for _ in range(2):
+            report = watcher.sync()
+            assert report.rendered == [] and len(report.errors) == 1
+            assert output.exists()
+
+        edited[2]["icon"] = "rocket"
+        _write_manifest(manifest, edited)
+        assert watcher.sync().rendered == [output]
+
+        edited[2]["icon"] = "no-such-icon"
+        _write_manifest(manifest, edited)
+        watcher.sync()
+        _write_manifest(manifest, ROWS[:2])
+        assert watcher.sync().removed == [output]
+        assert not output.exists()
+
+    def test_invalid_manifest_touches_nothing(self, tmp_path: Path) -> None:
+        """Test that a half-written manifest raises before any output changes."""
+        manifest = tmp_path / "topics.json"
+        _write_manifest(manifest, ROWS)
+        watcher = ManifestWatcher(manifest, tmp_path / "out")
+        watcher.sync()
+
+        manifest.write_text('{"topics": [{"number": 1, "title": "Intro"},', encoding="utf-8")
+        with pytest.raises(ValueError):
+            watcher.sync()
+        assert len(list((tmp_path / "out").iterdir())) == 3
+
+    def test_generator_stays_warm(self, tmp_path: Path) -> None:
+        """Test that later passes reuse the generator's caches."""
+        manifest = tmp_path / "topics.json"
+        _write_manifest(manifest, ROWS)
+        profiler = StageProfiler()
+        generator = BannerGenerator(BannerConfig(), metrics=profiler)
+        watcher = ManifestWatcher(manifest, tmp_path / "out", generator)
+        watcher.sync()
+        misses = generator.font_cache.stats.misses
+
+        edited = [dict(row) for row in ROWS]
+        edited[0]["title"] = "Introduction"
+        _write_manifest(manifest, edited)
+        watcher.sync()
+
+        assert generator.font_cache.stats.misses == misses
+
+
+class TestRun:
+    """Tests for the polling loop."""
+
+    def test_run_syncs_on_change(self, tmp_path: Path) -> None:
+        """Test that the loop syncs at start and after each edit."""
+        manifest = tmp_path / "topics.json"
+        _write_manifest(manifest, ROWS)
+        watcher = ManifestWatcher(manifest, tmp_path / "out", interval=0.01, debounce=0.01)
+        reports: list[SyncReport] = []
+        stop = threading.Event()
+        synced = threading.Semaphore(0)
+
+        def on_sync(report: SyncReport) -> None:
+            reports.append(report)
+            synced.release()
+
+        thread = threading.Thread(target=watcher.run, args=(on_sync, stop))
+        thread.start()
+        try:
+            assert synced.acquire(timeout=10)
+            _write_manifest(manifest, ROWS[:1])
+            assert synced.acquire(timeout=10)
+        finally:
+            stop.set()
+            thread.join(timeout=10)
+
+        assert len(reports[0].rendered) == 3
+        assert len(reports[1].removed) == 2
+
+    def test_invalid_settings(self, tmp_path: Path) -> None:
+        """Test that non-positive intervals raise ValueError."""
+        with pytest.raises(ValueError, match="interval must be positive"):
+            ManifestWatcher(tmp_path / "m.json", tmp_path, interval=0)
+        with pytest.raises(ValueError, match="debounce cannot be negative"):
+            ManifestWatcher(tmp_path / "m.json", tmp_path, debounce=-1)